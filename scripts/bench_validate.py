@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Benchmark quick_validate over a tree of generated skills.
+
+Usage:
+    python scripts/bench_validate.py [--skills N] [--body-kb KB] [--workers N] [--output results.json]
+
+Generates --skills skill folders (most with simple frontmatter, some that need
+PyYAML, some invalid) under a temporary directory and times:
+
+    legacy         read the whole SKILL.md, regex out the frontmatter and
+                   yaml.safe_load it, as validate_skill did before the fast path
+    scanner        streamed frontmatter read + simple parser, no cache
+    cache-cold     the same while filling an empty result cache
+    cache-warm     every skill answered from the cache by mtime and size
+    cache-touched  every SKILL.md touched (as after a fresh checkout), so each
+                   is re-read and answered by its frontmatter hash
+    cli-*          `quick_validate.py --all` as a subprocess with --no-cache, an
+                   empty cache and a warm cache, the pre-commit / agent-startup case
+
+Exits non-zero if any fast-path result differs from the legacy one.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import quick_validate
+
+SCRIPT = Path(__file__).resolve().parent / "quick_validate.py"
+
+SIMPLE = """---
+name: {name}
+description: "{description}"
+metadata: {{"openclaw":{{"emoji":"🎯","always":true}}}}
+---
+"""
+
+FLOW_METADATA = """---
+name: {name}
+description: {description}
+metadata:
+  {{
+    "openclaw":
+      {{
+        "emoji": "👀",
+        "requires": {{ "bins": ["gh", "jq"] }},
+      }},
+  }}
+---
+"""
+
+BLOCK_SCALAR = """---
+name: {name}
+# maintained by the platform team
+description: >
+  {description}
+  Continues on a second line.
+license: MIT
+---
+"""
+
+INVALID = [
+    "---\nname: {name}\ndescription: Uses <angle> brackets\n---\n",
+    "---\nname: Bad_Name\ndescription: {description}\n---\n",
+    "---\nname: {name}\n---\n",
+    "---\nname: {name}\ndescription: {description}\nversion: 2\n---\n",
+    "# No frontmatter\n",
+    "---\n---\n",
+]
+
+
+def generate_skills(root, count, body_kb, seed=0):
+    """Write `count` skill folders under `root`; returns their paths."""
+    rng = random.Random(seed)
+    body = "\n".join(f"Line {i} of the instructions, with `code` and a [link](https://example.com)."
+                     for i in range(body_kb * 1024 // 72)) + "\n"
+    skills = []
+    for i in range(count):
+        name = f"skill-{i:05d}"
+        description = f"Generated skill {i}: lists, quotes and trades things."
+        roll = rng.random()
+        if roll < 0.70:
+            template = SIMPLE
+        elif roll < 0.85:
+            template = FLOW_METADATA
+        elif roll < 0.95:
+            template = BLOCK_SCALAR
+        else:
+            template = rng.choice(INVALID)
+        description = description.replace(": ", " - ") if template is not SIMPLE else description
+        skill = root / f"group-{i % 50:02d}" / name
+        skill.mkdir(parents=True)
+        (skill / "SKILL.md").write_text(template.format(name=name, description=description) + body, encoding="utf-8")
+        skills.append(skill)
+    return skills
+
+
+def legacy_validate(skill_path):
+    """The previous read path: whole file, DOTALL regex and PyYAML for every skill."""
+    import yaml
+
+    content = (Path(skill_path) / "SKILL.md").read_text(encoding="utf-8")
+    if not content.startswith("---"):
+        return False, "No YAML frontmatter found"
+    match = re.match(r"^---\n(.*?)\n---", content, re.DOTALL)
+    if not match:
+        return False, "Invalid frontmatter format"
+    try:
+        frontmatter = yaml.safe_load(match.group(1))
+    except yaml.YAMLError as e:
+        return False, f"Invalid YAML in frontmatter: {e}"
+    if not isinstance(frontmatter, dict):
+        return False, "Frontmatter must be a YAML dictionary"
+    return quick_validate.check_frontmatter(frontmatter)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def summarize(seconds, count, baseline=None):
+    row = {"seconds": round(seconds, 4), "us_per_skill": round(seconds / count * 1e6, 1)}
+    if baseline:
+        row["speedup"] = round(baseline / seconds, 1) if seconds else None
+    return row
+
+
+def run_cli(root, *flags):
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, str(SCRIPT), "--all", str(root), *flags], capture_output=True, text=True)
+    return proc, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark quick_validate over generated skills")
+    parser.add_argument("--skills", type=int, default=2000, help="Number of skills to generate")
+    parser.add_argument("--body-kb", type=int, default=16, help="Size of each SKILL.md body")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes for the cli-* runs")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    tmp = Path(tempfile.mkdtemp(prefix="skill-validate-bench-"))
+    try:
+        print(f"Generating {args.skills} skills...", file=sys.stderr)
+        skills = generate_skills(tmp / "skills", args.skills, args.body_kb)
+        legacy_validate(skills[0])  # import PyYAML outside the timing
+
+        results, mismatches = {}, []
+        expected, seconds = timed(lambda: [legacy_validate(skill) for skill in skills])
+        results["legacy"] = summarize(seconds, len(skills))
+        baseline = seconds
+
+        def check(name, rows):
+            for skill, want, (_, valid, message, _, _) in zip(skills, expected, rows):
+                if (valid, message) != want:
+                    mismatches.append({"scenario": name, "skill": str(skill), "expected": want, "got": [valid, message]})
+
+        cache = {}
+        runs = [
+            ("scanner", lambda: quick_validate.validate_skills(skills, 1)),
+            ("cache-cold", lambda: quick_validate.validate_skills(skills, 1, cache)),
+            ("cache-warm", lambda: quick_validate.validate_skills(skills, 1, cache)),
+        ]
+        for name, run in runs:
+            print(f"Running {name}...", file=sys.stderr)
+            rows, seconds = timed(run)
+            check(name, rows)
+            results[name] = summarize(seconds, len(skills), baseline)
+            results[name]["from_cache"] = sum(1 for row in rows if row[4])
+
+        later = time.time() + 60
+        for skill in skills:
+            os.utime(skill / "SKILL.md", (later, later))
+        print("Running cache-touched...", file=sys.stderr)
+        rows, seconds = timed(lambda: quick_validate.validate_skills(skills, 1, cache))
+        check("cache-touched", rows)
+        results["cache-touched"] = summarize(seconds, len(skills), baseline)
+
+        cache_file = tmp / "cache.json"
+        workers = ["--workers", str(args.workers)]
+        for name, flags in [("cli-no-cache", ["--no-cache"]), ("cli-cache-cold", ["--cache", str(cache_file)]),
+                            ("cli-cache-warm", ["--cache", str(cache_file)])]:
+            print(f"Running {name}...", file=sys.stderr)
+            proc, seconds = run_cli(tmp / "skills", *workers, *flags)
+            results[name] = summarize(seconds, len(skills))
+            results[name]["summary"] = proc.stdout.strip().splitlines()[-1] if proc.stdout.strip() else proc.stderr
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    report = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "config": {k: v for k, v in vars(args).items() if k != "output"},
+        "results": results,
+        "mismatches": mismatches[:20],
+    }
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+        print(f"[OK] Results written to {args.output}", file=sys.stderr)
+    print(text)
+    if mismatches:
+        print(f"[FAIL] {len(mismatches)} results differ from the legacy validator", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Skill Registry - Builds one index file describing every skill
+
+Usage:
+    python scripts/build_index.py [skills-root] [--output registry.json] [--force]
+    python scripts/build_index.py [skills-root] --lookup <name>
+    python scripts/build_index.py [skills-root] --search <keyword> [<keyword> ...]
+
+Example:
+    python scripts/build_index.py skills/
+    python scripts/build_index.py skills/ --search prediction market
+
+The registry (default: <skills-root>/registry.json) is a single compact JSON
+document. For every valid skill it holds the name, description and metadata
+from the SKILL.md frontmatter (e.g. the openclaw block), the folder path
+relative to the registry, and the sha256, size and mtime of each packaged file
+(the same files package_skill.py would archive). A keyword table maps words
+of names and descriptions to skill names. Skills that fail validation are
+listed under "invalid" with the reason.
+
+Updates are incremental: files whose size and mtime are unchanged keep their
+recorded hash, and a skill whose SKILL.md hash is unchanged is not parsed
+again. An agent loads the registry with one read (`load_registry`) and looks
+skills up with `find_skill` and `search` instead of parsing every SKILL.md.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from pathlib import Path
+
+from package_skill import scan_inputs, skill_files
+from quick_validate import check_frontmatter, find_skills, parse_frontmatter, read_frontmatter
+
+REGISTRY_VERSION = 1
+REGISTRY_NAME = "registry.json"
+KEYWORD = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset((
+    "and", "are", "for", "from", "get", "has", "into", "its", "not", "or", "the", "their", "them", "this",
+    "use", "uses", "using", "via", "when", "with", "you", "your",
+))
+
+
+def keywords(name, description):
+    """Searchable words of a skill: the parts of its name plus description words of 3+ characters."""
+    words = set(KEYWORD.findall(name.lower()))
+    words.update(w for w in KEYWORD.findall(description.lower()) if len(w) >= 3 and w not in STOPWORDS)
+    return sorted(words)
+
+
+def load_registry(path):
+    """The registry at `path` in one read, or None if it is missing, unreadable or from another version."""
+    try:
+        with open(path, "rb") as f:
+            registry = json.loads(f.read())
+    except (OSError, ValueError):
+        return None
+    return registry if registry.get("version") == REGISTRY_VERSION else None
+
+
+def write_registry(path, registry):
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(registry, f, separators=(",", ":"), sort_keys=True, ensure_ascii=False, default=str)
+        f.write("\n")
+    os.replace(tmp, path)
+
+
+def index_skill(skill_path, rel_path, previous):
+    """
+    Registry entry for one skill folder, reusing `previous` (its last entry) where inputs are unchanged.
+
+    Returns:
+        (name, entry, None), or (None, None, error message) if the skill is invalid
+    """
+    files = [(arcname.split("/", 1)[1], path) for arcname, path in skill_files(skill_path)]
+    entries = scan_inputs(files, previous["files"] if previous else {})
+    if "SKILL.md" not in entries:
+        return None, None, "SKILL.md not found"
+
+    if previous and previous["files"].get("SKILL.md", {}).get("sha256") == entries["SKILL.md"]["sha256"]:
+        fields = {key: previous[key] for key in ("name", "description", "metadata")}
+    else:
+        text, error = read_frontmatter(skill_path / "SKILL.md")
+        frontmatter = None
+        if not error:
+            frontmatter, error = parse_frontmatter(text)
+        if not error:
+            valid, message = check_frontmatter(frontmatter)
+            error = None if valid else message
+        if error:
+            return None, None, error
+        fields = {
+            "name": frontmatter["name"].strip() or skill_path.name,
+            "description": frontmatter["description"].strip(),
+            "metadata": frontmatter.get("metadata"),
+        }
+
+    entry = {
+        **fields,
+        "path": rel_path,
+        "keywords": keywords(fields["name"], fields["description"]),
+        "size": sum(file["size"] for file in entries.values()),
+        "files": entries,
+    }
+    return fields["name"], entry, None
+
+
+def build_registry(root, output=None, force=False):
+    """
+    Build or update the registry of every skill under `root`.
+
+    Returns:
+        (registry dict, counts of added, updated, unchanged and removed skills)
+    """
+    root = Path(root).resolve()
+    output = Path(output).resolve() if output else root / REGISTRY_NAME
+    previous = None if force else load_registry(output)
+    old_skills = previous["skills"] if previous else {}
+    by_path = {entry["path"]: entry for entry in old_skills.values()}
+
+    skills, invalid = {}, {}
+    counts = {"added": 0, "updated": 0, "unchanged": 0, "removed": 0}
+    for skill_path in find_skills(root):
+        rel_path = Path(os.path.relpath(skill_path, output.parent)).as_posix()
+        old = by_path.get(rel_path)
+        name, entry, error = index_skill(skill_path, rel_path, old)
+        if error:
+            invalid[rel_path] = error
+            continue
+        if name in skills:
+            invalid[rel_path] = f"Skill name '{name}' is already used by {skills[name]['path']}"
+            continue
+        skills[name] = entry
+        counts["unchanged" if old == entry else "updated" if old else "added"] += 1
+    counts["removed"] = len(set(by_path) - {entry["path"] for entry in skills.values()})
+
+    keyword_index = {}
+    for name, entry in sorted(skills.items()):
+        for word in entry["keywords"]:
+            keyword_index.setdefault(word, []).append(name)
+
+    registry = {"version": REGISTRY_VERSION, "skills": skills, "keywords": keyword_index, "invalid": invalid}
+    if registry != previous:
+        output.parent.mkdir(parents=True, exist_ok=True)
+        write_registry(output, registry)
+    return registry, counts
+
+
+def find_skill(registry, name):
+    """The registry entry of the skill called `name`, or None."""
+    return registry["skills"].get(name)
+
+
+def search(registry, query):
+    """
+    Names of skills matching every word of `query`, sorted.
+
+    A query word matches a keyword exactly or, if no keyword equals it, as a prefix.
+    """
+    index = registry["keywords"]
+    matches = None
+    for word in KEYWORD.findall(query.lower()):
+        names = set(index.get(word, ()))
+        if not names:
+            for keyword, keyword_names in index.items():
+                if keyword.startswith(word):
+                    names.update(keyword_names)
+        matches = names if matches is None else matches & names
+    return sorted(matches or ())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or query the skill registry")
+    parser.add_argument("root", nargs="?", default="skills", help="Folder holding the skills (default: skills)")
+    parser.add_argument("--output", help=f"Registry file (default: <root>/{REGISTRY_NAME})")
+    parser.add_argument("--force", action="store_true", help="Rehash and reparse every skill")
+    query = parser.add_mutually_exclusive_group()
+    query.add_argument("--lookup", metavar="NAME", help="Print the registry entry of one skill")
+    query.add_argument("--search", nargs="+", metavar="KEYWORD", help="Print skills matching all keywords")
+    args = parser.parse_args()
+
+    output = Path(args.output) if args.output else Path(args.root) / REGISTRY_NAME
+    if args.lookup or args.search:
+        registry = load_registry(output)
+        if registry is None:
+            print(f"[ERROR] No registry at {output}; build it with: python scripts/build_index.py {args.root}")
+            sys.exit(1)
+        if args.lookup:
+            entry = find_skill(registry, args.lookup)
+            if entry is None:
+                print(f"[ERROR] No skill named '{args.lookup}'")
+                sys.exit(1)
+            print(json.dumps(entry, indent=2, ensure_ascii=False))
+        else:
+            for name in search(registry, " ".join(args.search)):
+                print(f"{name}: {registry['skills'][name]['description']}")
+        return
+
+    if not Path(args.root).is_dir():
+        print(f"[ERROR] Skills folder not found: {args.root}")
+        sys.exit(1)
+    start = time.perf_counter()
+    registry, counts = build_registry(args.root, output, args.force)
+    for path, message in sorted(registry["invalid"].items()):
+        print(f"[WARN] Skipped {path}: {message}")
+    print(f"[OK] Registry {output}: {len(registry['skills'])} skills "
+          f"({counts['added']} added, {counts['updated']} updated, {counts['unchanged']} unchanged, "
+          f"{counts['removed']} removed) in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
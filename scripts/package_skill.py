@@ -3,27 +3,390 @@
 Skill Packager - Creates a distributable .skill file of a skill folder
 
 Usage:
-    python utils/package_skill.py <path/to/skill-folder> [output-directory]
+    python scripts/package_skill.py <path/to/skill-folder> [output-directory] [--force] [--verbose]
+                                    [--max-size SIZE]
+    python scripts/package_skill.py --all <skills-root> [output-directory] [--workers N]
 
 Example:
-    python utils/package_skill.py skills/public/my-skill
-    python utils/package_skill.py skills/public/my-skill ./dist
+    python scripts/package_skill.py skills/public/my-skill
+    python scripts/package_skill.py skills/public/my-skill ./dist
+    python scripts/package_skill.py --all skills/ ./dist
+
+Packaging is incremental: a content-hash manifest is kept next to the
+.skill file (<name>.skill.manifest.json). If no input changed since the
+last build, the archive is left as it is. Otherwise only new or changed
+files are compressed, and unchanged entries are copied from the previous
+archive as-is. Archives are reproducible: entries are sorted and carry a
+fixed timestamp (SOURCE_DATE_EPOCH if set, else 1980-01-01) and
+permissions, so the same inputs give a byte-identical file.
+
+Files matched by .skillignore or .gitignore (in the skill folder or any
+subfolder, gitignore syntax, .skillignore taking precedence) or by
+DEFAULT_EXCLUDES are left out, and excluded folders are not walked at all.
+Files are streamed in CHUNK_SIZE pieces. Formats that are already
+compressed (images, audio/video, archives) are stored as they are and the
+rest is deflated. An archive larger than --max-size is rejected with a
+list of the files that contribute most to it.
+
+--all packages every skill folder under the root across a process pool,
+prints one line per skill with its timing and writes index.json (name,
+archive, sha256, size and file count of every skill) to the output
+directory once all skills are done.
 """
 
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import os
+import re
+import shutil
+import struct
 import sys
+import time
 import zipfile
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 
-from quick_validate import validate_skill
+from quick_validate import find_skills, pool_size, validate_skill
+
+MANIFEST_VERSION = 1
+ZIP_EPOCH = 315532800  # 1980-01-01, the earliest time a zip entry can hold
+CHUNK_SIZE = 1024 * 1024
+LOCAL_HEADER = struct.Struct("<4s5H3L2H")
+LOCAL_HEADER_SIGNATURE = b"PK\x03\x04"
+DEFAULT_MAX_SIZE = 50 * 1024 * 1024
+
+IGNORE_FILES = (".gitignore", ".skillignore")  # later files override earlier ones
+DEFAULT_EXCLUDES = (
+    ".git/", ".hg/", ".svn/", "node_modules/", ".venv/", "venv/", "__pycache__/", "*.py[cod]",
+    ".pytest_cache/", ".mypy_cache/", ".ruff_cache/", ".tox/", ".DS_Store", "Thumbs.db", ".skillignore",
+)
+# Already-compressed formats: deflating them again costs time and saves nothing.
+STORED_SUFFIXES = frozenset((
+    ".png", ".jpg", ".jpeg", ".gif", ".webp", ".avif", ".heic",
+    ".mp3", ".mp4", ".m4a", ".mov", ".webm", ".ogg", ".woff", ".woff2",
+    ".zip", ".gz", ".tgz", ".bz2", ".xz", ".zst", ".7z", ".rar", ".jar", ".whl", ".skill",
+))
+SIZE_UNITS = {"": 1, "K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+
+
+class ArchiveTooLarge(Exception):
+    """The archive outgrew the size budget; `contributors` holds (arcname, size, compressed size or None) rows."""
+
+    def __init__(self, size, max_size, contributors):
+        super().__init__(f"Archive reached {format_size(size)}, over the {format_size(max_size)} budget")
+        self.contributors = contributors
+
+
+def zip_date_time():
+    """Timestamp for every entry: SOURCE_DATE_EPOCH if set, else the zip epoch."""
+    epoch = int(os.environ.get("SOURCE_DATE_EPOCH", ZIP_EPOCH))
+    return time.gmtime(max(epoch, ZIP_EPOCH))[:6]
+
+
+def packaging_settings():
+    """Everything besides file contents that affects the archive bytes."""
+    return {
+        "date_time": list(zip_date_time()),
+        "compression": "deflated",
+        "stored": sorted(STORED_SUFFIXES),
+        "zlib": zlib.ZLIB_RUNTIME_VERSION,
+    }
+
+
+def parse_size(text):
+    """Bytes in a size such as 500000, 800K, 50M or 1.5GB (binary units)."""
+    match = re.fullmatch(r"\s*([0-9.]+)\s*([KMG]?)(?:i?B)?\s*", text, re.IGNORECASE)
+    if not match:
+        raise ValueError(f"Invalid size: {text!r}")
+    return int(float(match.group(1)) * SIZE_UNITS[match.group(2).upper()])
+
+
+def format_size(size):
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def glob_regex(pattern):
+    """Regex source for one gitignore glob: `*` and `?` stop at "/", `**` spans folders."""
+    out = []
+    i = 0
+    while i < len(pattern):
+        c = pattern[i]
+        if pattern.startswith("**/", i) and (i == 0 or pattern[i - 1] == "/"):
+            out.append("(?:.*/)?")
+            i += 3
+            continue
+        if pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+            continue
+        if c == "*":
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[" and "]" in pattern[i + 2:]:
+            end = pattern.index("]", i + 2)
+            body = pattern[i + 1:end]
+            out.append("[" + ("^" + body[1:] if body.startswith("!") else body).replace("\\", "\\\\") + "]")
+            i = end
+        elif c == "\\" and i + 1 < len(pattern):
+            i += 1
+            out.append(re.escape(pattern[i]))
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+
+def ignore_rule(line):
+    """Compile one gitignore line to (regex, negated, dir_only); None for blanks and comments."""
+    line = line.rstrip("\n\r")
+    if not line.endswith("\\ "):
+        line = line.rstrip(" ")
+    if not line or line.startswith("#"):
+        return None
+    negated = line.startswith("!")
+    if negated or line.startswith(("\\!", "\\#")):
+        line = line[1:]
+    dir_only = line.endswith("/")
+    line = line.rstrip("/")
+    if not line:
+        return None
+    # A slash anywhere but the end anchors the pattern to the ignore file's folder.
+    anchored = "/" in line
+    regex = glob_regex(line.lstrip("/"))
+    return re.compile(regex if anchored else "(?:.*/)?" + regex), negated, dir_only
+
+
+def read_ignore_rules(directory, base):
+    """(base, regex, negated, dir_only) rules from the ignore files in `directory`."""
+    rules = []
+    for name in IGNORE_FILES:
+        try:
+            with open(os.path.join(directory, name), encoding="utf-8") as f:
+                lines = f.readlines()
+        except (OSError, UnicodeDecodeError):
+            continue
+        rules.extend((base, *rule) for rule in map(ignore_rule, lines) if rule)
+    return rules
+
+
+def is_ignored(rel_path, is_dir, rules):
+    """Whether `rel_path` (relative to the skill folder) is excluded; the last matching rule wins."""
+    ignored = False
+    for base, regex, negated, dir_only in rules:
+        if (dir_only and not is_dir) or not rel_path.startswith(base):
+            continue
+        if regex.fullmatch(rel_path[len(base):]):
+            ignored = not negated
+    return ignored
+
+
+DEFAULT_RULES = [("", *ignore_rule(pattern)) for pattern in DEFAULT_EXCLUDES]
+
+
+def skill_files(skill_path):
+    """(arcname, path) for every file of the skill that is not excluded, in archive order."""
+    files = []
+
+    def walk(directory, rel, rules):
+        rules = rules + read_ignore_rules(directory, rel)
+        with os.scandir(directory) as it:
+            children = sorted(it, key=lambda entry: entry.name)
+        for entry in children:
+            rel_path = rel + entry.name
+            is_dir = entry.is_dir(follow_symlinks=False)
+            if is_ignored(rel_path, is_dir, rules):
+                continue  # an excluded folder is never entered
+            if is_dir:
+                walk(entry.path, rel_path + "/", rules)
+            elif entry.is_file():
+                files.append((f"{skill_path.name}/{rel_path}", Path(entry.path)))
+
+    walk(skill_path, "", DEFAULT_RULES)
+    return sorted(files)
+
+
+def compression_for(arcname):
+    return zipfile.ZIP_STORED if os.path.splitext(arcname)[1].lower() in STORED_SUFFIXES else zipfile.ZIP_DEFLATED
+
+
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def scan_inputs(files, previous):
+    """Manifest entries for `files`; files whose size and mtime match `previous` are not rehashed."""
+    entries = {}
+    for arcname, path in files:
+        st = path.stat()
+        old = previous.get(arcname)
+        if old and old["size"] == st.st_size and old["mtime_ns"] == st.st_mtime_ns:
+            digest = old["sha256"]
+        else:
+            digest = file_digest(path)
+        entries[arcname] = {
+            "sha256": digest,
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "mode": 0o755 if st.st_mode & 0o111 else 0o644,
+        }
+    return entries
+
+
+def same_content(a, b):
+    """True if two manifests list the same files with the same contents and modes."""
+    return a.keys() == b.keys() and all(
+        a[name]["sha256"] == b[name]["sha256"] and a[name]["mode"] == b[name]["mode"] for name in a
+    )
+
+
+def load_manifest(path):
+    try:
+        with open(path) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return manifest if manifest.get("version") == MANIFEST_VERSION else None
+
+
+def write_manifest(path, manifest):
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write("\n")
+    os.replace(tmp, path)
+
+
+def zip_info(arcname, mode, date_time):
+    info = zipfile.ZipInfo(arcname, date_time)
+    info.compress_type = compression_for(arcname)
+    info.create_system = 3  # Unix, so the permissions below are honored on extraction
+    info.external_attr = (0o100000 | mode) << 16
+    return info
+
+
+def copy_raw_entry(src, zf, info, old_info):
+    """Append an entry whose compressed data is copied verbatim, in chunks, from the open previous archive `src`."""
+    src.seek(old_info.header_offset)
+    header = LOCAL_HEADER.unpack(src.read(LOCAL_HEADER.size))
+    if header[0] != LOCAL_HEADER_SIGNATURE:
+        raise zipfile.BadZipFile(f"Bad local header for {old_info.filename}")
+    src.seek(header[-2] + header[-1], os.SEEK_CUR)
+
+    info.CRC = old_info.CRC
+    info.file_size = old_info.file_size
+    info.compress_size = old_info.compress_size
+    info.header_offset = zf.fp.tell()
+    zf.fp.write(info.FileHeader())
+    remaining = old_info.compress_size
+    while remaining:
+        chunk = src.read(min(CHUNK_SIZE, remaining))
+        if not chunk:
+            raise zipfile.BadZipFile(f"Truncated entry {old_info.filename}")
+        zf.fp.write(chunk)
+        remaining -= len(chunk)
+    zf.filelist.append(info)
+    zf.NameToInfo[info.filename] = info
+    zf.start_dir = zf.fp.tell()
+
 
+def archive_contributors(zf, files, entries):
+    """(arcname, size, compressed size) of every file, compressed size None for files not written yet."""
+    written = {info.filename: info.compress_size for info in zf.infolist()}
+    return [(arcname, entries[arcname]["size"], written.get(arcname)) for arcname, _ in files]
 
-def package_skill(skill_path, output_dir=None):
+
+def report_too_large(error, limit=10):
+    """Print the files that take up the most archive space (raw size for files not compressed yet)."""
+    print(f"[ERROR] {error}. Largest contributors:")
+    ranked = sorted(error.contributors, key=lambda row: (-(row[1] if row[2] is None else row[2]), row[0]))
+    for arcname, size, compressed in ranked[:limit]:
+        if compressed is None:
+            print(f"   {format_size(size):>10}  (raw, not compressed yet)  {arcname}")
+        else:
+            print(f"   {format_size(compressed):>10}  ({format_size(size)} raw)  {arcname}")
+    if len(ranked) > limit:
+        print(f"   ... and {len(ranked) - limit} smaller files")
+    print("   Exclude files with a .skillignore, or raise --max-size.")
+
+
+def write_archive(skill_filename, files, entries, previous, verbose=False, max_size=None):
+    """
+    Build the archive, reusing compressed entries of unchanged files; returns (compressed, reused).
+
+    `previous` is the manifest of the archive currently at `skill_filename`, or None.
+    Raises ArchiveTooLarge as soon as the archive grows past `max_size` bytes.
+    """
+    date_time = tuple(packaging_settings()["date_time"])
+    old_files = previous["files"] if previous else {}
+    old_archive = old_zip = None
+    if previous:
+        try:
+            old_archive = open(skill_filename, "rb")
+            old_zip = zipfile.ZipFile(old_archive)
+        except (OSError, zipfile.BadZipFile):
+            old_zip = None
+
+    compressed = reused = 0
+    tmp = skill_filename.with_name(skill_filename.name + ".tmp")
+    try:
+        with zipfile.ZipFile(tmp, "w", zipfile.ZIP_DEFLATED) as zf:
+            for arcname, path in files:
+                entry = entries[arcname]
+                info = zip_info(arcname, entry["mode"], date_time)
+                old = old_files.get(arcname)
+                old_info = None
+                if old_zip is not None and old and old["sha256"] == entry["sha256"]:
+                    old_info = old_zip.NameToInfo.get(arcname)
+                if old_info is not None and old_info.compress_type == info.compress_type:
+                    copy_raw_entry(old_archive, zf, info, old_info)
+                    reused += 1
+                    action = "Reused"
+                else:
+                    info.file_size = entry["size"]
+                    with open(path, "rb") as src, zf.open(info, "w") as dst:
+                        shutil.copyfileobj(src, dst, CHUNK_SIZE)
+                    compressed += 1
+                    action = "Added"
+                if verbose:
+                    print(f"  {action}: {arcname}")
+                if max_size and zf.fp.tell() > max_size:
+                    raise ArchiveTooLarge(zf.fp.tell(), max_size, archive_contributors(zf, files, entries))
+            contributors = archive_contributors(zf, files, entries)
+        if max_size and tmp.stat().st_size > max_size:
+            raise ArchiveTooLarge(tmp.stat().st_size, max_size, contributors)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    finally:
+        if old_archive is not None:
+            old_archive.close()
+    os.replace(tmp, skill_filename)
+    return compressed, reused
+
+
+def package_skill(skill_path, output_dir=None, force=False, verbose=False, max_size=DEFAULT_MAX_SIZE):
     """
     Package a skill folder into a .skill file.
 
     Args:
         skill_path: Path to the skill folder
         output_dir: Optional output directory for the .skill file (defaults to current directory)
+        force: Rebuild from scratch, ignoring the manifest and the previous archive
+        verbose: Print every archived file
+        max_size: Largest allowed archive in bytes (None or 0 for no limit)
 
     Returns:
         Path to the created .skill file, or None if error
@@ -45,15 +408,6 @@ def package_skill(skill_path, output_dir=None):
         print(f"[ERROR] SKILL.md not found in {skill_path}")
         return None
 
-    # Run validation before packaging
-    print("Validating skill...")
-    valid, message = validate_skill(skill_path)
-    if not valid:
-        print(f"[ERROR] Validation failed: {message}")
-        print("   Please fix the validation errors before packaging.")
-        return None
-    print(f"[OK] {message}\n")
-
     # Determine output location
     skill_name = skill_path.name
     if output_dir:
@@ -63,43 +417,176 @@ def package_skill(skill_path, output_dir=None):
         output_path = Path.cwd()
 
     skill_filename = output_path / f"{skill_name}.skill"
+    manifest_path = output_path / f"{skill_name}.skill.manifest.json"
+
+    previous = None if force else load_manifest(manifest_path)
+    if previous and previous.get("settings") != packaging_settings():
+        previous = None
+    files = skill_files(skill_path)
+    entries = scan_inputs(files, previous["files"] if previous else {})
+
+    # Entries are only reused from an archive that is still the one the manifest describes.
+    if previous and not (skill_filename.exists() and file_digest(skill_filename) == previous["archive_sha256"]):
+        previous = None
+
+    # The previous build passed validation and its inputs are unchanged: nothing to do.
+    if previous and same_content(previous["files"], entries):
+        size = skill_filename.stat().st_size
+        if max_size and size > max_size:
+            with zipfile.ZipFile(skill_filename) as zf:
+                contributors = [(info.filename, info.file_size, info.compress_size) for info in zf.infolist()]
+            report_too_large(ArchiveTooLarge(size, max_size, contributors))
+            return None
+        if entries != previous["files"]:
+            write_manifest(manifest_path, {**previous, "files": entries})  # refresh mtimes only
+        print(f"[OK] Up to date: {skill_filename} (sha256 {previous['archive_sha256']})")
+        return skill_filename
+
+    # Run validation before packaging
+    print("Validating skill...")
+    valid, message = validate_skill(skill_path)
+    if not valid:
+        print(f"[ERROR] Validation failed: {message}")
+        print("   Please fix the validation errors before packaging.")
+        return None
+    print(f"[OK] {message}\n")
 
     # Create the .skill file (zip format)
     try:
-        with zipfile.ZipFile(skill_filename, "w", zipfile.ZIP_DEFLATED) as zipf:
-            # Walk through the skill directory
-            for file_path in skill_path.rglob("*"):
-                if file_path.is_file():
-                    # Calculate the relative path within the zip
-                    arcname = file_path.relative_to(skill_path.parent)
-                    zipf.write(file_path, arcname)
-                    print(f"  Added: {arcname}")
-
-        print(f"\n[OK] Successfully packaged skill to: {skill_filename}")
+        compressed, reused = write_archive(skill_filename, files, entries, previous, verbose, max_size)
+        archive_sha256 = file_digest(skill_filename)
+        write_manifest(manifest_path, {
+            "version": MANIFEST_VERSION,
+            "settings": packaging_settings(),
+            "archive_sha256": archive_sha256,
+            "files": entries,
+        })
+
+        print(f"[OK] Successfully packaged skill to: {skill_filename}")
+        print(f"   {len(files)} files ({compressed} compressed, {reused} reused), sha256 {archive_sha256}")
+        size = skill_filename.stat().st_size
+        budget = f" of the {format_size(max_size)} budget" if max_size else ""
+        print(f"   {format_size(size)}{budget}")
         return skill_filename
 
+    except ArchiveTooLarge as e:
+        report_too_large(e)
+        return None
     except Exception as e:
         print(f"[ERROR] Error creating .skill file: {e}")
         return None
 
 
+def package_one(skill_path, output_dir, force=False, verbose=False, max_size=DEFAULT_MAX_SIZE):
+    """Package a skill with its output captured, so pool workers don't interleave logs; returns a result dict."""
+    skill_path = Path(skill_path)
+    manifest_path = Path(output_dir) / f"{skill_path.name}.skill.manifest.json"
+    before = load_manifest(manifest_path)
+    log = io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(log):
+        archive = package_skill(skill_path, output_dir, force, verbose, max_size)
+    result = {"skill": skill_path.name, "path": str(skill_path), "seconds": time.perf_counter() - start,
+              "status": "failed", "log": log.getvalue()}
+    after = load_manifest(manifest_path) if archive else None
+    if after:
+        unchanged = before is not None and before["archive_sha256"] == after["archive_sha256"]
+        result.update(status="unchanged" if unchanged else "packaged", archive=archive.name,
+                      sha256=after["archive_sha256"], size=archive.stat().st_size, files=len(after["files"]))
+    return result
+
+
+def write_index(output_path, results):
+    """One index of every packaged skill, written after the whole batch."""
+    index = {"skills": [
+        {key: result[key] for key in ("skill", "archive", "sha256", "size", "files")}
+        for result in sorted(results, key=lambda r: r["skill"]) if result["status"] != "failed"
+    ]}
+    write_manifest(output_path / "index.json", index)
+
+
+def package_all(root, output_dir=None, workers=None, force=False, verbose=False, max_size=DEFAULT_MAX_SIZE):
+    """
+    Validate and package every skill folder under `root` across a process pool.
+
+    Returns:
+        List of per-skill result dicts ("status" is packaged, unchanged or failed)
+    """
+    output_path = Path(output_dir or Path.cwd()).resolve()
+    output_path.mkdir(parents=True, exist_ok=True)
+    skills = find_skills(root)
+    by_name = {}
+    for skill in skills:
+        by_name.setdefault(skill.name, []).append(skill)
+
+    results = []
+    for name, paths in by_name.items():
+        if len(paths) > 1:
+            # Same-named folders would overwrite each other's archive.
+            for path in paths:
+                results.append({"skill": name, "path": str(path), "seconds": 0.0, "status": "failed",
+                                "log": f"[ERROR] Skill name '{name}' is used by {len(paths)} folders\n"})
+    skills = [skill for skill in skills if len(by_name[skill.name]) == 1]
+
+    def report(result):
+        results.append(result)
+        if result["status"] == "failed":
+            print(f"[ERROR] {result['skill']} failed ({result['seconds']:.2f}s):")
+            print("   " + result["log"].strip().replace("\n", "\n   "))
+        else:
+            print(f"[OK] {result['skill']} {result['status']} ({result['seconds']:.2f}s, {result['size']} bytes)")
+            if verbose:
+                print("   " + result["log"].strip().replace("\n", "\n   "))
+
+    workers = pool_size(workers, len(skills))
+    start = time.perf_counter()
+    if workers == 1:
+        for skill in skills:
+            report(package_one(skill, output_path, force, verbose, max_size))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(package_one, skill, output_path, force, verbose, max_size) for skill in skills]
+            for future in as_completed(futures):
+                report(future.result())
+    wall = time.perf_counter() - start
+
+    write_index(output_path, results)
+    counts = {status: sum(1 for r in results if r["status"] == status) for status in ("packaged", "unchanged", "failed")}
+    print(f"\n{len(results)} skills: {counts['packaged']} packaged, {counts['unchanged']} unchanged, "
+          f"{counts['failed']} failed in {wall:.2f}s "
+          f"(workers: {workers}, {sum(r['seconds'] for r in results):.2f}s of skill time)")
+    print(f"[OK] Index written to {output_path / 'index.json'}")
+    return results
+
+
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python utils/package_skill.py <path/to/skill-folder> [output-directory]")
-        print("\nExample:")
-        print("  python utils/package_skill.py skills/public/my-skill")
-        print("  python utils/package_skill.py skills/public/my-skill ./dist")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(description="Package a skill folder into a .skill file")
+    parser.add_argument("skill_path", nargs="?", help="Path to the skill folder")
+    parser.add_argument("output_dir", nargs="?", help="Output directory (default: current directory)")
+    parser.add_argument("--all", metavar="ROOT", help="Package every skill folder under ROOT")
+    parser.add_argument("--workers", type=int, help="Worker processes for --all (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="Rebuild from scratch, ignoring the previous build")
+    parser.add_argument("--verbose", action="store_true", help="List every archived file")
+    parser.add_argument("--max-size", type=parse_size, default=DEFAULT_MAX_SIZE,
+                        help="Largest allowed archive, e.g. 800K or 50M; 0 for no limit (default: 50M)")
+    args = parser.parse_args()
 
-    skill_path = sys.argv[1]
-    output_dir = sys.argv[2] if len(sys.argv) > 2 else None
+    if args.all:
+        # With --all the only positional argument is the output directory.
+        if args.output_dir:
+            parser.error("--all takes at most one positional argument, the output directory")
+        print(f"Packaging all skills under: {args.all}\n")
+        results = package_all(args.all, args.skill_path, args.workers, args.force, args.verbose, args.max_size)
+        sys.exit(1 if not results or any(r["status"] == "failed" for r in results) else 0)
+    if not args.skill_path:
+        parser.error("give a skill folder or --all ROOT")
 
-    print(f"Packaging skill: {skill_path}")
-    if output_dir:
-        print(f"   Output directory: {output_dir}")
+    print(f"Packaging skill: {args.skill_path}")
+    if args.output_dir:
+        print(f"   Output directory: {args.output_dir}")
     print()
 
-    result = package_skill(skill_path, output_dir)
+    result = package_skill(args.skill_path, args.output_dir, args.force, args.verbose, args.max_size)
 
     if result:
         sys.exit(0)
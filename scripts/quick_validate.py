@@ -1,42 +1,170 @@
 #!/usr/bin/env python3
 """
 Quick validation script for skills - minimal version
+
+Usage:
+    python scripts/quick_validate.py <skill_directory>
+    python scripts/quick_validate.py --all skills/ [--workers N] [--no-cache]
+
+Only the frontmatter is read, up to its closing `---`. Frontmatter made of
+plain `key: value` lines is parsed directly; PyYAML is imported only for
+anything more involved. Results are cached per SKILL.md (path, mtime, size
+and a hash of the frontmatter) so unchanged skills are not validated again.
 """
 
+import argparse
+import hashlib
+import json
+import os
 import re
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
-import yaml
-
 MAX_SKILL_NAME_LENGTH = 64
+CACHE_VERSION = 1
 
+# The frontmatter subset read without PyYAML: unindented `key: value` lines.
+SIMPLE_LINE = re.compile(r"([A-Za-z][A-Za-z0-9_-]*):(?: +(.*)|)")
+YAML_INDICATORS = set("-?:,[]{}#&*!|>'\"%@`+.0123456789 \t")
+YAML_KEYWORDS = {
+    "y", "Y", "yes", "Yes", "YES", "n", "N", "no", "No", "NO", "true", "True", "TRUE", "false", "False", "FALSE",
+    "on", "On", "ON", "off", "Off", "OFF", "null", "Null", "NULL", "~", "<<", "=",
+}
+# YAML flow collections allow a trailing comma, JSON does not; group 1 skips over strings
+# and group 2 keeps a comma with no entry before it ("{,}", "[1,,]") for JSON to reject.
+FLOW_TRAILING_COMMA = re.compile(r'("[^"]*")|([{\[,][ \t]*)?,(?=[ \t]*[}\]])')
+YAML_UNSAFE = re.compile("[^\t\n\x20-\x7e\xa0-\u2027\u202a-\ud7ff\ue000-\ufefe\uff00-\ufffd\U00010000-\U0010ffff]")
 
-def validate_skill(skill_path):
-    """Basic validation of a skill"""
-    skill_path = Path(skill_path)
 
-    skill_md = skill_path / "SKILL.md"
-    if not skill_md.exists():
-        return False, "SKILL.md not found"
+def read_frontmatter(skill_md):
+    """
+    The frontmatter of SKILL.md, read line by line and only up to the closing `---`.
 
-    content = skill_md.read_text()
-    if not content.startswith("---"):
-        return False, "No YAML frontmatter found"
+    Returns:
+        (text, None), or (None, error message) if there is no well-formed frontmatter
+    """
+    try:
+        with open(skill_md, encoding="utf-8") as f:
+            first = f.readline()
+            if not first.startswith("---"):
+                return None, "No YAML frontmatter found"
+            if first != "---\n":
+                return None, "Invalid frontmatter format"
+            lines = []
+            for line in f:
+                # As with the former `^---\n(.*?)\n---` match, a `---` right after the
+                # opening line is content, so "---\n---\n" alone is not a frontmatter.
+                if line.startswith("---") and lines:
+                    return "".join(lines)[:-1], None
+                lines.append(line)
+    except UnicodeDecodeError as e:
+        return None, f"SKILL.md is not valid UTF-8: {e}"
+    return None, "Invalid frontmatter format"
 
-    match = re.match(r"^---\n(.*?)\n---", content, re.DOTALL)
-    if not match:
-        return False, "Invalid frontmatter format"
 
-    frontmatter_text = match.group(1)
+def plain_scalar(value):
+    """`value` as YAML would load it when that is surely a plain string, else None."""
+    if value[0] in YAML_INDICATORS or ": " in value or " #" in value or "\t" in value or value.endswith(":"):
+        return None
+    if value in YAML_KEYWORDS:
+        return None  # booleans and nulls
+    return value
 
-    try:
-        frontmatter = yaml.safe_load(frontmatter_text)
-        if not isinstance(frontmatter, dict):
-            return False, "Frontmatter must be a YAML dictionary"
-    except yaml.YAMLError as e:
-        return False, f"Invalid YAML in frontmatter: {e}"
 
+def _reject_number(text):
+    raise ValueError(text)
+
+
+def _float_without_exponent(text):
+    if "e" in text or "E" in text:
+        raise ValueError(text)
+    return float(text)
+
+
+def simple_value(value):
+    """
+    Decode one single-line frontmatter value of the simple subset: a plain or
+    quoted string without escapes, or a JSON object/list such as the openclaw
+    metadata block. Returns None when YAML must decide.
+    """
+    if not value:
+        return None
+    if value[0] == '"':
+        inner = value[1:-1]
+        return inner if len(value) > 1 and value[-1] == '"' and '"' not in inner and "\\" not in inner else None
+    if value[0] == "'":
+        inner = value[1:-1]
+        return inner if len(value) > 1 and value[-1] == "'" and "'" not in inner else None
+    if value[0] in "{[":
+        if "\\" in value:
+            return None
+        value = FLOW_TRAILING_COMMA.sub(lambda m: m.group(0) if m.group(1) or m.group(2) is not None else "", value)
+        try:
+            # YAML 1.1 reads some JSON numbers ("1e5") differently, so leave those to it.
+            return json.loads(value, parse_float=_float_without_exponent, parse_constant=_reject_number)
+        except ValueError:
+            return None
+    return plain_scalar(value)
+
+
+def simple_frontmatter(text):
+    """
+    Parse frontmatter made only of `key: value` lines (see `simple_value`)
+    without importing PyYAML; a JSON object or list may also continue over
+    the space-indented lines after `key:`, as openclaw metadata usually does.
+    Returns None for anything else, including comments, block or multi-line
+    strings and unusual characters.
+    """
+    if YAML_UNSAFE.search(text):
+        return None
+    frontmatter = {}
+    lines = text.split("\n")
+    i = 0
+    while i < len(lines):
+        match = SIMPLE_LINE.fullmatch(lines[i])
+        if not match or match.group(1) in YAML_KEYWORDS:
+            return None
+        i += 1
+        value = (match.group(2) or "").rstrip(" \t")
+        if not value:
+            block = []
+            while i < len(lines) and lines[i].startswith(" "):
+                block.append(lines[i])
+                i += 1
+            # YAML folds a flow value's line breaks, and the indentation around
+            # them, into single spaces; a blank line would fold into "\n".
+            parts = [line.strip(" ") for line in block]
+            if not all(parts):
+                return None
+            value = " ".join(parts)
+            if value[:1] not in ("{", "[") or "\t" in value:
+                return None
+        value = simple_value(value)
+        if value is None:
+            return None
+        frontmatter[match.group(1)] = value
+    return frontmatter
+
+
+def parse_frontmatter(text):
+    """(dict, None) or (None, error message); PyYAML is only imported for frontmatter outside the simple subset."""
+    frontmatter = simple_frontmatter(text)
+    if frontmatter is None:
+        import yaml
+
+        try:
+            frontmatter = yaml.safe_load(text)
+        except yaml.YAMLError as e:
+            return None, f"Invalid YAML in frontmatter: {e}"
+    if not isinstance(frontmatter, dict):
+        return None, "Frontmatter must be a YAML dictionary"
+    return frontmatter, None
+
+
+def check_frontmatter(frontmatter):
+    """Validate the keys and values of a parsed frontmatter dict."""
     allowed_properties = {"name", "description", "license", "allowed-tools", "metadata"}
 
     unexpected_keys = set(frontmatter.keys()) - allowed_properties
@@ -91,11 +219,214 @@ def validate_skill(skill_path):
     return True, "Skill is valid!"
 
 
-if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("Usage: python quick_validate.py <skill_directory>")
-        sys.exit(1)
+def validate_frontmatter(text):
+    frontmatter, error = parse_frontmatter(text)
+    if error:
+        return False, error
+    return check_frontmatter(frontmatter)
+
+
+def validate_skill(skill_path):
+    """Basic validation of a skill"""
+    skill_md = Path(skill_path) / "SKILL.md"
+    if not skill_md.exists():
+        return False, "SKILL.md not found"
+
+    text, error = read_frontmatter(skill_md)
+    if error:
+        return False, error
+    return validate_frontmatter(text)
+
+
+def default_cache_path():
+    if os.getenv("SKILL_VALIDATE_CACHE"):
+        return Path(os.environ["SKILL_VALIDATE_CACHE"])
+    cache_home = os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "openclaw-skills" / "quick_validate.json"
+
+
+def validator_digest():
+    """Hash of this script, so changed rules invalidate every cached result."""
+    return hashlib.sha256(Path(__file__).read_bytes()).hexdigest()
+
+
+def load_cache(path):
+    """Cached results by SKILL.md path; empty if missing, unreadable or written by other rules."""
+    try:
+        with open(path) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if cache.get("version") != CACHE_VERSION or cache.get("validator") != validator_digest():
+        return {}
+    return cache.get("entries", {})
 
-    valid, message = validate_skill(sys.argv[1])
-    print(message)
-    sys.exit(0 if valid else 1)
+
+def save_cache(path, entries):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "w") as f:
+        json.dump({"version": CACHE_VERSION, "validator": validator_digest(), "entries": entries}, f,
+                  separators=(",", ":"))
+    os.replace(tmp, path)
+
+
+def cached_result(skill_md, entry):
+    """The cached (valid, message) if SKILL.md's mtime and size still match `entry`, else None."""
+    if entry is None:
+        return None
+    try:
+        st = os.stat(skill_md)
+    except OSError:
+        return None
+    if st.st_mtime_ns == entry["mtime_ns"] and st.st_size == entry["size"]:
+        return entry["valid"], entry["message"]
+    return None
+
+
+def check_skill(skill_path, entry=None):
+    """
+    Validate a skill and build its cache entry.
+
+    Results only depend on the frontmatter, so the entry stores a hash of it:
+    a SKILL.md whose mtime or size changed (a fresh checkout, an edited body)
+    reuses the cached result when the hash still matches `entry`.
+
+    Returns:
+        (str path, valid, message, seconds, new cache entry or None)
+    """
+    start = time.perf_counter()
+    skill_md = os.path.join(skill_path, "SKILL.md")
+    try:
+        st = os.stat(skill_md)
+    except OSError:
+        return str(skill_path), False, "SKILL.md not found", time.perf_counter() - start, None
+
+    text, error = read_frontmatter(skill_md)
+    digest = hashlib.sha256(text.encode()).hexdigest() if text is not None else None
+    if error:
+        valid, message = False, error
+    elif entry is not None and entry["sha256"] == digest:
+        valid, message = entry["valid"], entry["message"]
+    else:
+        valid, message = validate_frontmatter(text)
+    new_entry = {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "sha256": digest, "valid": valid, "message": message}
+    return str(skill_path), valid, message, time.perf_counter() - start, new_entry
+
+
+def find_skills(root):
+    """Skill folders (directories holding a SKILL.md) under `root`, sorted; their subfolders are not searched."""
+    found = []
+
+    def walk(directory):
+        if (directory / "SKILL.md").is_file():
+            found.append(directory)
+            return
+        for child in sorted(directory.iterdir()):
+            if child.is_dir() and not child.name.startswith("."):
+                walk(child)
+
+    walk(Path(root))
+    return found
+
+
+def pool_size(workers, jobs):
+    return max(1, min(workers or os.cpu_count() or 1, jobs))
+
+
+def cache_key(skill_path):
+    return os.path.abspath(os.path.join(skill_path, "SKILL.md"))
+
+
+def validate_skills(skills, workers=None, cache=None):
+    """
+    Validate skill folders across a process pool.
+
+    With a `cache` dict (see `load_cache`), a skill whose SKILL.md kept its
+    mtime and size is answered from it without being opened; the dict is
+    updated in place with the new results.
+
+    Returns:
+        (path, valid, message, seconds, cached) rows in the order of `skills`
+    """
+    rows = {}
+    todo = []
+    for skill in skills:
+        if cache is not None:
+            start = time.perf_counter()
+            key = cache_key(skill)
+            hit = cached_result(key, cache.get(key))
+            if hit is not None:
+                rows[skill] = (str(skill), *hit, time.perf_counter() - start, True)
+                continue
+        todo.append(skill)
+
+    entries = [cache.get(cache_key(skill)) if cache is not None else None for skill in todo]
+    workers = pool_size(workers, len(todo))
+    if workers == 1:
+        checked = list(map(check_skill, todo, entries))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            checked = list(pool.map(check_skill, todo, entries, chunksize=max(1, len(todo) // (workers * 4))))
+
+    for skill, (path, valid, message, seconds, entry) in zip(todo, checked):
+        rows[skill] = (path, valid, message, seconds, False)
+        if cache is not None:
+            if entry is None:
+                cache.pop(cache_key(skill), None)
+            else:
+                cache[cache_key(skill)] = entry
+    return [rows[skill] for skill in skills]
+
+
+def validate_all(root, workers=None, cache=None):
+    """Validate every skill folder under `root`; see `validate_skills`."""
+    return validate_skills(find_skills(root), workers, cache)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate skill folders")
+    parser.add_argument("skill_directory", nargs="?")
+    parser.add_argument("--all", metavar="ROOT", help="Validate every skill folder under ROOT")
+    parser.add_argument("--workers", type=int, help="Worker processes for --all (default: CPU count)")
+    parser.add_argument("--cache", metavar="PATH", help="Result cache file (default: $SKILL_VALIDATE_CACHE or "
+                        "~/.cache/openclaw-skills/quick_validate.json)")
+    parser.add_argument("--no-cache", action="store_true", help="Validate every skill, ignoring cached results")
+    args = parser.parse_args()
+    if bool(args.all) == bool(args.skill_directory):
+        parser.error("give either a skill directory or --all ROOT")
+
+    cache_path = None if args.no_cache else Path(args.cache) if args.cache else default_cache_path()
+    cache = load_cache(cache_path) if cache_path else None
+    before = dict(cache) if cache is not None else None
+
+    start = time.perf_counter()
+    if args.skill_directory:
+        results = validate_skills([Path(args.skill_directory)], 1, cache)
+    else:
+        results = validate_all(args.all, args.workers, cache)
+    wall = time.perf_counter() - start
+    if cache is not None and cache != before:
+        try:
+            save_cache(cache_path, cache)
+        except OSError as e:
+            print(f"[WARN] Could not write validation cache {cache_path}: {e}", file=sys.stderr)
+
+    if args.skill_directory:
+        _, valid, message, _, _ = results[0]
+        print(message)
+        sys.exit(0 if valid else 1)
+
+    for path, valid, message, seconds, cached in results:
+        note = "cached" if cached else f"{seconds * 1000:.1f} ms"
+        print(f"[{'OK' if valid else 'FAIL'}] {path} ({note}){'' if valid else ': ' + message}")
+    failed = sum(1 for row in results if not row[1])
+    cached = sum(1 for row in results if row[4])
+    print(f"\n{len(results) - failed}/{len(results)} skills valid in {wall:.2f}s "
+          f"(workers: {pool_size(args.workers, len(results) - cached)}, {cached} from cache)")
+    sys.exit(1 if failed or not results else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,498 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the SeeSaw client against the bundled mock API.
+
+Usage:
+    benchmark.py [--scenario NAME ...] [--requests N] [--output results.json]
+                 [--latency-ms MS] [--jitter-ms MS] [--handshake-ms MS]
+                 [--error-rate R] [--throttle-rate R] [--markets N]
+
+Scenarios:
+    single       sequential balance, get_market and get_quote calls
+    scan         full paginated iter_markets walk
+    quote-batch  get_quotes over N market/option pairs
+    upload       presigned URL + PUT for N files, then batch uploads with 1 vs 8
+                 workers and a re-run served from the content-hash index
+    estimate     N get_quote calls for an amount grid vs one local LMSR estimate
+    portfolio    `portfolio` valuation with an empty market mirror, then a warm one
+    decode       one --markets-sized page: identity vs gzip transfer, stdlib vs the
+                 fastest installed JSON backend, buffered vs streamed decode, and
+                 pretty vs compact output
+    models       traced memory and decode time of a --model-markets list as raw
+                 dicts vs `models.Market` objects (built locally, no HTTP)
+    transport    one-shot `requests.request` calls (a fresh connection per call)
+                 vs the pooled keep-alive session owned by `SeesawClient`
+    daemon       wall time per `seesaw.py balance` invocation, cold vs forwarded
+                 to a running `seesaw.py daemon`
+    import-time  median `seesaw.py --help` startup over a bare interpreter, checked
+                 against --startup-budget-ms; also fails if building a client
+                 for a simple command imports the HTTP stack, a thread pool or sqlite3
+
+Each scenario reports throughput and p50/p90/p99 latency; --output writes
+the results as JSON so client regressions can be tracked over time.
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import requests
+
+import json_codec
+import token_manager
+from market_mirror import MarketMirror
+from mock_server import MockConfig, MockState, start_mock_server
+from models import Market
+from portfolio import portfolio
+from rate_limit import RateLimiter
+from seesaw import SeesawClient, estimate_quotes, wire_size
+from upload_index import UploadIndex
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SCENARIOS = ["single", "scan", "quote-batch", "upload", "import-time"]
+
+
+def bench_client(base_url):
+    # No client-side throttle: measure the transport, not the configured rate limits.
+    return SeesawClient(base_url, "bench", "bench", rate_limiter=RateLimiter({}))
+
+
+def summarize(samples, wall=None):
+    samples = sorted(samples)
+    n = len(samples)
+    if not n:
+        return {"requests": 0}
+
+    def pct(q):
+        return round(samples[min(n - 1, int(n * q))] * 1000, 3)
+
+    wall = sum(samples) if wall is None else wall
+    return {
+        "requests": n,
+        "throughput_rps": round(n / wall, 1) if wall else None,
+        "mean_ms": round(sum(samples) / n * 1000, 3),
+        "p50_ms": pct(0.5),
+        "p90_ms": pct(0.9),
+        "p99_ms": pct(0.99),
+        "max_ms": round(samples[-1] * 1000, 3),
+        "total_s": round(wall, 3),
+    }
+
+
+def timed(fn, n):
+    samples = []
+    errors = 0
+    start = time.perf_counter()
+    for i in range(n):
+        t = time.perf_counter()
+        try:
+            fn(i)
+        except RuntimeError:
+            errors += 1
+        samples.append(time.perf_counter() - t)
+    result = summarize(samples, time.perf_counter() - start)
+    result["errors"] = errors
+    return result
+
+
+def sample_pairs(client, n):
+    markets = list(client.iter_markets(limit=100))
+    pairs = []
+    while len(pairs) < n:
+        market = client.get_market(markets[len(pairs) % len(markets)]["id"])["data"]
+        for option in market["options"]:
+            pairs.append((market["id"], option["id"]))
+    return markets, pairs[:n]
+
+
+def bench_single(base_url, args):
+    with bench_client(base_url) as client:
+        markets, pairs = sample_pairs(client, args.requests)
+        ids = [m["id"] for m in markets]
+        return {
+            "balance": timed(lambda i: client.get_balance(), args.requests),
+            "get_market": timed(lambda i: client.get_market(ids[i % len(ids)]), args.requests),
+            "get_quote": timed(lambda i: client.get_quote(*pairs[i], 10), args.requests),
+        }
+
+
+def bench_scan(base_url, args):
+    with bench_client(base_url) as client:
+        results = {}
+        for prefetch in (0, 2, 4):
+            start = time.perf_counter()
+            count = sum(1 for _ in client.iter_markets(limit=50, prefetch=prefetch))
+            wall = time.perf_counter() - start
+            results[f"prefetch_{prefetch}"] = {
+                "markets": count,
+                "total_s": round(wall, 3),
+                "markets_per_s": round(count / wall, 1),
+            }
+        return results
+
+
+def bench_quote_batch(base_url, args):
+    with bench_client(base_url) as client:
+        _, pairs = sample_pairs(client, args.requests)
+        batch = [(market_id, option_id, 10) for market_id, option_id in pairs]
+        results = {}
+        for workers in (1, 8, 32):
+            start = time.perf_counter()
+            rows = client.get_quotes(batch, workers=workers)
+            wall = time.perf_counter() - start
+            results[f"workers_{workers}"] = {
+                "quotes": len(rows),
+                "errors": sum(1 for row in rows if "error" in row),
+                "total_s": round(wall, 3),
+                "quotes_per_s": round(len(rows) / wall, 1),
+            }
+        return results
+
+
+def bench_upload(base_url, args):
+    workdir = tempfile.mkdtemp(prefix="seesaw-bench-")
+    path = os.path.join(workdir, "image.jpg")
+    with open(path, "wb") as f:
+        f.write(os.urandom(args.upload_kb * 1024))
+
+    with bench_client(base_url) as client:
+        def upload(i):
+            presigned = client.get_presigned_url()
+            client.upload_file(presigned["upload_url"], path, "image/jpeg")
+
+        result = {"single": timed(upload, args.requests)}
+
+        paths = []
+        for i in range(min(args.requests, 64)):
+            paths.append(os.path.join(workdir, f"batch-{i}.jpg"))
+            with open(paths[-1], "wb") as f:
+                f.write(os.urandom(args.upload_kb * 1024))
+        for workers in (1, 8):
+            start = time.perf_counter()
+            rows = client.upload_files(paths, workers=workers)
+            wall = time.perf_counter() - start
+            result[f"batch_workers_{workers}"] = {
+                "files": len(rows),
+                "errors": sum(1 for row in rows if "error" in row),
+                "total_s": round(wall, 3),
+                "files_per_s": round(len(rows) / wall, 1),
+            }
+        with UploadIndex(os.path.join(workdir, "uploads.sqlite3")) as index:
+            client.upload_files(paths, workers=8, index=index)
+            start = time.perf_counter()
+            rows = client.upload_files(paths, workers=8, index=index)
+            result["batch_deduplicated"] = {
+                "files": len(rows),
+                "cached": sum(1 for row in rows if row.get("cached")),
+                "total_s": round(time.perf_counter() - start, 3),
+            }
+    result["file_kb"] = args.upload_kb
+    return result
+
+
+def bench_estimate(base_url, args):
+    with bench_client(base_url) as client:
+        _, pairs = sample_pairs(client, 1)
+        market_id, option_id = pairs[0]
+        amounts = [10.0 * (i + 1) for i in range(args.requests)]
+
+        start = time.perf_counter()
+        rows = client.get_quotes([(market_id, option_id, amount) for amount in amounts], workers=8)
+        quoted = time.perf_counter() - start
+
+        start = time.perf_counter()
+        estimates = next(estimate_quotes(client, market_id, amounts, option_ids=[option_id]))["estimates"]
+        estimated = time.perf_counter() - start
+
+    errors = [abs(e["shares"] - float(r["quote"]["shares"])) / float(r["quote"]["shares"])
+              for e, r in zip(estimates, rows) if "quote" in r]
+    return {
+        "amounts": len(amounts),
+        "quotes_s": round(quoted, 3),
+        "estimate_s": round(estimated, 3),
+        "speedup": round(quoted / estimated, 1) if estimated else None,
+        "max_relative_error": round(max(errors), 6) if errors else None,
+    }
+
+
+def bench_decode(base_url, args):
+    reps = max(min(args.requests, 10), 1)
+    gzip_server, gzip_url = start_mock_server(MockConfig(markets=args.markets, gzip_min_bytes=1024))
+
+    def best_ms(fn):
+        samples = []
+        for _ in range(reps):
+            start = time.perf_counter()
+            fn()
+            samples.append(time.perf_counter() - start)
+        return round(min(samples) * 1000, 3)
+
+    results = {"markets": args.markets, "backend": json_codec.BACKEND}
+    try:
+        with bench_client(base_url) as plain, bench_client(gzip_url) as compressed:
+            for name, client in (("identity", plain), ("gzip", compressed)):
+                client.list_markets(1, args.markets)  # log in and warm the connection
+                url = f"{client.base_url}/markets"
+                params = {"page": 1, "limit": args.markets}
+                headers = {"Authorization": f"Bearer {client.tokens.get()}"}
+                resp = client.session.get(url, params=params, headers=headers)
+                results[f"{name}_bytes"] = wire_size(resp)
+                results[f"{name}_fetch_ms"] = best_ms(
+                    lambda: client.session.get(url, params=params, headers=headers).content)
+            body = resp.content
+            results["decode_ms"] = {"json": best_ms(lambda: json.loads(body)),
+                                    json_codec.BACKEND: best_ms(lambda: json_codec.loads(body))}
+
+            results["buffered_ms"] = best_ms(lambda: plain.list_markets(1, args.markets))
+            first_item = []
+
+            def streamed():
+                start = time.perf_counter()
+                for i, _ in enumerate(plain.list_markets(1, args.markets, stream=True)):
+                    if i == 0:
+                        first_item.append(time.perf_counter() - start)
+
+            results["streamed_ms"] = best_ms(streamed)
+            results["streamed_first_item_ms"] = round(min(first_item) * 1000, 3)
+
+            page = json.loads(body)
+            results["output_ms"] = {"pretty": best_ms(lambda: json.dumps(page, indent=2)),
+                                    "compact": best_ms(lambda: json_codec.dumps(page))}
+    finally:
+        gzip_server.shutdown()
+    return results
+
+
+def bench_models(base_url, args):
+    # Same payload shape as the mock API's market listing, decoded from JSON like resp.json() would.
+    state = MockState(MockConfig(markets=args.model_markets, positions=0))
+    blob = json.dumps(list(state.markets.values()))
+    del state
+    n = args.model_markets
+
+    def measure(build):
+        start = time.perf_counter()
+        build()
+        elapsed = time.perf_counter() - start
+        tracemalloc.start()
+        kept = build()
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        return kept, {"bytes": size, "bytes_per_market": round(size / n, 1), "decode_s": round(elapsed, 3)}
+
+    raw, results_raw = measure(lambda: json.loads(blob))
+    start = time.perf_counter()
+    raw_total = sum(m["volume"] + m["options"][0]["price"] for m in raw)
+    results_raw["scan_ms"] = round((time.perf_counter() - start) * 1000, 3)
+    del raw
+
+    models, results_models = measure(lambda: [Market.from_dict(m) for m in json.loads(blob)])
+    start = time.perf_counter()
+    models_total = sum(m.volume + m.prices[0] for m in models)
+    results_models["scan_ms"] = round((time.perf_counter() - start) * 1000, 3)
+
+    return {
+        "markets": n,
+        "raw": results_raw,
+        "models": results_models,
+        "memory_ratio": round(results_raw["bytes"] / results_models["bytes"], 2),
+        "same_totals": abs(raw_total - models_total) < 1e-6 * max(abs(raw_total), 1),
+    }
+
+
+def bench_portfolio(base_url, args):
+    mirror_path = os.path.join(tempfile.mkdtemp(prefix="seesaw-bench-"), "mirror.sqlite3")
+    results = {}
+    with bench_client(base_url) as client, MarketMirror(mirror_path) as mirror:
+        for run in ("cold", "warm"):
+            summary = portfolio(client, mirror, max_age=3600)
+            results[run] = {key: summary[key] for key in ("positions", "markets", "markets_fetched", "elapsed_s")}
+    return results
+
+
+class UnpooledSession:
+    """Session stand-in reproducing the old module-level `requests.request` calls."""
+
+    def request(self, method, url, **kwargs):
+        return requests.request(method, url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return requests.post(url, **kwargs)
+
+    def close(self):
+        pass
+
+
+def bench_transport(base_url, args):
+    before = bench_client(base_url)
+    before.session.close()
+    before.session = UnpooledSession()
+
+    with bench_client(base_url) as after:
+        results = {
+            "before_unpooled": timed(lambda i: before.get_balance(), args.requests),
+            "after_pooled": timed(lambda i: after.get_balance(), args.requests),
+        }
+    results["speedup"] = round(results["before_unpooled"]["mean_ms"] / results["after_pooled"]["mean_ms"], 2)
+    return results
+
+
+def time_cli(argv, env, n):
+    script = os.path.join(SCRIPT_DIR, "seesaw.py")
+    return timed(lambda i: subprocess.run([sys.executable, script, *argv], env=env, check=True,
+                                          stdout=subprocess.DEVNULL), n)
+
+
+def bench_daemon(base_url, args):
+    workdir = tempfile.mkdtemp(prefix="seesaw-bench-")
+    socket_path = os.path.join(workdir, "seesaw.sock")
+    env = dict(
+        os.environ,
+        SEESAW_BASE_URL=base_url,
+        SEESAW_API_KEY="bench",
+        SEESAW_API_SECRET="bench",
+        SEESAW_TOKEN_DIR=workdir,
+        SEESAW_SOCKET=socket_path,
+    )
+    invocations = min(args.requests, 50)
+    results = {"cold": time_cli(["--no-daemon", "balance"], env, invocations)}
+
+    daemon = subprocess.Popen([sys.executable, os.path.join(SCRIPT_DIR, "seesaw.py"), "daemon"], env=env,
+                              stderr=subprocess.DEVNULL)
+    try:
+        deadline = time.monotonic() + 10
+        while not os.path.exists(socket_path):
+            if time.monotonic() > deadline:
+                raise RuntimeError("seesaw daemon did not start")
+            time.sleep(0.05)
+        results["daemon"] = time_cli(["balance"], env, invocations)
+    finally:
+        daemon.terminate()
+        daemon.wait()
+    results["speedup"] = round(results["cold"]["mean_ms"] / results["daemon"]["mean_ms"], 2)
+    return results
+
+
+# Modules a forwarded or --help invocation must not pay for.
+HEAVY_MODULES = ("requests", "urllib3", "http.client", "ssl", "asyncio", "concurrent.futures", "sqlite3", "http.server")
+STARTUP_BUDGET_MS = 40.0
+STARTUP_PROBE = """
+import json, sys
+import seesaw
+argv = ["balance"]
+seesaw.build_parser(argv).parse_args(argv)
+seesaw.SeesawClient(api_key="probe", api_secret="probe")
+print(json.dumps([m for m in %r if m in sys.modules]))
+""" % (HEAVY_MODULES,)
+
+
+def eager_heavy_modules():
+    """HEAVY_MODULES imported by parsing a light command and building a client, per STARTUP_PROBE."""
+    probe = subprocess.run([sys.executable, "-c", STARTUP_PROBE], check=True, capture_output=True, text=True,
+                           cwd=SCRIPT_DIR)
+    return json.loads(probe.stdout)
+
+
+def startup_times(n):
+    """Timings of `n` bare interpreter, `seesaw.py --help` and `seesaw.py buy --help` runs."""
+    script = os.path.join(SCRIPT_DIR, "seesaw.py")
+    # Installed use reads seesaw_cli and its imports from __pycache__; one untimed run writes it.
+    env = {k: v for k, v in os.environ.items() if k != "PYTHONDONTWRITEBYTECODE"}
+
+    def run(argv):
+        return lambda i: subprocess.run([sys.executable, *argv], check=True, stdout=subprocess.DEVNULL, cwd=SCRIPT_DIR,
+                                        env=env)
+
+    run([script, "buy", "--help"])(0)
+    results = {
+        "interpreter": timed(run(["-c", "pass"]), n),
+        "help": timed(run([script, "--help"]), n),
+        "subcommand_help": timed(run([script, "buy", "--help"]), n),
+    }
+    results["startup_overhead_ms"] = round(results["help"]["p50_ms"] - results["interpreter"]["p50_ms"], 3)
+    return results
+
+
+def bench_import_time(base_url, args):
+    results = startup_times(min(args.requests, 30))
+    overhead = results["startup_overhead_ms"]
+    results["eager_heavy_modules"] = eager_heavy_modules()
+    results["budget_ms"] = args.startup_budget_ms
+    results["within_budget"] = overhead <= args.startup_budget_ms and not results["eager_heavy_modules"]
+    return results
+
+
+SCENARIOS = {
+    "single": bench_single,
+    "scan": bench_scan,
+    "quote-batch": bench_quote_batch,
+    "upload": bench_upload,
+    "portfolio": bench_portfolio,
+    "models": bench_models,
+    "decode": bench_decode,
+    "estimate": bench_estimate,
+    "transport": bench_transport,
+    "daemon": bench_daemon,
+    "import-time": bench_import_time,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the SeeSaw client against the bundled mock API")
+    parser.add_argument("--scenario", nargs="+", choices=sorted(SCENARIOS), default=DEFAULT_SCENARIOS)
+    parser.add_argument("--requests", type=int, default=200, help="Calls per measured operation")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    parser.add_argument("--markets", type=int, default=1000)
+    parser.add_argument("--upload-kb", type=int, default=256)
+    parser.add_argument("--model-markets", type=int, default=50000, help="List size for the models scenario")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Mock server latency per request")
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--handshake-ms", type=float, default=0.0,
+                        help="Delay added to every new connection, to model TCP/TLS setup on a real network")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--startup-budget-ms", type=float, default=STARTUP_BUDGET_MS,
+                        help="Max CLI startup overhead allowed by the import-time scenario")
+    args = parser.parse_args()
+
+    config = MockConfig(
+        markets=args.markets, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, handshake_ms=args.handshake_ms,
+        error_rate=args.error_rate, throttle_rate=args.throttle_rate,
+    )
+    server, base_url = start_mock_server(config)
+    # Keep benchmark logins away from real cached tokens.
+    token_manager.TOKEN_CACHE_DIR = tempfile.mkdtemp(prefix="seesaw-bench-")
+    report = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "config": {k: v for k, v in vars(args).items() if k not in ("scenario", "output")},
+        "results": {},
+    }
+    try:
+        for name in args.scenario:
+            print(f"Running {name}...", file=sys.stderr)
+            report["results"][name] = SCENARIOS[name](base_url, args)
+    finally:
+        server.shutdown()
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+        print(f"[OK] Results written to {args.output}", file=sys.stderr)
+    print(text)
+    startup = report["results"].get("import-time")
+    if startup is not None and not startup["within_budget"]:
+        print(f"[FAIL] Startup overhead {startup['startup_overhead_ms']} ms (budget {startup['budget_ms']} ms), "
+              f"eager heavy modules: {startup['eager_heavy_modules']}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
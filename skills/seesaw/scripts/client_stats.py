@@ -0,0 +1,233 @@
+"""
+Per-endpoint latency and throughput instrumentation for SeesawClient.
+
+`ClientStats` aggregates every request by endpoint ("GET markets/{id}"):
+a latency histogram (p50/p90/p99 estimated from fixed buckets), bytes in and
+out, retry/401-relogin/cache-hit counts and error classes. Hooks receive each
+raw sample; exporters write snapshots as JSON or Prometheus text to a file
+periodically, or serve the Prometheus text on a local port.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import Counter
+
+# Histogram upper bounds in seconds (Prometheus-style, +Inf implied).
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def body_size(body):
+    if body is None:
+        return 0
+    if isinstance(body, (bytes, str)):
+        return len(body)
+    try:
+        return os.fstat(body.fileno()).st_size
+    except (AttributeError, OSError, ValueError):
+        return 0
+
+
+class EndpointStats:
+    def __init__(self):
+        self.count = 0
+        self.latency_sum = 0.0
+        self.latency_max = 0.0
+        self.buckets = [0] * (len(BUCKETS) + 1)
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.retries = 0
+        self.relogins = 0
+        self.cache_hits = 0
+        self.errors = Counter()
+
+    def observe(self, latency, bytes_out, bytes_in, error, retries, relogins):
+        self.count += 1
+        self.latency_sum += latency
+        self.latency_max = max(self.latency_max, latency)
+        for i, bound in enumerate(BUCKETS):
+            if latency <= bound:
+                self.buckets[i] += 1
+                break
+        else:
+            self.buckets[-1] += 1
+        self.bytes_out += bytes_out
+        self.bytes_in += bytes_in
+        self.retries += retries
+        self.relogins += relogins
+        if error:
+            self.errors[error] += 1
+
+    def percentile(self, q):
+        """Estimate the q-quantile by linear interpolation inside its bucket."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            if n and seen + n >= rank:
+                lower = BUCKETS[i - 1] if i else 0.0
+                upper = BUCKETS[i] if i < len(BUCKETS) else self.latency_max
+                return min(lower + (upper - lower) * (rank - seen) / n, self.latency_max)
+            seen += n
+        return self.latency_max
+
+    def to_dict(self):
+        def ms(value):
+            return None if value is None else round(value * 1000, 3)
+
+        return {
+            "count": self.count,
+            "mean_ms": ms(self.latency_sum / self.count) if self.count else None,
+            "p50_ms": ms(self.percentile(0.5)),
+            "p90_ms": ms(self.percentile(0.9)),
+            "p99_ms": ms(self.percentile(0.99)),
+            "max_ms": ms(self.latency_max) if self.count else None,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "retries": self.retries,
+            "relogins": self.relogins,
+            "cache_hits": self.cache_hits,
+            "errors": dict(self.errors),
+        }
+
+
+class ClientStats:
+    def __init__(self):
+        self.started_at = time.time()
+        self._endpoints = {}
+        self._hooks = []
+        self._lock = threading.Lock()
+
+    def add_hook(self, hook):
+        """Call hook(endpoint, sample_dict) after every recorded request."""
+        self._hooks.append(hook)
+
+    def _endpoint(self, endpoint):
+        stats = self._endpoints.get(endpoint)
+        if stats is None:
+            stats = self._endpoints[endpoint] = EndpointStats()
+        return stats
+
+    def record(self, endpoint, latency, bytes_out=0, bytes_in=0, error=None, retries=0, relogins=0):
+        with self._lock:
+            self._endpoint(endpoint).observe(latency, bytes_out, bytes_in, error, retries, relogins)
+        if self._hooks:
+            sample = {
+                "endpoint": endpoint,
+                "latency": latency,
+                "bytes_out": bytes_out,
+                "bytes_in": bytes_in,
+                "error": error,
+                "retries": retries,
+                "relogins": relogins,
+            }
+            for hook in self._hooks:
+                hook(endpoint, sample)
+
+    def cache_hit(self, endpoint):
+        with self._lock:
+            self._endpoint(endpoint).cache_hits += 1
+
+    def snapshot(self):
+        with self._lock:
+            endpoints = {name: stats.to_dict() for name, stats in sorted(self._endpoints.items())}
+        return {"uptime_s": round(time.time() - self.started_at, 3), "endpoints": endpoints}
+
+    def summary(self):
+        header = ("endpoint", "calls", "errors", "p50ms", "p90ms", "p99ms", "in", "out", "retry", "relogin", "cached")
+        rows = [header]
+        for name, s in self.snapshot()["endpoints"].items():
+            rows.append((
+                name, s["count"], sum(s["errors"].values()), s["p50_ms"], s["p90_ms"], s["p99_ms"],
+                s["bytes_in"], s["bytes_out"], s["retries"], s["relogins"], s["cache_hits"],
+            ))
+        rows = [["-" if c is None else str(c) for c in row] for row in rows]
+        widths = [max(len(row[i]) for row in rows) for i in range(len(header))]
+        return "\n".join("  ".join(c.ljust(w) for c, w in zip(row, widths)).rstrip() for row in rows)
+
+    def prometheus(self):
+        with self._lock:
+            items = sorted(self._endpoints.items())
+            lines = [
+                "# TYPE seesaw_request_duration_seconds histogram",
+            ]
+            for name, s in items:
+                cumulative = 0
+                for bound, n in zip(BUCKETS + ("+Inf",), s.buckets):
+                    cumulative += n
+                    lines.append(f'seesaw_request_duration_seconds_bucket{{endpoint="{name}",le="{bound}"}} {cumulative}')
+                lines.append(f'seesaw_request_duration_seconds_sum{{endpoint="{name}"}} {s.latency_sum}')
+                lines.append(f'seesaw_request_duration_seconds_count{{endpoint="{name}"}} {s.count}')
+            counters = (
+                ("seesaw_request_bytes_in_total", "bytes_in"),
+                ("seesaw_request_bytes_out_total", "bytes_out"),
+                ("seesaw_request_retries_total", "retries"),
+                ("seesaw_relogins_total", "relogins"),
+                ("seesaw_cache_hits_total", "cache_hits"),
+            )
+            for metric, attr in counters:
+                lines.append(f"# TYPE {metric} counter")
+                lines.extend(f'{metric}{{endpoint="{name}"}} {getattr(s, attr)}' for name, s in items)
+            lines.append("# TYPE seesaw_request_errors_total counter")
+            for name, s in items:
+                lines.extend(
+                    f'seesaw_request_errors_total{{endpoint="{name}",class="{cls}"}} {n}' for cls, n in sorted(s.errors.items())
+                )
+        return "\n".join(lines) + "\n"
+
+    def render(self, fmt):
+        return self.prometheus() if fmt == "prometheus" else json.dumps(self.snapshot(), indent=2) + "\n"
+
+    def write(self, path, fmt=None):
+        """Atomically write a snapshot; format follows the extension (.prom) unless given."""
+        fmt = fmt or ("prometheus" if path.endswith((".prom", ".txt")) else "json")
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            f.write(self.render(fmt))
+        os.replace(tmp, path)
+
+
+class PeriodicExporter:
+    """Write a stats snapshot to `path` every `interval` seconds (and once on stop)."""
+
+    def __init__(self, stats, path, interval=10.0, fmt=None):
+        self.stats = stats
+        self.path = path
+        self.interval = interval
+        self.fmt = fmt
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="seesaw-stats", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.stats.write(self.path, self.fmt)
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.stats.write(self.path, self.fmt)
+
+
+def serve_prometheus(stats, port, host="127.0.0.1"):
+    """Serve Prometheus text on http://host:port/metrics from a background thread."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = stats.prometheus().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="seesaw-metrics", daemon=True).start()
+    return server
@@ -0,0 +1,174 @@
+"""
+JSON encoding and decoding for the client and CLI.
+
+`loads`/`dumps` use orjson or ujson when one is installed and the stdlib
+`json` module otherwise; set SEESAW_JSON_BACKEND=json to force the stdlib.
+`ItemStream` decodes a list response while its body is still arriving, so a
+caller can process the first items of a large page before the last byte is
+read and never holds the whole body and the whole list at once.
+"""
+
+import codecs
+import json
+import os
+import re
+
+BACKEND = os.getenv("SEESAW_JSON_BACKEND", "auto")
+LIST_KEYS = ("data", "items", "results", "markets", "positions")
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+NUMBER_TAIL = re.compile(r"[0-9.eE+-]*")
+
+_orjson = _ujson = None
+if BACKEND in ("auto", "orjson"):
+    try:
+        import orjson as _orjson
+    except ImportError:
+        pass
+if _orjson is None and BACKEND in ("auto", "ujson"):
+    try:
+        import ujson as _ujson
+    except ImportError:
+        pass
+
+BACKEND = "orjson" if _orjson is not None else "ujson" if _ujson is not None else "json"
+
+
+def loads(data):
+    """Decode a JSON document from bytes or str."""
+    if _orjson is not None:
+        return _orjson.loads(data)
+    if _ujson is not None:
+        return _ujson.loads(data)
+    return json.loads(data)
+
+
+def dumps(value, indent=None):
+    """Encode `value` as str: one compact line, or pretty-printed with `indent` 2."""
+    if _orjson is not None:
+        try:
+            return _orjson.dumps(value, option=_orjson.OPT_INDENT_2 if indent else 0).decode()
+        except TypeError:
+            pass  # e.g. non-str keys or integers past 64 bits; the stdlib handles them
+    elif _ujson is not None:
+        try:
+            return _ujson.dumps(value, indent=indent or 0, escape_forward_slashes=False)
+        except (TypeError, OverflowError):
+            pass
+    return json.dumps(value, indent=indent) if indent else json.dumps(value, separators=(",", ":"))
+
+
+class ItemStream:
+    """
+    Incrementally decode a JSON list response from an iterable of byte chunks.
+
+    The body may be a bare array or an object holding the list under one of
+    `keys`. Iterating yields the list items as soon as each one is complete.
+    Afterwards `meta` holds the object's other members (e.g. "pagination")
+    and `count` the number of items. `on_close` runs once iteration ends or is
+    abandoned. If `on_error` is given, an exception raised while reading or
+    decoding is passed to it and the exception it returns is raised instead.
+    """
+
+    def __init__(self, chunks, keys=LIST_KEYS, on_close=None, on_error=None):
+        self.keys = keys
+        self.meta = None
+        self.count = 0
+        self._chunks = iter(chunks)
+        self._on_close = on_close
+        self._on_error = on_error
+        self._decoder = json.JSONDecoder()  # raw_decode is the only incremental entry point
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    def __iter__(self):
+        try:
+            yield from self._items()
+        except Exception as e:
+            if self._on_error is None:
+                raise
+            raise self._on_error(e) from e
+        finally:
+            if self._on_close is not None:
+                self._on_close()
+                self._on_close = None
+
+    def _fill(self):
+        """Append the next chunk to the unread buffer; False at end of input."""
+        if self._eof:
+            return False
+        for chunk in self._chunks:
+            if chunk:
+                self._buf = self._buf[self._pos:] + (self._utf8.decode(chunk) if isinstance(chunk, bytes) else chunk)
+                self._pos = 0
+                return True
+        self._eof = True
+        self._buf = self._buf[self._pos:] + self._utf8.decode(b"", final=True)
+        self._pos = 0
+        return False
+
+    def _peek(self):
+        while True:
+            self._pos = WHITESPACE.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                raise ValueError("Unexpected end of JSON list response")
+
+    def _expect(self, chars):
+        char = self._peek()
+        if char not in chars:
+            raise ValueError(f"Expected one of {chars!r} in JSON list response, got {char!r}")
+        self._pos += 1
+        return char
+
+    def _value(self):
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except ValueError:
+                if not self._fill():
+                    raise
+                continue
+            # A number cut off by the chunk boundary ("12" of "12.5e3") decodes without error.
+            if type(value) in (int, float) and NUMBER_TAIL.fullmatch(self._buf, end) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def _array(self):
+        self._expect("[")
+        if self._peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            item = self._value()
+            self.count += 1
+            yield item
+            if self._expect(",]") == "]":
+                return
+
+    def _items(self):
+        if self._peek() == "[":
+            yield from self._array()
+            self.meta = {}
+            return
+        self._expect("{")
+        meta = {}
+        streamed = False
+        if self._peek() == "}":
+            self._pos += 1
+        else:
+            while True:
+                key = self._value()
+                self._expect(":")
+                if not streamed and key in self.keys and self._peek() == "[":
+                    yield from self._array()
+                    streamed = True
+                else:
+                    meta[key] = self._value()
+                if self._expect(",}") == "}":
+                    break
+        self.meta = meta
@@ -0,0 +1,257 @@
+"""
+Local SQLite mirror of SeeSaw markets and their options.
+
+`MarketMirror.sync()` walks `list_markets` and only calls `get_market` for
+markets that are new or whose listing changed since the last sync (by
+`updated_at`, or a hash of the listing entry when the API has none). Markets
+that drop out of a status listing are refetched so their new status lands in
+the mirror. A status only counts as synced (see `age`) once every fetch for it
+succeeded. Reads are indexed on status, category_id and end_time.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from models import unwrap
+from response_cache import CACHE_DIR
+
+MIRROR_PATH = os.getenv("SEESAW_MIRROR_PATH", os.path.join(CACHE_DIR, "mirror.sqlite3"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS markets (
+    id TEXT PRIMARY KEY,
+    status TEXT,
+    category_id TEXT,
+    end_time TEXT,
+    version TEXT NOT NULL,
+    data TEXT NOT NULL,
+    synced_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS markets_status ON markets(status);
+CREATE INDEX IF NOT EXISTS markets_category ON markets(category_id);
+CREATE INDEX IF NOT EXISTS markets_end_time ON markets(end_time);
+CREATE TABLE IF NOT EXISTS options (
+    market_id TEXT NOT NULL,
+    id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (market_id, id)
+);
+CREATE TABLE IF NOT EXISTS sync_state (
+    status TEXT PRIMARY KEY,
+    synced_at REAL NOT NULL
+);
+"""
+
+
+def market_version(item):
+    if item.get("updated_at"):
+        return str(item["updated_at"])
+    return hashlib.sha1(json.dumps(item, sort_keys=True).encode()).hexdigest()
+
+
+class MarketMirror:
+    def __init__(self, path=None):
+        self.path = path or MIRROR_PATH
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(self.path, timeout=10)
+        self._db.executescript(SCHEMA)
+
+    def close(self):
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _store(self, market, version, synced_at):
+        market_id = str(market["id"])
+        self._db.execute(
+            "INSERT OR REPLACE INTO markets VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                market_id,
+                market.get("status"),
+                None if market.get("category_id") is None else str(market["category_id"]),
+                market.get("end_time"),
+                version,
+                json.dumps(market),
+                synced_at,
+            ),
+        )
+        self._db.execute("DELETE FROM options WHERE market_id = ?", (market_id,))
+        options = market.get("options") or []
+        self._db.executemany(
+            "INSERT OR REPLACE INTO options VALUES (?, ?, ?, ?)",
+            [
+                (market_id, str(option.get("id", i) if isinstance(option, dict) else option), i, json.dumps(option))
+                for i, option in enumerate(options)
+            ],
+        )
+
+    def sync(self, client, statuses=("active",), full=False, workers=8):
+        """
+        Bring the mirror up to date for the given market statuses.
+
+        Args:
+            client: SeesawClient used for list_markets/get_market
+            statuses: Market statuses to mirror
+            full: Refetch every market even if its listing is unchanged
+            workers: Concurrent get_market calls
+
+        Returns:
+            Summary dict with counts of scanned, fetched, moved and failed markets
+        """
+        started = time.time()
+        known = dict(self._db.execute("SELECT id, version FROM markets"))
+        scanned = 0
+        changed = {}
+        unchanged = []
+        moved = set()
+        origin = {}  # market id -> the status listing that made it a fetch candidate
+
+        for status in statuses:
+            seen = set()
+            for item in client.iter_markets(status=status, limit=100):
+                market_id = str(item["id"])
+                seen.add(market_id)
+                scanned += 1
+                version = market_version(item)
+                if full or known.get(market_id) != version:
+                    changed[market_id] = version
+                    origin[market_id] = status
+                else:
+                    unchanged.append((started, market_id))
+            listed = {row[0] for row in self._db.execute("SELECT id FROM markets WHERE status = ?", (status,))}
+            for market_id in listed - seen:
+                origin.setdefault(market_id, status)
+            moved |= listed - seen
+
+        # A market that left a listing changed status: refetch it to learn where it went.
+        for market_id in moved - changed.keys():
+            changed[market_id] = known.get(market_id, "")
+
+        def fetch(market_id):
+            try:
+                return market_id, unwrap(client.get_market(market_id)), None
+            except RuntimeError as e:
+                return market_id, None, e
+
+        fetched = failed = 0
+        incomplete = set()
+        with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool, self._db:
+            for market_id, market, error in pool.map(fetch, changed):
+                if error is not None:
+                    if getattr(error, "status_code", None) == 404:
+                        self._db.execute("DELETE FROM markets WHERE id = ?", (market_id,))
+                        self._db.execute("DELETE FROM options WHERE market_id = ?", (market_id,))
+                    else:
+                        failed += 1
+                        incomplete.add(origin[market_id])
+                    continue
+                market.setdefault("id", market_id)
+                self._store(market, changed[market_id], started)
+                fetched += 1
+            self._db.executemany("UPDATE markets SET synced_at = ? WHERE id = ?", unchanged)
+            # A status with failed fetches still holds stale markets, so its last complete sync time stands.
+            self._db.executemany(
+                "INSERT OR REPLACE INTO sync_state VALUES (?, ?)",
+                [(status, started) for status in statuses if status not in incomplete],
+            )
+
+        return {
+            "scanned": scanned,
+            "fetched": fetched,
+            "moved": len(moved),
+            "failed": failed,
+            "incomplete_statuses": sorted(incomplete),
+            "elapsed_s": round(time.time() - started, 3),
+        }
+
+    def age(self, status):
+        """Seconds since `status` was last synced, or None if it never was."""
+        row = self._db.execute("SELECT synced_at FROM sync_state WHERE status = ?", (status,)).fetchone()
+        return None if row is None else time.time() - row[0]
+
+    def get_market(self, market_id, max_age=None):
+        row = self._db.execute("SELECT data, synced_at FROM markets WHERE id = ?", (str(market_id),)).fetchone()
+        if row is None or (max_age is not None and time.time() - row[1] > max_age):
+            return None
+        return json.loads(row[0])
+
+    def get_markets(self, client, market_ids, max_age=None, workers=8):
+        """
+        Market snapshots for `market_ids`, fetching only those missing or older than `max_age`.
+
+        Returns:
+            (markets, fetched): dict of market id -> market (ids that could not
+            be fetched are left out) and the number of markets fetched
+        """
+        markets = {}
+        stale = []
+        for market_id in dict.fromkeys(str(m) for m in market_ids):
+            market = self.get_market(market_id, max_age)
+            if market is None:
+                stale.append(market_id)
+            else:
+                markets[market_id] = market
+
+        def fetch(market_id):
+            try:
+                return market_id, unwrap(client.get_market(market_id))
+            except RuntimeError:
+                return market_id, None
+
+        now = time.time()
+        fetched = 0
+        with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool, self._db:
+            for market_id, market in pool.map(fetch, stale):
+                if market is None:
+                    continue
+                market.setdefault("id", market_id)
+                self._store(market, self._detail_version(market), now)
+                markets[market_id] = market
+                fetched += 1
+        return markets, fetched
+
+    def _detail_version(self, market):
+        """
+        Version to store for a market fetched outside `sync`.
+
+        `sync` compares versions of listing entries, and hashing the detail
+        payload would never match one, so without `updated_at` the version
+        from the last listing is kept (empty if the market was never listed).
+        """
+        if market.get("updated_at"):
+            return market_version(market)
+        row = self._db.execute("SELECT version FROM markets WHERE id = ?", (str(market["id"]),)).fetchone()
+        return row[0] if row else ""
+
+    def _where(self, status, category_id):
+        clauses, params = ["status = ?"], [status]
+        if category_id:
+            clauses.append("category_id = ?")
+            params.append(str(category_id))
+        return " AND ".join(clauses), params
+
+    def iter_markets(self, status="active", category_id=None):
+        where, params = self._where(status, category_id)
+        for (data,) in self._db.execute(f"SELECT data FROM markets WHERE {where} ORDER BY end_time, id", params):
+            yield json.loads(data)
+
+    def list_markets(self, page=1, limit=20, status="active", category_id=None):
+        where, params = self._where(status, category_id)
+        total = self._db.execute(f"SELECT COUNT(*) FROM markets WHERE {where}", params).fetchone()[0]
+        rows = self._db.execute(
+            f"SELECT data FROM markets WHERE {where} ORDER BY end_time, id LIMIT ? OFFSET ?",
+            params + [limit, (page - 1) * limit],
+        )
+        return {
+            "data": [json.loads(data) for (data,) in rows],
+            "pagination": {"page": page, "limit": limit, "total": total, "total_pages": -(-total // limit)},
+        }
@@ -0,0 +1,219 @@
+"""
+Market watch: poll or stream markets and emit only what changed.
+
+Each market is flattened into the watched fields (status, volume, liquidity,
+end time, title and one `price:<option_id>` per option). Every new snapshot
+is diffed against the previous one, and the events are `snapshot` (first sight),
+`change` (changed fields with old and new values), `removed`, `alert`
+(threshold rules) and `error`. Polling revalidates through the client's
+response cache (`If-None-Match`), so an unchanged market costs a 304. The
+push transport reads the same snapshots from a Server-Sent Events stream.
+"""
+
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from models import number, unwrap
+
+WATCH_FIELDS = ("status", "volume", "liquidity", "end_time", "title")
+PUSH_PATH = "markets/stream"
+RECONNECT_DELAY = (0.5, 30.0)
+
+
+def market_fields(market):
+    fields = {key: market[key] for key in WATCH_FIELDS if key in market}
+    for option in market.get("options") or ():
+        if isinstance(option, dict) and "price" in option:
+            fields[f"price:{option.get('id')}"] = option["price"]
+    return fields
+
+
+def diff_fields(old, new):
+    changes = {key: {"old": old.get(key), "new": value} for key, value in new.items() if old.get(key) != value}
+    changes.update({key: {"old": value, "new": None} for key, value in old.items() if key not in new})
+    return changes
+
+
+class PushAuthError(Exception):
+    """The push endpoint kept answering 401 after a token refresh.
+
+    Not a RuntimeError on purpose: callers fall back to polling on those,
+    which would not help with bad credentials.
+    """
+
+
+class AlertRules:
+    """Threshold alerts, measured from the value at the previous alert (or first sight)."""
+
+    def __init__(self, price_move=None, volume_move=None, status=False):
+        self.price_move = price_move
+        self.volume_move = volume_move
+        self.status = status
+        self._baselines = {}
+
+    def _moved(self, market_id, field, value, threshold, rule):
+        baselines = self._baselines.setdefault(market_id, {})
+        value = number(value)
+        base = baselines.setdefault(field, value)
+        if value is None or base is None or abs(value - base) < threshold:
+            return None
+        baselines[field] = value
+        return {"event": "alert", "market_id": market_id, "rule": rule, "field": field,
+                "baseline": base, "value": value, "change": round(value - base, 6)}
+
+    def check(self, market_id, fields, changes=None):
+        alerts = []
+        for field, value in fields.items():
+            alert = None
+            if self.price_move is not None and field.startswith("price:"):
+                alert = self._moved(market_id, field, value, self.price_move, "price_move")
+            elif self.volume_move is not None and field == "volume":
+                alert = self._moved(market_id, field, value, self.volume_move, "volume_move")
+            if alert is not None:
+                alerts.append(alert)
+        if self.status and changes and "status" in changes:
+            alerts.append({"event": "alert", "market_id": market_id, "rule": "status", "field": "status",
+                           "baseline": changes["status"]["old"], "value": changes["status"]["new"]})
+        return alerts
+
+
+class MarketWatcher:
+    def __init__(self, client, market_ids=None, status="active", rules=None, workers=8):
+        """
+        Args:
+            client: SeesawClient; give it a response cache for conditional polling
+            market_ids: Markets to watch with get_market (default: the whole `status` listing)
+            status: Listing watched when no market IDs are given
+            rules: AlertRules, or None for no alerts
+            workers: Concurrent get_market calls per poll
+        """
+        self.client = client
+        self.market_ids = [str(m) for m in market_ids or ()]
+        self.status = status
+        self.rules = rules
+        self.workers = workers
+        self.snapshots = {}
+
+    def update(self, markets, removed=()):
+        """Diff market snapshots (id -> market) against the last ones; returns events."""
+        at = time.time()
+        events = []
+        for market_id, market in markets.items():
+            fields = market_fields(market)
+            old = self.snapshots.get(market_id)
+            changes = None
+            if old is None:
+                events.append({"event": "snapshot", "market_id": market_id, "at": at, "fields": fields})
+            else:
+                changes = diff_fields(old, fields)
+                if changes:
+                    events.append({"event": "change", "market_id": market_id, "at": at, "changes": changes})
+            self.snapshots[market_id] = fields
+            if self.rules is not None:
+                events.extend(self.rules.check(market_id, fields, changes))
+        for market_id in removed:
+            if self.snapshots.pop(market_id, None) is not None:
+                events.append({"event": "removed", "market_id": market_id, "at": at})
+        return events
+
+    def poll(self):
+        """Fetch every watched market once (revalidating cached copies) and diff it."""
+        if not self.market_ids:
+            markets = {str(m["id"]): m for m in self.client.iter_markets(self.status, max_age=0)}
+            return self.update(markets, [m for m in self.snapshots if m not in markets])
+
+        def fetch(market_id):
+            try:
+                return market_id, unwrap(self.client.get_market(market_id, max_age=0)), None
+            except RuntimeError as e:
+                return market_id, None, e
+
+        markets, removed, errors = {}, [], []
+        with ThreadPoolExecutor(max_workers=max(min(self.workers, len(self.market_ids)), 1)) as pool:
+            for market_id, market, error in pool.map(fetch, self.market_ids):
+                if error is None:
+                    markets[market_id] = market
+                elif getattr(error, "status_code", None) == 404:
+                    removed.append(market_id)
+                else:
+                    errors.append({"event": "error", "market_id": market_id, "error": str(error)})
+        return self.update(markets, removed) + errors
+
+    def run(self, emit, interval=5.0, count=None):
+        """Poll every `interval` seconds, passing each event to `emit`; `count` limits the polls."""
+        polls = 0
+        while count is None or polls < count:
+            started = time.monotonic()
+            try:
+                events = self.poll()
+            except RuntimeError as e:
+                events = [{"event": "error", "error": str(e)}]
+            for event in events:
+                emit(event)
+            polls += 1
+            if count is None or polls < count:
+                time.sleep(max(interval - (time.monotonic() - started), 0))
+
+    def push_url(self):
+        return f"{self.client.base_url}/{PUSH_PATH}"
+
+    def push_params(self):
+        return {"ids": ",".join(self.market_ids)} if self.market_ids else {"status": self.status}
+
+    def stream(self, emit, url=None, count=None):
+        """
+        Diff market snapshots pushed over Server-Sent Events, reconnecting with backoff.
+
+        Each `data:` payload is a market (or {"data": market}). `count` stops
+        after that many messages. Raises RuntimeError if the server has no
+        push endpoint (404/405), so the caller can fall back to polling, and
+        PushAuthError if the server still answers 401 right after a token refresh.
+        """
+        url = url or self.push_url()
+        received = 0
+        delay = RECONNECT_DELAY[0]
+        refreshed = False
+        while count is None or received < count:
+            headers = {"Authorization": f"Bearer {self.client.tokens.get()}", "Accept": "text/event-stream"}
+            try:
+                with self.client.session.get(url, params=self.push_params(), headers=headers, stream=True,
+                                             timeout=(10, 60)) as resp:
+                    if resp.status_code in (404, 405):
+                        raise RuntimeError(f"No push endpoint at {url} (HTTP {resp.status_code})")
+                    if resp.status_code == 401:
+                        # One refresh per connection attempt; a second 401 means the credentials are bad.
+                        if refreshed:
+                            raise PushAuthError(f"Push stream at {url} rejected a freshly refreshed token (HTTP 401)")
+                        self.client.tokens.refresh(headers["Authorization"][7:])
+                        refreshed = True
+                        continue
+                    resp.raise_for_status()
+                    delay = RECONNECT_DELAY[0]
+                    refreshed = False
+                    for data in iter_sse(resp):
+                        market = unwrap(json.loads(data))
+                        for event in self.update({str(market["id"]): market}):
+                            emit(event)
+                        received += 1
+                        if count is not None and received >= count:
+                            return
+            except (requests.exceptions.RequestException, ValueError) as e:
+                emit({"event": "error", "error": f"push stream: {e}", "reconnect_in": delay})
+                time.sleep(delay)
+                delay = min(delay * 2, RECONNECT_DELAY[1])
+
+
+def iter_sse(resp):
+    """Yield the data of each Server-Sent Event in a streaming response."""
+    resp.encoding = "utf-8"  # the SSE wire format is always UTF-8
+    data = []
+    for line in resp.iter_lines(chunk_size=None, decode_unicode=True):
+        if not line:
+            if data:
+                yield "\n".join(data)
+                data = []
+        elif line.startswith("data:"):
+            data.append(line[5:].lstrip(" "))
@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+"""
+Local mock of the SeeSaw API for benchmarks and offline development.
+
+Usage:
+    mock_server.py [--port 8080] [--markets 500] [--latency-ms 20] [--jitter-ms 5] [--handshake-ms 0]
+                   [--error-rate 0.01] [--throttle-rate 0.02] [--pad-bytes 0] [--gzip-min-bytes 1024]
+
+Implements the endpoints SeesawClient uses (agent login, markets, quotes,
+trades, positions, balance, presigned uploads) with in-memory state, plus a
+`markets/stream` Server-Sent Events push for `watch --transport sse`. Prices
+follow an LMSR market maker, so quotes show realistic price impact. Latency,
+jitter, 5xx errors, 429s, payload size and gzip compression are configurable.
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import math
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+STREAM_POLL_INTERVAL = 0.05
+STREAM_HEARTBEAT = 1.0
+
+
+class MockConfig:
+    def __init__(self, markets=500, options=2, positions=200, latency_ms=0.0, jitter_ms=0.0, handshake_ms=0.0,
+                 error_rate=0.0, throttle_rate=0.0, retry_after=0.1, pad_bytes=0, liquidity=1000.0, seed=7,
+                 gzip_min_bytes=None):
+        self.markets = markets
+        self.options = options
+        self.positions = positions
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.handshake_ms = handshake_ms
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.pad_bytes = pad_bytes
+        self.liquidity = liquidity
+        self.seed = seed
+        self.gzip_min_bytes = gzip_min_bytes
+
+
+class MockState:
+    def __init__(self, config):
+        self.config = config
+        self.lock = threading.Lock()
+        self.random = random.Random(config.seed)
+        self.tokens = set()
+        self.trades = {}
+        self.uploads = {}
+        self.balance = 100000.0
+        self.markets = {}
+        self.positions = []
+        for i in range(config.markets):
+            self.add_market(f"Market {i}", [f"Option {j}" for j in range(config.options)], f"2027-01-{i % 28 + 1:02d}T00:00:00Z",
+                            category_id=i % 8)
+        market_ids = list(self.markets)
+        for i in range(min(config.positions, len(market_ids))):
+            market = self.markets[market_ids[i]]
+            option = market["options"][i % len(market["options"])]
+            self.positions.append({
+                "prediction_id": market["id"],
+                "option_id": option["id"],
+                "shares": str(round(10 + self.random.random() * 90, 4)),
+                "cost": str(round(5 + self.random.random() * 40, 4)),
+            })
+
+    def add_market(self, title, options, end_time, category_id=None, description=None, probabilities=None):
+        market_id = str(uuid.UUID(int=self.random.getrandbits(128)))
+        weights = probabilities or [1] * len(options)
+        total = sum(weights)
+        market = {
+            "id": market_id,
+            "title": title,
+            "description": description or ("x" * self.config.pad_bytes),
+            "status": "active",
+            "category_id": category_id,
+            "end_time": end_time,
+            "liquidity": self.config.liquidity,
+            "volume": 0.0,
+            "updated_at": 1,
+            "options": [
+                {"id": str(uuid.UUID(int=self.random.getrandbits(128))), "name": name,
+                 "shares": self.config.liquidity * math.log(w / total)}
+                for name, w in zip(options, weights)
+            ],
+        }
+        self._reprice(market)
+        self.markets[market_id] = market
+        return market
+
+    def _reprice(self, market):
+        b = market["liquidity"]
+        exps = [math.exp(option["shares"] / b) for option in market["options"]]
+        total = sum(exps)
+        for option, e in zip(market["options"], exps):
+            option["price"] = round(e / total, 6)
+
+    def quote(self, market, option, amount, side):
+        """LMSR: shares bought for `amount` (buy) or proceeds for `amount` shares (sell)."""
+        b = market["liquidity"]
+        p = option["price"]
+        if side == "buy":
+            shares = b * math.log((math.exp(amount / b) - 1 + p) / p)
+            cost = amount
+        else:
+            shares = amount
+            cost = -b * math.log(1 - p + p * math.exp(-shares / b))
+        new_price = p * math.exp((shares if side == "buy" else -shares) / b)
+        new_price = new_price / (1 - p + new_price)
+        return {
+            "prediction_id": market["id"],
+            "option_id": option["id"],
+            "side": side,
+            "amount": str(amount),
+            "shares": str(round(shares, 6)),
+            "cost": str(round(cost, 6)),
+            "avg_price": str(round(cost / shares, 6)) if shares else "0",
+            "price_before": str(p),
+            "price_after": str(round(new_price, 6)),
+            "price_impact": str(round(abs(new_price - p), 6)),
+        }
+
+    def execute(self, market, option, amount, side):
+        quote = self.quote(market, option, amount, side)
+        option["shares"] += float(quote["shares"]) * (1 if side == "buy" else -1)
+        market["volume"] += float(quote["cost"])
+        market["updated_at"] += 1
+        self._reprice(market)
+        self.balance += float(quote["cost"]) * (-1 if side == "buy" else 1)
+        return quote
+
+
+def paginate(items, query):
+    page = max(int(query.get("page", 1)), 1)
+    limit = max(int(query.get("limit", 20)), 1)
+    total = len(items)
+    return {
+        "data": items[(page - 1) * limit:page * limit],
+        "pagination": {"page": page, "limit": limit, "total": total, "total_pages": -(-total // limit)},
+    }
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    state = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        # Models TCP/TLS connection setup, paid once per new connection.
+        if self.state.config.handshake_ms:
+            time.sleep(self.state.config.handshake_ms / 1000)
+
+    def _send(self, status, payload=None, headers=None):
+        body = b"" if payload is None else json.dumps(payload).encode()
+        min_bytes = self.state.config.gzip_min_bytes
+        compress = (min_bytes is not None and len(body) >= min_bytes
+                    and "gzip" in (self.headers.get("Accept-Encoding") or ""))
+        if compress:
+            body = gzip.compress(body, 6)
+        self.send_response(status)
+        if payload is not None:
+            self.send_header("Content-Type", "application/json")
+        if compress:
+            self.send_header("Content-Encoding", "gzip")
+            self.send_header("Vary", "Accept-Encoding")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length)
+
+    def _inject(self):
+        """Apply configured latency and failure injection; True if a response was sent."""
+        config = self.state.config
+        if config.latency_ms or config.jitter_ms:
+            delay = config.latency_ms + random.uniform(-config.jitter_ms, config.jitter_ms)
+            time.sleep(max(delay, 0) / 1000)
+        roll = random.random()
+        if roll < config.throttle_rate:
+            self._send(429, {"error": "Too many requests"}, {"Retry-After": str(config.retry_after)})
+            return True
+        if roll < config.throttle_rate + config.error_rate:
+            self._send(503, {"error": "Injected failure"})
+            return True
+        return False
+
+    def _authorized(self):
+        auth = self.headers.get("Authorization", "")
+        if auth.startswith("Bearer ") and auth[7:] in self.state.tokens:
+            return True
+        self._send(401, {"error": "Unauthorized"})
+        return False
+
+    def _route(self):
+        url = urlparse(self.path)
+        parts = url.path.strip("/").split("/")
+        if parts and parts[0] == "v1":
+            parts = parts[1:]
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        return parts, query
+
+    def _stream_markets(self, query):
+        """Server-Sent Events: push each watched market whenever it changes, with heartbeats."""
+        ids = [market_id for market_id in query.get("ids", "").split(",") if market_id]
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream; charset=utf-8")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        self.close_connection = True
+        sent = {}
+        last_write = 0.0
+        try:
+            while True:
+                with self.state.lock:
+                    markets = [self.state.markets[i] for i in ids if i in self.state.markets] if ids else [
+                        m for m in self.state.markets.values() if m["status"] == query.get("status", "active")
+                    ]
+                    frames = [f"event: market\ndata: {json.dumps(m)}\n\n" for m in markets
+                              if sent.get(m["id"]) != m["updated_at"]]
+                    sent.update((m["id"], m["updated_at"]) for m in markets)
+                if not frames and time.monotonic() - last_write > STREAM_HEARTBEAT:
+                    frames = [": heartbeat\n\n"]
+                for frame in frames:
+                    body = frame.encode()
+                    self.wfile.write(b"%x\r\n%s\r\n" % (len(body), body))
+                if frames:
+                    self.wfile.flush()
+                    last_write = time.monotonic()
+                time.sleep(STREAM_POLL_INTERVAL)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def do_GET(self):
+        parts, query = self._route()
+        if self._inject() or not self._authorized():
+            return
+        if parts == ["markets", "stream"]:
+            self._stream_markets(query)
+            return
+        state = self.state
+        with state.lock:
+            if parts == ["markets"]:
+                items = [
+                    {k: v for k, v in m.items() if k != "options"}
+                    for m in state.markets.values()
+                    if m["status"] == query.get("status", "active")
+                    and ("category_id" not in query or str(m["category_id"]) == query["category_id"])
+                ]
+                self._send(200, paginate(items, query))
+            elif len(parts) == 2 and parts[0] == "markets":
+                market = state.markets.get(parts[1])
+                if market is None:
+                    self._send(404, {"error": "Market not found"})
+                    return
+                etag = '"%s"' % hashlib.sha1(f"{market['id']}:{market['updated_at']}".encode()).hexdigest()[:16]
+                if self.headers.get("If-None-Match") == etag:
+                    self._send(304, None, {"ETag": etag})
+                else:
+                    self._send(200, {"data": market}, {"ETag": etag})
+            elif parts == ["trade", "quote"]:
+                market = state.markets.get(query.get("prediction_id"))
+                option = next((o for o in (market or {}).get("options", []) if o["id"] == query.get("option_id")), None)
+                if option is None:
+                    self._send(404, {"error": "Market or option not found"})
+                    return
+                self._send(200, state.quote(market, option, float(query.get("amount", 1)), query.get("side", "buy")))
+            elif parts == ["trade", "positions"]:
+                self._send(200, paginate(state.positions, query))
+            elif parts == ["wallet", "balance"]:
+                self._send(200, {"balance": str(round(state.balance, 2)), "currency": "USDC"})
+            elif parts == ["upload", "presigned-url"]:
+                key = f"{uuid.uuid4().hex}.{query.get('file_extension', 'jpg')}"
+                base = f"http://{self.headers.get('Host')}"
+                self._send(200, {"upload_url": f"{base}/upload-target/{key}", "file_url": f"{base}/files/{key}"})
+            else:
+                self._send(404, {"error": "Not found"})
+
+    def do_POST(self):
+        parts, _ = self._route()
+        body = self._body()
+        if parts == ["auth", "agent-login"]:
+            token = uuid.uuid4().hex
+            with self.state.lock:
+                self.state.tokens.add(token)
+            self._send(200, {"token": token, "expires_in": 3600})
+            return
+        if self._inject() or not self._authorized():
+            return
+        payload = json.loads(body or b"{}")
+        state = self.state
+        with state.lock:
+            if parts in (["trade", "buy"], ["trade", "sell"]):
+                key = self.headers.get("Idempotency-Key")
+                if key and key in state.trades:
+                    self._send(200, state.trades[key])
+                    return
+                market = state.markets.get(payload.get("prediction_id"))
+                option = next((o for o in (market or {}).get("options", []) if o["id"] == payload.get("option_id")), None)
+                if option is None:
+                    self._send(404, {"error": "Market or option not found"})
+                    return
+                side = parts[1]
+                amount = float(payload.get("amount") if side == "buy" else payload.get("shares"))
+                result = dict(state.execute(market, option, amount, side), trade_id=uuid.uuid4().hex)
+                if key:
+                    state.trades[key] = result
+                self._send(200, result)
+            elif parts == ["markets"]:
+                market = state.add_market(
+                    payload["title"], payload["options"], payload["end_time"],
+                    description=payload.get("description"), probabilities=payload.get("initial_probabilities"),
+                )
+                market["image_urls"] = payload.get("image_urls") or []
+                self._send(201, {"data": market})
+            else:
+                self._send(404, {"error": "Not found"})
+
+    def do_PUT(self):
+        parts, _ = self._route()
+        body = self._body()
+        if len(parts) == 2 and parts[0] == "upload-target":
+            with self.state.lock:
+                self.state.uploads[parts[1]] = len(body)
+            self._send(200, None)
+        else:
+            self._send(404, {"error": "Not found"})
+
+
+def start_mock_server(config=None, host="127.0.0.1", port=0):
+    """Start the mock API in a background thread; returns (server, base_url)."""
+    handler = type("BoundMockHandler", (MockHandler,), {"state": MockState(config or MockConfig())})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="seesaw-mock", daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}/v1"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local mock SeeSaw API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--markets", type=int, default=500)
+    parser.add_argument("--options", type=int, default=2, help="Options per market")
+    parser.add_argument("--positions", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--handshake-ms", type=float, default=0.0, help="Delay added to every new connection")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 503")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument("--pad-bytes", type=int, default=0, help="Extra description bytes per market")
+    parser.add_argument("--gzip-min-bytes", type=int, help="Gzip responses of at least this size if the client accepts it")
+    args = parser.parse_args()
+
+    config = MockConfig(
+        markets=args.markets, options=args.options, positions=args.positions, latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms, handshake_ms=args.handshake_ms, error_rate=args.error_rate, throttle_rate=args.throttle_rate, pad_bytes=args.pad_bytes,
+        gzip_min_bytes=args.gzip_min_bytes,
+    )
+    server, base_url = start_mock_server(config, args.host, args.port)
+    print(f"Mock SeeSaw API listening on {base_url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+"""
+Compact typed models for API payloads.
+
+The client returns decoded JSON by default. Pass `raw=False` to `get_market`,
+`list_markets`, `iter_markets`, `get_positions`, `iter_positions`, `get_quote`
+or `get_balance` to get these models instead. Each model keeps its known fields
+in `__slots__`. Numeric strings are parsed to floats, and repeated strings such
+as status and end time are interned. Any other keys are kept in `extra`, so
+`to_dict()` gives every field back (numbers as floats, null fields left out).
+
+A market's options are packed into columns (ids, names, a float array of
+prices) and only become `Option` objects when `Market.options` is read. That
+keeps a list of thousands of markets far smaller than the equivalent dicts.
+"""
+
+from array import array
+from sys import intern
+
+# Payload keys that may hold an option's current price, in order of preference.
+PRICE_KEYS = ("price", "probability", "current_price")
+
+
+def number(value):
+    """`value` as a float, or None if it is missing or not numeric."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def first_number(item, keys):
+    """The first of `keys` in `item` holding a number, as a float, or None."""
+    for key in keys:
+        value = number(item.get(key))
+        if value is not None:
+            return value
+    return None
+
+
+def _interned(value):
+    return intern(value) if isinstance(value, str) else value
+
+
+def unwrap(payload):
+    """The payload inside a {"data": {...}} envelope, or `payload` itself."""
+    if isinstance(payload, dict) and isinstance(payload.get("data"), dict):
+        return payload["data"]
+    return payload
+
+
+class Model:
+    """Base for slot-based models; FIELDS maps payload keys to (attribute, converter)."""
+
+    __slots__ = ("extra",)
+    FIELDS = {}
+    NESTED = ()
+
+    def __init__(self, extra=None, **fields):
+        for attr, _ in self.FIELDS.values():
+            setattr(self, attr, fields.get(attr))
+        self.extra = extra
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build from a payload dict (or {"data": payload})."""
+        data = unwrap(data)
+        model = cls.__new__(cls)
+        fields = cls.FIELDS
+        get = data.get
+        for key, (attr, convert) in fields.items():
+            value = get(key)
+            setattr(model, attr, convert(value) if convert is not None and value is not None else value)
+        model.extra = {k: v for k, v in data.items() if k not in fields and k not in cls.NESTED} or None
+        return model
+
+    def to_dict(self):
+        data = {key: getattr(self, attr) for key, (attr, _) in self.FIELDS.items() if getattr(self, attr) is not None}
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def __eq__(self, other):
+        return type(other) is type(self) and self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        key = next(iter(self.FIELDS.values()))[0]
+        return f"{type(self).__name__}({key}={getattr(self, key)!r})"
+
+
+class Option(Model):
+    __slots__ = ("id", "name", "price", "shares")
+    FIELDS = {"id": ("id", None), "name": ("name", None), "price": ("price", number), "shares": ("shares", number)}
+
+
+def _or_nan(value):
+    value = number(value)
+    return float("nan") if value is None else value
+
+
+def _or_none(value):
+    return None if value != value else value
+
+
+class Market(Model):
+    __slots__ = ("id", "title", "description", "status", "category_id", "end_time", "volume", "liquidity",
+                 "updated_at", "_option_text", "_option_prices", "_option_shares", "_option_extra")
+    FIELDS = {
+        "id": ("id", None),
+        "title": ("title", None),
+        "description": ("description", None),
+        "status": ("status", _interned),
+        "category_id": ("category_id", None),
+        "end_time": ("end_time", _interned),
+        "volume": ("volume", number),
+        "liquidity": ("liquidity", number),
+        "updated_at": ("updated_at", None),
+    }
+
+    NESTED = ("options",)
+
+    def __init__(self, options=None, **fields):
+        super().__init__(**fields)
+        self._pack_options(options)
+
+    @classmethod
+    def from_dict(cls, data):
+        data = unwrap(data)
+        market = super().from_dict(data)
+        market._pack_options(data.get("options"))
+        return market
+
+    def _pack_options(self, options):
+        # One tuple of ids then names, float arrays for price and shares (NaN when missing).
+        self._option_text = self._option_prices = self._option_shares = self._option_extra = None
+        if options is None:
+            return
+        options = [o for o in options if isinstance(o, dict)]
+        self._option_text = tuple(o.get("id") for o in options) + tuple(_interned(o.get("name")) for o in options)
+        self._option_prices = array("d", (_or_nan(o.get("price")) for o in options))
+        if any(o.get("shares") is not None for o in options):
+            self._option_shares = array("d", (_or_nan(o.get("shares")) for o in options))
+        extra = tuple({k: v for k, v in o.items() if k not in Option.FIELDS} or None for o in options)
+        if any(extra):
+            self._option_extra = extra
+
+    def _option(self, i):
+        n = len(self._option_prices)
+        option = Option.__new__(Option)
+        option.id = self._option_text[i]
+        option.name = self._option_text[n + i]
+        option.price = _or_none(self._option_prices[i])
+        option.shares = _or_none(self._option_shares[i]) if self._option_shares is not None else None
+        option.extra = self._option_extra[i] if self._option_extra is not None else None
+        return option
+
+    @property
+    def options(self):
+        """The market's options, decoded from their columns on each access."""
+        return [self._option(i) for i in range(len(self._option_prices))] if self._option_text is not None else []
+
+    def option(self, option_id):
+        """The option with `option_id`, or None."""
+        if self._option_text is not None:
+            option_id = str(option_id)
+            for i in range(len(self._option_prices)):
+                if str(self._option_text[i]) == option_id:
+                    return self._option(i)
+        return None
+
+    @property
+    def prices(self):
+        """Option prices in option order as a float array (NaN where missing), without building Options."""
+        return self._option_prices if self._option_prices is not None else array("d")
+
+    def to_dict(self):
+        data = super().to_dict()
+        if self._option_text is not None:
+            data["options"] = [option.to_dict() for option in self.options]
+        return data
+
+
+class Position(Model):
+    __slots__ = ("market_id", "option_id", "shares", "cost", "avg_price")
+    FIELDS = {
+        "prediction_id": ("market_id", None),
+        "option_id": ("option_id", None),
+        "shares": ("shares", number),
+        "cost": ("cost", number),
+        "avg_price": ("avg_price", number),
+    }
+
+
+class Quote(Model):
+    __slots__ = ("market_id", "option_id", "side", "amount", "shares", "cost", "avg_price", "price_before",
+                 "price_after", "price_impact")
+    FIELDS = {
+        "prediction_id": ("market_id", None),
+        "option_id": ("option_id", None),
+        "side": ("side", _interned),
+        "amount": ("amount", number),
+        "shares": ("shares", number),
+        "cost": ("cost", number),
+        "avg_price": ("avg_price", number),
+        "price_before": ("price_before", number),
+        "price_after": ("price_after", number),
+        "price_impact": ("price_impact", number),
+    }
+
+
+class Balance(Model):
+    __slots__ = ("balance", "currency")
+    FIELDS = {"balance": ("balance", number), "currency": ("currency", _interned)}
+
+
+class Page:
+    """One page of a list endpoint: decoded `items` plus the payload's pagination block."""
+
+    __slots__ = ("items", "pagination")
+
+    def __init__(self, items, pagination=None):
+        self.items = items
+        self.pagination = pagination
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    def to_dict(self):
+        data = {"data": [item.to_dict() for item in self.items]}
+        if self.pagination is not None:
+            data["pagination"] = self.pagination
+        return data
@@ -0,0 +1,177 @@
+"""
+Portfolio valuation over all positions.
+
+Positions and the current prices of their options are packed into parallel
+float arrays (`array.array`, or numpy when it is installed) so mark-to-market
+value, cost and unrealized PnL are computed in one pass per column instead of
+per-position dict handling. Market snapshots
+come from the local mirror and only stale markets are refetched.
+"""
+
+import operator
+import time
+from array import array
+from collections import Counter
+
+from models import PRICE_KEYS, first_number, number
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+MARKET_ID_KEYS = ("prediction_id", "market_id")
+COST_KEYS = ("cost", "cost_basis", "total_cost")
+
+
+def position_market_id(position):
+    for key in MARKET_ID_KEYS:
+        if position.get(key) is not None:
+            return str(position[key])
+    return None
+
+
+def position_cost(position, shares):
+    cost = first_number(position, COST_KEYS)
+    if cost is None:
+        avg_price = number(position.get("avg_price"))
+        cost = avg_price * shares if avg_price is not None else 0.0
+    return cost
+
+
+class PortfolioArrays:
+    """Column-oriented position data: one float array per field, one row per position."""
+
+    def __init__(self):
+        self.shares = array("d")
+        self.cost = array("d")
+        self.price = array("d")
+        self.category = array("l")
+        self.categories = []
+        self.rows = []
+
+    def __len__(self):
+        return len(self.rows)
+
+    @classmethod
+    def build(cls, positions, markets):
+        """Pack positions with their option prices; returns (arrays, unpriced positions)."""
+        columns = cls()
+        category_index = {}
+        unpriced = []
+        option_prices = {}
+        for market_id, market in markets.items():
+            for option in market.get("options") or ():
+                if isinstance(option, dict):
+                    option_prices[(market_id, str(option.get("id")))] = first_number(option, PRICE_KEYS)
+
+        for position in positions:
+            market_id = position_market_id(position)
+            shares = number(position.get("shares"))
+            price = option_prices.get((market_id, str(position.get("option_id"))))
+            if shares is None or price is None:
+                unpriced.append(position)
+                continue
+            category = markets[market_id].get("category_id", markets[market_id].get("category"))
+            category = "uncategorized" if category is None else str(category)
+            if category not in category_index:
+                category_index[category] = len(columns.categories)
+                columns.categories.append(category)
+            columns.shares.append(shares)
+            columns.cost.append(position_cost(position, shares))
+            columns.price.append(price)
+            columns.category.append(category_index[category])
+            columns.rows.append((market_id, str(position.get("option_id"))))
+        return columns, unpriced
+
+
+# Without numpy, each column is one map() of an operator function over the arrays (no
+# per-element Python code); only the per-category grouping is a plain Python loop.
+def _mul(a, b):
+    return array("d", map(operator.mul, a, b))
+
+
+def _sub(a, b):
+    return array("d", map(operator.sub, a, b))
+
+
+def _group_sum(values, groups, n):
+    totals = [0.0] * n
+    for value, group in zip(values, groups):
+        totals[group] += value
+    return totals
+
+
+def valuation_columns(columns):
+    """Per-position (value, cost, pnl) columns and per-category sums."""
+    n = len(columns.categories)
+    if np is not None and len(columns):
+        shares = np.frombuffer(columns.shares, dtype=np.float64)
+        price = np.frombuffer(columns.price, dtype=np.float64)
+        cost = np.frombuffer(columns.cost, dtype=np.float64)
+        groups = np.frombuffer(columns.category, dtype=np.dtype("l"))
+        value = shares * price
+        pnl = value - cost
+        sums = {name: np.bincount(groups, weights=col, minlength=n).tolist()
+                for name, col in (("value", value), ("cost", cost), ("pnl", pnl))}
+        sums["positions"] = np.bincount(groups, minlength=n).tolist()
+        return value.tolist(), cost.tolist(), pnl.tolist(), sums
+
+    value = _mul(columns.shares, columns.price)
+    pnl = _sub(value, columns.cost)
+    sums = {name: _group_sum(col, columns.category, n) for name, col in (("value", value), ("cost", columns.cost),
+                                                                         ("pnl", pnl))}
+    counts = Counter(columns.category)
+    sums["positions"] = [counts[i] for i in range(n)]
+    return value, columns.cost, pnl, sums
+
+
+def value_portfolio(positions, markets, details=False):
+    """
+    Value `positions` against `markets` (market id -> market with option prices).
+
+    Mark-to-market value is shares x current price.
+    """
+    columns, unpriced = PortfolioArrays.build(positions, markets)
+    value, cost, pnl, sums = valuation_columns(columns)
+    total_value = sum(value)
+    summary = {
+        "positions": len(positions),
+        "priced": len(columns),
+        "unpriced": len(unpriced),
+        "value": round(total_value, 6),
+        "cost": round(sum(cost), 6),
+        "unrealized_pnl": round(sum(pnl), 6),
+        "by_category": {
+            category: {
+                "positions": sums["positions"][i],
+                "value": round(sums["value"][i], 6),
+                "cost": round(sums["cost"][i], 6),
+                "unrealized_pnl": round(sums["pnl"][i], 6),
+                "exposure": round(sums["value"][i] / total_value, 6) if total_value else None,
+            }
+            for i, category in enumerate(columns.categories)
+        },
+    }
+    if details:
+        summary["details"] = [
+            {"market_id": market_id, "option_id": option_id, "shares": columns.shares[i],
+             "price": columns.price[i], "value": round(value[i], 6), "cost": round(cost[i], 6),
+             "unrealized_pnl": round(pnl[i], 6), "category": columns.categories[columns.category[i]]}
+            for i, (market_id, option_id) in enumerate(columns.rows)
+        ]
+        summary["unpriced_positions"] = unpriced
+    return summary
+
+
+def portfolio(client, mirror, max_age=60.0, workers=8, details=False):
+    """Fetch every position, refresh stale market snapshots in `mirror` and value the lot."""
+    start = time.perf_counter()
+    positions = list(client.iter_positions())
+    market_ids = [m for m in map(position_market_id, positions) if m is not None]
+    markets, fetched = mirror.get_markets(client, market_ids, max_age, workers)
+    summary = value_portfolio(positions, markets, details)
+    summary["markets"] = len(set(market_ids))
+    summary["markets_fetched"] = fetched
+    summary["elapsed_s"] = round(time.perf_counter() - start, 3)
+    return summary
@@ -0,0 +1,205 @@
+"""
+Local LMSR price-impact model for estimating quotes without round trips.
+
+Under an LMSR market maker with liquidity `b`, an option priced `p` gives
+
+    buy:  shares(A)   = b * ln((exp(A / b) - 1 + p) / p)      for spend A
+    sell: proceeds(S) = -b * ln(1 - p + p * exp(-S / b))      for S shares
+
+`QuoteEstimator` takes `p` and `b` from the market's pool state when
+`get_market` exposes them, or fits `b` to a few sampled quotes, and then
+evaluates a whole amount grid at once (numpy when installed, otherwise
+`array.array`). Each estimate carries a relative error bound; `check()`
+compares a real quote against the model and recalibrates when it diverges.
+"""
+
+import math
+import time
+from array import array
+
+from models import PRICE_KEYS, first_number, number
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+MIN_ERROR_BOUND = 0.005
+LIQUIDITY_RANGE = (1e-6, 1e12)
+LIQUIDITY_KEYS = ("liquidity", "liquidity_parameter", "b")
+
+
+def check_inputs(amount, price, liquidity):
+    """Raise ValueError unless the LMSR formulas below are defined for these inputs."""
+    if not 0 < price < 1:
+        raise ValueError(f"Option price must be between 0 and 1, got {price}")
+    if not liquidity > 0 or math.isinf(liquidity):
+        raise ValueError(f"Liquidity must be a positive number, got {liquidity}")
+    if not amount >= 0 or math.isinf(amount):
+        raise ValueError(f"Amount must be a non-negative number, got {amount}")
+
+
+# Both outcomes are written so that exp() only sees -amount / b <= 0 and can
+# underflow but never overflow, however large amount / b gets:
+#   buy:  b * log((e^(a/b) - 1 + p) / p) = a + b * (log1p((p - 1) * e^(-a/b)) - log p)
+#   sell: -b * log(1 - p + p * e^(-a/b))
+def lmsr_outcome(side, amount, price, liquidity):
+    """Shares bought for spend `amount` (buy) or proceeds for `amount` shares (sell)."""
+    check_inputs(amount, price, liquidity)
+    b = liquidity
+    if side == "buy":
+        return amount + b * (math.log1p((price - 1) * math.exp(-amount / b)) - math.log(price))
+    return -b * math.log(1 - price + price * math.exp(-amount / b))
+
+
+def price_after(side, shares, price, liquidity):
+    """Option price once `shares` are bought or sold: the logistic of the shifted log-odds, via tanh."""
+    log_odds = math.log(price / (1 - price)) + (shares if side == "buy" else -shares) / liquidity
+    return 0.5 * (1 + math.tanh(log_odds / 2))
+
+
+def fit_liquidity(side, amount, observed, price):
+    """Solve for the `b` that reproduces one observed quote (both outcomes grow with b)."""
+    lo, hi = (math.log(x) for x in LIQUIDITY_RANGE)
+    for _ in range(100):
+        mid = (lo + hi) / 2
+        predicted = lmsr_outcome(side, amount, price, math.exp(mid))
+        if predicted < observed:
+            lo = mid
+        else:
+            hi = mid
+    return math.exp((lo + hi) / 2)
+
+
+def quote_sample(side, amount, quote):
+    """(side, amount, observed outcome, price_before) from a get_quote response, or None."""
+    quote = quote.get("data", quote) if isinstance(quote, dict) else {}
+    observed = number(quote.get("shares" if side == "buy" else "cost"))
+    price = number(quote.get("price_before"))
+    if observed is None or price is None or not 0 < price < 1:
+        return None
+    return side, float(amount), observed, price
+
+
+def _columns(values):
+    return np.asarray(values, dtype=np.float64) if np is not None else array("d", values)
+
+
+class QuoteEstimator:
+    def __init__(self, market_id, option_id, price, liquidity, error_bound=MIN_ERROR_BOUND, source="market"):
+        self.market_id = market_id
+        self.option_id = option_id
+        self.price = price
+        self.liquidity = liquidity
+        self.error_bound = error_bound
+        self.source = source
+        self.calibrated_at = time.time()
+        self.recalibrations = 0
+
+    @classmethod
+    def from_market(cls, market, option_id):
+        """Build from pool state (liquidity and option price); None if the market lacks them."""
+        market = market.get("data", market)
+        liquidity = first_number(market, LIQUIDITY_KEYS)
+        option = next((o for o in market.get("options") or () if str(o.get("id")) == str(option_id)), None)
+        price = first_number(option, PRICE_KEYS) if option else None
+        if not liquidity or price is None or not 0 < price < 1:
+            return None
+        return cls(str(market.get("id")), str(option_id), price, liquidity)
+
+    @classmethod
+    def from_samples(cls, market_id, option_id, samples):
+        """Fit `b` to sampled quotes; the bound covers the worst in-sample residual."""
+        samples = [s for s in samples if s is not None]
+        if not samples:
+            raise ValueError(f"No usable quotes to calibrate option {option_id}")
+        price = samples[-1][3]
+        fits = sorted(fit_liquidity(side, amount, observed, price) for side, amount, observed, _ in samples)
+        liquidity = fits[len(fits) // 2]
+        estimator = cls(str(market_id), str(option_id), price, liquidity, source="quotes")
+        residual = max(abs(estimator.relative_error(sample)) for sample in samples)
+        estimator.error_bound = max(MIN_ERROR_BOUND, 2 * residual)
+        return estimator
+
+    @classmethod
+    def calibrate(cls, client, market_id, option_id, amounts=(10, 100), side="buy", market=None):
+        """Use pool state from `market` (or get_market) if present, else sample quotes at `amounts`."""
+        estimator = cls.from_market(market or client.get_market(market_id), option_id)
+        if estimator is not None:
+            return estimator
+        samples = [quote_sample(side, amount, client.get_quote(market_id, option_id, amount, side))
+                   for amount in amounts]
+        return cls.from_samples(market_id, option_id, samples)
+
+    def outcome(self, side, amount):
+        return lmsr_outcome(side, amount, self.price, self.liquidity)
+
+    def relative_error(self, sample):
+        side, amount, observed, _ = sample
+        return (self.outcome(side, amount) - observed) / observed if observed else 0.0
+
+    def check(self, side, amount, quote):
+        """Compare a real quote with the model and recalibrate if it is outside the bound.
+
+        Returns the relative error of the estimate made before any recalibration.
+        """
+        sample = quote_sample(side, amount, quote)
+        if sample is None:
+            return None
+        error = self.relative_error(sample)
+        if abs(error) > self.error_bound or sample[3] != self.price:
+            self.price = sample[3]
+            self.liquidity = fit_liquidity(side, sample[1], sample[2], self.price)
+            self.source = "quotes"
+            self.calibrated_at = time.time()
+            self.recalibrations += 1
+        return error
+
+    def estimate(self, amounts, side="buy"):
+        """Estimate quotes for every amount at once; returns a list of quote-shaped rows."""
+        b, p = self.liquidity, self.price
+        a = _columns(amounts)
+        for amount in (min(a), max(a)) if len(a) else ():
+            check_inputs(amount, p, b)
+        # Same overflow-free forms as lmsr_outcome and price_after, over whole columns.
+        if np is not None:
+            if side == "buy":
+                shares = a + b * (np.log1p((p - 1) * np.exp(-a / b)) - math.log(p))
+                cost = a
+            else:
+                shares = a
+                cost = -b * np.log(1 - p + p * np.exp(-a / b))
+            log_odds = math.log(p / (1 - p)) + (shares if side == "buy" else -shares) / b
+            after = (0.5 * (1 + np.tanh(log_odds / 2))).tolist()
+            shares, cost = shares.tolist(), cost.tolist()
+        else:
+            if side == "buy":
+                shares = array("d", (lmsr_outcome("buy", x, p, b) for x in a))
+                cost = a
+            else:
+                shares = a
+                cost = array("d", (lmsr_outcome("sell", x, p, b) for x in a))
+            after = [price_after(side, s, p, b) for s in shares]
+
+        return [
+            {
+                "amount": amount,
+                "shares": round(s, 6),
+                "cost": round(c, 6),
+                "avg_price": round(c / s, 6) if s else None,
+                "price_after": round(pa, 6),
+                "price_impact": round(abs(pa - p), 6),
+            }
+            for amount, s, c, pa in zip(amounts, shares, cost, after)
+        ]
+
+    def to_dict(self):
+        return {
+            "market_id": self.market_id,
+            "option_id": self.option_id,
+            "source": self.source,
+            "price": self.price,
+            "liquidity": round(self.liquidity, 6),
+            "error_bound": round(self.error_bound, 6),
+            "recalibrations": self.recalibrations,
+        }
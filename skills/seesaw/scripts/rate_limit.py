@@ -0,0 +1,168 @@
+"""
+Client-side rate limiting and retry scheduling for SeesawClient.
+
+Client-side limits are opt-in: the API documents no request rates, so a
+RateLimiter is only built from SEESAW_RATE_LIMITS (or passed in explicitly).
+Without one, 429s are handled by RetryPolicy alone, which waits for the
+server's Retry-After or backs off exponentially.
+
+Requests are grouped into endpoint classes (quote, trade, read); each class
+named in the limits gets its own token bucket. A 429 halves the bucket's rate and blocks it for
+`Retry-After`; `X-RateLimit-Remaining`/`X-RateLimit-Reset` drain or block it
+ahead of time; successes slowly restore the configured rate. `RetryPolicy`
+decides which failures are retried and how long to wait (full-jitter
+exponential backoff, or the server's `Retry-After`).
+"""
+
+import math
+import os
+import random
+import threading
+import time
+
+MIN_RATE = 0.5
+RETRY_STATUSES = (429, 502, 503, 504)
+IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS", "PUT", "DELETE")
+
+
+def endpoint_class(endpoint):
+    """Map an endpoint name such as "GET trade/quote" to its limiter class."""
+    method, _, path = endpoint.partition(" ")
+    if path == "trade/quote":
+        return "quote"
+    if method != "GET":
+        return "trade"
+    return "read"
+
+
+def parse_rates(spec):
+    """Parse "quote=20,trade=5:5" (rate[:burst] per class) into {class: (rate, burst)}; unnamed classes are unlimited."""
+    rates = {}
+    for item in filter(None, (part.strip() for part in (spec or "").split(","))):
+        name, _, value = item.partition("=")
+        rate, _, burst = value.partition(":")
+        try:
+            rate = float(rate)
+            burst = int(burst) if burst else max(int(rate), 1)
+        except (ValueError, OverflowError):
+            raise ValueError(f"Invalid rate limit {item!r}: expected class=rate[:burst]") from None
+        if not name.strip() or not 0 < rate < math.inf or burst < 1:
+            raise ValueError(f"Invalid rate limit {item!r}: need a class name, a rate > 0 and a burst >= 1")
+        rates[name.strip()] = (rate, burst)
+    return rates
+
+
+def header_seconds(value, now=None):
+    """Seconds to wait from a Retry-After/X-RateLimit-Reset value (delta or epoch seconds)."""
+    try:
+        seconds = float(value)
+    except (TypeError, ValueError):
+        return None
+    if seconds > 1e9:
+        seconds -= time.time() if now is None else now
+    return max(seconds, 0.0)
+
+
+class TokenBucket:
+    def __init__(self, rate, burst=None):
+        self.max_rate = rate
+        self.rate = rate
+        self.capacity = burst or max(int(rate), 1)
+        self.tokens = float(self.capacity)
+        self.blocked_until = 0.0
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self):
+        """Block until a token is available; returns the seconds spent waiting."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self.blocked_until:
+                    delay = self.blocked_until - now
+                elif self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                else:
+                    delay = (1 - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def throttled(self, retry_after=None):
+        with self._lock:
+            self.rate = max(self.rate / 2, MIN_RATE)
+            self.tokens = 0.0
+            if retry_after:
+                self.blocked_until = max(self.blocked_until, time.monotonic() + retry_after)
+
+    def succeeded(self):
+        with self._lock:
+            if self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+
+    def budget(self, remaining, reset_after):
+        """Apply server-reported quota: never spend more than `remaining` before the reset."""
+        with self._lock:
+            self.tokens = min(self.tokens, remaining)
+            if remaining <= 0 and reset_after:
+                self.blocked_until = max(self.blocked_until, time.monotonic() + reset_after)
+
+
+def limiter_from_env():
+    """A RateLimiter for SEESAW_RATE_LIMITS, or None when it is unset."""
+    spec = os.getenv("SEESAW_RATE_LIMITS")
+    return RateLimiter(parse_rates(spec)) if spec else None
+
+
+class RateLimiter:
+    def __init__(self, rates=None):
+        rates = parse_rates(os.getenv("SEESAW_RATE_LIMITS")) if rates is None else rates
+        self.buckets = {name: TokenBucket(rate, burst) for name, (rate, burst) in rates.items()}
+
+    def bucket(self, endpoint):
+        return self.buckets.get(endpoint_class(endpoint))
+
+    def acquire(self, endpoint):
+        bucket = self.bucket(endpoint)
+        return bucket.acquire() if bucket is not None else 0.0
+
+    def feedback(self, endpoint, status_code, headers):
+        bucket = self.bucket(endpoint)
+        if bucket is None:
+            return
+        if status_code == 429:
+            bucket.throttled(header_seconds(headers.get("Retry-After")))
+            return
+        remaining = headers.get("X-RateLimit-Remaining")
+        if remaining is not None:
+            try:
+                bucket.budget(float(remaining), header_seconds(headers.get("X-RateLimit-Reset")))
+            except ValueError:
+                pass
+        if status_code < 400:
+            bucket.succeeded()
+
+
+class RetryPolicy:
+    def __init__(self, max_retries=3, base_delay=0.25, max_delay=8.0, max_retry_after=60.0,
+                 statuses=RETRY_STATUSES):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_retry_after = max_retry_after
+        self.statuses = statuses
+
+    def retryable(self, method, headers):
+        # Trades are only replayed when the server can deduplicate them.
+        return method in IDEMPOTENT_METHODS or "Idempotency-Key" in headers
+
+    def delay(self, attempt, retry_after=None):
+        if retry_after is not None:
+            return min(retry_after, self.max_retry_after)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
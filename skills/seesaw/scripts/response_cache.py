@@ -0,0 +1,193 @@
+"""
+Response cache for read-only SeeSaw endpoints.
+
+`ResponseCache` decides what is cacheable and for how long (per-endpoint TTL)
+and stores entries in a pluggable backend:
+
+- `MemoryCache`: in-process LRU, bounded by entry count and bytes
+- `DiskCache`: SQLite file shared by every CLI invocation, same bounds
+
+Stale entries keep their `ETag`/`Last-Modified` validators so the client can
+revalidate them with a conditional request instead of refetching the body.
+Keys are prefixed with a scope derived from the API base URL and key
+(`cache_scope`), so environments and accounts never read each other's entries.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlencode
+
+CACHE_DIR = os.getenv("SEESAW_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "seesaw"))
+
+# Seconds an entry is served without contacting the API, keyed by endpoint name.
+DEFAULT_TTLS = {
+    "markets": 5.0,
+    "markets/{id}": 10.0,
+}
+
+
+def cache_scope(base_url, api_key):
+    """Key prefix for one API base URL and account."""
+    digest = hashlib.sha256(f"{base_url}\0{api_key or ''}".encode()).hexdigest()[:16]
+    return f"{digest}/"
+
+
+class CacheEntry:
+    __slots__ = ("body", "etag", "last_modified", "stored_at")
+
+    def __init__(self, body, etag=None, last_modified=None, stored_at=None):
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.stored_at = time.time() if stored_at is None else stored_at
+
+    @property
+    def size(self):
+        return len(self.body)
+
+
+class MemoryCache:
+    def __init__(self, max_entries=1024, max_bytes=32 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, entry):
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old.size
+            self._entries[key] = entry
+            self._bytes += entry.size
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.size
+
+    def delete(self, key):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._bytes -= entry.size
+
+    def delete_prefix(self, prefix):
+        with self._lock:
+            for key in [k for k in self._entries if k.startswith(prefix)]:
+                self._bytes -= self._entries.pop(key).size
+
+    def close(self):
+        pass
+
+
+class DiskCache:
+    def __init__(self, path=None, max_entries=4096, max_bytes=64 * 1024 * 1024):
+        self.path = path or os.path.join(CACHE_DIR, "responses.sqlite3")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._lock = threading.Lock()
+        import sqlite3
+
+        self._db = sqlite3.connect(self.path, timeout=5, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY, body TEXT NOT NULL, etag TEXT, last_modified TEXT,"
+            " stored_at REAL NOT NULL, accessed_at REAL NOT NULL, size INTEGER NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries(accessed_at)")
+
+    def get(self, key):
+        with self._lock:
+            row = self._db.execute(
+                "SELECT body, etag, last_modified, stored_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._db.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        return CacheEntry(*row)
+
+    def set(self, key, entry):
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, entry.body, entry.etag, entry.last_modified, entry.stored_at, time.time(), entry.size),
+            )
+            self._evict()
+
+    def _evict(self):
+        count, total = self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+        victims = []
+        for key, size in self._db.execute("SELECT key, size FROM entries ORDER BY accessed_at"):
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            victims.append((key,))
+            count -= 1
+            total -= size
+        self._db.executemany("DELETE FROM entries WHERE key = ?", victims)
+
+    def delete(self, key):
+        with self._lock:
+            self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def delete_prefix(self, prefix):
+        with self._lock:
+            self._db.execute("DELETE FROM entries WHERE substr(key, 1, ?) = ?", (len(prefix), prefix))
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class ResponseCache:
+    def __init__(self, backend=None, ttls=None):
+        self.backend = backend if backend is not None else MemoryCache()
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+
+    def ttl_for(self, endpoint):
+        return self.ttls.get(endpoint)
+
+    @staticmethod
+    def key(path, params=None, scope=""):
+        path = scope + path.strip("/")
+        if not params:
+            return path
+        return f"{path}?{urlencode(sorted(params.items()))}"
+
+    def lookup(self, key, ttl):
+        """Return (entry, fresh); a stale entry is kept for revalidation."""
+        entry = self.backend.get(key)
+        if entry is None:
+            return None, False
+        return entry, time.time() - entry.stored_at < ttl
+
+    def store(self, key, body, etag=None, last_modified=None):
+        entry = CacheEntry(body, etag, last_modified)
+        self.backend.set(key, entry)
+        return entry
+
+    def revalidated(self, key, entry):
+        self.backend.set(key, CacheEntry(entry.body, entry.etag, entry.last_modified))
+
+    def invalidate_market(self, market_id=None, scope=""):
+        # A trade or new market changes list pages as well as the market itself.
+        if market_id is not None:
+            self.backend.delete(f"{scope}markets/{market_id}")
+        self.backend.delete(f"{scope}markets")
+        self.backend.delete_prefix(f"{scope}markets?")
+
+    def close(self):
+        self.backend.close()
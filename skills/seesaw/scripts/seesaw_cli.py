@@ -0,0 +1,1163 @@
+import os
+import json
+import threading
+import time
+from collections import deque
+import argparse
+import sys
+
+from client_stats import ClientStats, PeriodicExporter, body_size, serve_prometheus
+from rate_limit import RetryPolicy, TokenBucket, header_seconds, limiter_from_env
+from response_cache import DiskCache, MemoryCache, ResponseCache, cache_scope
+from token_manager import TokenManager, token_expiry
+
+DEFAULT_BASE_URL = "http://localhost:3000/v1"
+POOL_CONNECTIONS = int(os.getenv("SEESAW_POOL_CONNECTIONS", "4"))
+POOL_MAXSIZE = int(os.getenv("SEESAW_POOL_MAXSIZE", "16"))
+PAGE_ITEM_KEYS = ("data", "items", "markets", "positions", "results")
+PAGE_COUNT_KEYS = ("total_pages", "totalPages", "pages")
+PAGE_TOTAL_KEYS = ("total", "total_count", "totalCount")
+STREAM_CHUNK_SIZE = 64 * 1024
+OUTPUT_FORMATS = ("pretty", "compact", "ndjson")
+
+def endpoint_name(path):
+    parts = path.strip("/").split("/")
+    if len(parts) == 2 and parts[0] == "markets":
+        return "markets/{id}"
+    return "/".join(parts)
+
+def error_class(exc):
+    response = getattr(exc, "response", None)
+    if response is not None:
+        return f"HTTP {response.status_code}"
+    return type(exc).__name__
+
+def idempotency_headers(key):
+    # Lets the server deduplicate a replayed trade, which makes it safe to retry.
+    return {"Idempotency-Key": key} if key else None
+
+def page_items(page):
+    if isinstance(page, list):
+        return page
+    if isinstance(page, dict):
+        for key in PAGE_ITEM_KEYS:
+            if isinstance(page.get(key), list):
+                return page[key]
+    return []
+
+def model_class(name):
+    import models
+    return getattr(models, name)
+
+def decode(payload, model):
+    """`payload` as an instance of the named class from models.py (the raw=False results)."""
+    return model_class(model).from_dict(payload)
+
+def decode_page(payload, model):
+    from models import Page
+    cls = model_class(model)
+    pagination = payload.get("pagination") if isinstance(payload, dict) else None
+    return Page([cls.from_dict(item) for item in page_items(payload)], pagination)
+
+def accept_encoding():
+    # requests decodes br only through urllib3 when a brotli package is installed.
+    for module in ("brotli", "brotlicffi"):
+        try:
+            __import__(module)
+            return "gzip, deflate, br"
+        except ImportError:
+            pass
+    return "gzip, deflate"
+
+def wire_size(resp):
+    """Body bytes as received, i.e. compressed when the server compressed them."""
+    if resp is None:
+        return 0
+    try:
+        return resp.raw.tell()
+    except (AttributeError, TypeError):
+        return len(resp.content)
+
+def total_pages(page, limit):
+    if not isinstance(page, dict):
+        return None
+    for meta in (page, page.get("pagination"), page.get("meta")):
+        if not isinstance(meta, dict):
+            continue
+        for key in PAGE_COUNT_KEYS:
+            if isinstance(meta.get(key), int):
+                return meta[key]
+        for key in PAGE_TOTAL_KEYS:
+            if isinstance(meta.get(key), int):
+                return -(-meta[key] // limit)
+    return None
+
+class SeesawAPIError(RuntimeError):
+    def __init__(self, message, status_code=None, headers=None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.headers = dict(headers or {})
+
+    @property
+    def retry_after(self):
+        return header_seconds(self.headers.get("Retry-After"))
+
+class SeesawConnectionError(RuntimeError):
+    """The connection dropped or timed out after the request may have reached the server."""
+
+class TradeGuardError(RuntimeError):
+    """A guarded trade was not submitted because its quote violated a guard."""
+
+    def __init__(self, violations, quote, timing=None):
+        super().__init__("Trade aborted: " + "; ".join(violations))
+        self.violations = violations
+        self.quote = quote
+        self.timing = timing
+
+def quote_violations(quote, max_price=None, min_price=None, min_shares=None, max_slippage=None):
+    """Check a quote against trade guards; returns a list of violation messages.
+
+    Prices are the quote's average price per share; slippage is how far that
+    average moves from the pre-trade price, as a fraction of it. A guard whose
+    quote field is missing or unparseable counts as violated.
+    """
+    from models import number
+
+    quote = quote.get("data", quote) if isinstance(quote, dict) else {}
+    violations = []
+    avg_price, price_before, shares = (number(quote.get(key)) for key in ("avg_price", "price_before", "shares"))
+    if max_price is not None and (avg_price is None or avg_price > max_price):
+        violations.append(f"avg_price {avg_price} above max price {max_price}")
+    if min_price is not None and (avg_price is None or avg_price < min_price):
+        violations.append(f"avg_price {avg_price} below min price {min_price}")
+    if min_shares is not None and (shares is None or shares < min_shares):
+        violations.append(f"shares {shares} below min shares {min_shares}")
+    if max_slippage is not None:
+        slippage = None
+        if avg_price is not None and price_before:
+            slippage = round(abs(avg_price - price_before) / price_before, 6)
+        if slippage is None or slippage > max_slippage:
+            violations.append(f"slippage {slippage} above max slippage {max_slippage}")
+    return violations
+
+class SeesawClient:
+    def __init__(self, base_url=None, api_key=None, api_secret=None,
+                 pool_connections=None, pool_maxsize=None, pool_block=False, cache=None, stats=None,
+                 rate_limiter=None, retry=None):
+        self.base_url = base_url or os.getenv("SEESAW_BASE_URL", DEFAULT_BASE_URL)
+        self.api_key = api_key or os.getenv("SEESAW_API_KEY")
+        self.api_secret = api_secret or os.getenv("SEESAW_API_SECRET")
+        self.tokens = TokenManager(self.base_url, self.api_key, self._agent_login)
+        self.cache = cache
+        self.stats = stats
+        # Off unless configured: 429s are otherwise handled by the retry policy's backoff.
+        self.limiter = rate_limiter if rate_limiter is not None else limiter_from_env()
+        self.retry = retry if retry is not None else RetryPolicy()
+        # One keep-alive pool per host (API and upload storage), at most
+        # pool_maxsize sockets each; pool_block caps concurrent connections.
+        self._pool_args = (pool_connections or POOL_CONNECTIONS, pool_maxsize or POOL_MAXSIZE, pool_block)
+        self._session = None
+        self._session_lock = threading.Lock()
+
+    @property
+    def session(self):
+        # Built on first use, so commands that never reach the network don't import requests.
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    self._session = self._build_session(*self._pool_args)
+        return self._session
+
+    @session.setter
+    def session(self, session):
+        self._session = session
+
+    @property
+    def cache_scope(self):
+        # Cached responses are only reused for the same API base URL and account.
+        return cache_scope(self.base_url, self.api_key)
+
+    @staticmethod
+    def _build_session(pool_connections, pool_maxsize, pool_block):
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        session = requests.Session()
+        session.headers["Accept-Encoding"] = accept_encoding()
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def close(self):
+        if self._session is not None:
+            self._session.close()
+        if self.cache is not None:
+            self.cache.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    @property
+    def token(self):
+        return self.tokens.token
+
+    @token.setter
+    def token(self, token):
+        self.tokens.set(token)
+
+    def login(self):
+        return self.tokens.refresh(force=True)
+
+    def _agent_login(self):
+        import requests
+
+        if not self.api_key or not self.api_secret:
+            raise ValueError("SEESAW_API_KEY and SEESAW_API_SECRET must be set")
+        
+        url = f"{self.base_url}/auth/agent-login"
+        payload = {"api_key": self.api_key, "api_secret": self.api_secret}
+        start = time.perf_counter()
+        resp = error = None
+        try:
+            resp = self.session.post(url, json=payload, timeout=10)
+            resp.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            error = error_class(e)
+            raise RuntimeError(f"Login failed: {e}")
+        finally:
+            self._record("POST auth/agent-login", start, resp, error)
+        
+        data = resp.json()
+        token = data.get("token")
+        return token, token_expiry(data, token)
+
+    def _record(self, endpoint, start, resp, error=None, relogins=0, retries=0, bytes_out=None):
+        if self.stats is None:
+            return
+        if bytes_out is None:
+            bytes_out = body_size(resp.request.body) if resp is not None else 0
+        self.stats.record(endpoint, time.perf_counter() - start, bytes_out, wire_size(resp), error, retries, relogins)
+
+    def _request(self, method, path, max_age=None, stream=False, **kwargs):
+        """
+        Send an API request and return the decoded JSON body.
+
+        With `stream=True` the body is not buffered: a json_codec.ItemStream
+        is returned that yields the response's list items as they arrive
+        (streamed requests bypass the response cache).
+        """
+        import requests
+        import json_codec
+
+        endpoint = f"{method} {endpoint_name(path)}"
+        cache_key = entry = None
+        ttl = self.cache.ttl_for(endpoint_name(path)) if method == "GET" and self.cache is not None else None
+        if stream:
+            ttl = None
+        if ttl is not None and max_age is not None:
+            # A caller that needs fresher data still gets a conditional request.
+            ttl = min(ttl, max_age)
+        if ttl is not None:
+            cache_key = self.cache.key(path, kwargs.get("params"), self.cache_scope)
+            entry, fresh = self.cache.lookup(cache_key, ttl)
+            if fresh:
+                if self.stats is not None:
+                    self.stats.cache_hit(endpoint)
+                return json_codec.loads(entry.body)
+
+        token = self.tokens.get()
+        
+        headers = dict(kwargs.get("headers") or {})
+        headers["Authorization"] = f"Bearer {token}"
+        if entry is not None:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+        kwargs["headers"] = headers
+        if "timeout" not in kwargs:
+            kwargs["timeout"] = 15
+        
+        url = f"{self.base_url}/{path.lstrip('/')}"
+        retryable = self.retry is not None and self.retry.retryable(method, headers)
+        start = time.perf_counter()
+        resp = error = None
+        relogins = retries = 0
+        streaming = False
+        try:
+            while True:
+                if self.limiter is not None:
+                    self.limiter.acquire(endpoint)
+                try:
+                    resp = self.session.request(method, url, stream=stream, **kwargs)
+                except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                    if not retryable or retries >= self.retry.max_retries:
+                        raise
+                    time.sleep(self.retry.delay(retries))
+                    retries += 1
+                    continue
+                if self.limiter is not None:
+                    self.limiter.feedback(endpoint, resp.status_code, resp.headers)
+
+                if resp.status_code == 401 and not relogins:
+                    resp.close()
+                    relogins = 1
+                    token = self.tokens.refresh(token)
+                    headers["Authorization"] = f"Bearer {token}"
+                    continue
+                if retryable and resp.status_code in self.retry.statuses and retries < self.retry.max_retries:
+                    resp.close()
+                    time.sleep(self.retry.delay(retries, header_seconds(resp.headers.get("Retry-After"))))
+                    retries += 1
+                    continue
+                break
+                
+            resp.raise_for_status()
+            if stream:
+                streaming = True
+                done = lambda: (resp.close(), self._record(endpoint, start, resp, None, relogins, retries))
+                failed = lambda e: RuntimeError(f"Request to {path} failed: {e}")
+                return json_codec.ItemStream(resp.iter_content(STREAM_CHUNK_SIZE), on_close=done, on_error=failed)
+            if cache_key is not None:
+                if resp.status_code == 304 and entry is not None:
+                    self.cache.revalidated(cache_key, entry)
+                    return json_codec.loads(entry.body)
+                self.cache.store(cache_key, resp.text, resp.headers.get("ETag"), resp.headers.get("Last-Modified"))
+            return json_codec.loads(resp.content)
+        except requests.exceptions.HTTPError as e:
+            error = error_class(e)
+            raise SeesawAPIError(f"Request to {path} failed: {e}", e.response.status_code, e.response.headers)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            error = error_class(e)
+            # A connect timeout never reached the server; anything later might have.
+            if isinstance(e, requests.exceptions.ConnectTimeout):
+                raise RuntimeError(f"Request to {path} failed: {e}")
+            raise SeesawConnectionError(f"Request to {path} failed: {e}")
+        except requests.exceptions.RequestException as e:
+            error = error_class(e)
+            raise RuntimeError(f"Request to {path} failed: {e}")
+        except ValueError as e:
+            # A body that is not JSON; the json, orjson and ujson decode errors are all ValueErrors.
+            error = error_class(e)
+            raise RuntimeError(f"Request to {path} failed: {e}") from e
+        finally:
+            if not streaming:
+                self._record(endpoint, start, resp, error, relogins, retries)
+                if stream and resp is not None:
+                    resp.close()
+
+    def list_markets(self, page=1, limit=20, status="active", category_id=None, max_age=None, raw=True,
+                     stream=False):
+        params = {"page": page, "limit": limit, "status": status}
+        if category_id:
+            params["category_id"] = category_id
+        result = self._request("GET", "markets", max_age, stream, params=params)
+        return result if raw or stream else decode_page(result, "Market")
+
+    def get_market(self, market_id, max_age=None, raw=True):
+        result = self._request("GET", f"markets/{market_id}", max_age)
+        return result if raw else decode(result, "Market")
+
+    def get_quote(self, market_id, option_id, amount, side="buy", raw=True):
+        params = {
+            "prediction_id": market_id,
+            "option_id": option_id,
+            "amount": amount,
+            "side": side
+        }
+        result = self._request("GET", "trade/quote", params=params)
+        return result if raw else decode(result, "Quote")
+
+    def get_quotes(self, quote_requests, workers=8, max_rate=None):
+        """Quote many (market_id, option_id, amount[, side]) tuples concurrently.
+
+        Returns one row per request in input order; a failed quote yields a row
+        with an "error" field instead of aborting the batch. 429s are retried
+        with backoff, and throttled by the client's rate limiter if one is
+        configured; `max_rate` additionally caps this batch at that many
+        quotes per second.
+        """
+        bucket = TokenBucket(max_rate, 1) if max_rate else None
+
+        def quote_one(request):
+            if isinstance(request, dict):
+                row = {key: request.get(key) for key in ("market_id", "option_id", "amount")}
+                row["side"] = request.get("side") or "buy"
+            else:
+                market_id, option_id, amount, *rest = request
+                row = {"market_id": market_id, "option_id": option_id, "amount": amount,
+                       "side": rest[0] if rest else "buy"}
+            if bucket is not None:
+                bucket.acquire()
+            try:
+                row["quote"] = self.get_quote(row["market_id"], row["option_id"], row["amount"], row["side"])
+            except Exception as e:
+                row["error"] = str(e)
+            return row
+
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+            return list(pool.map(quote_one, quote_requests))
+
+    def buy(self, market_id, option_id, amount, idempotency_key=None):
+        payload = {
+            "prediction_id": market_id,
+            "option_id": option_id,
+            "amount": str(amount)
+        }
+        result = self._request("POST", "trade/buy", json=payload, headers=idempotency_headers(idempotency_key))
+        if self.cache is not None:
+            self.cache.invalidate_market(market_id, self.cache_scope)
+        return result
+
+    def sell(self, market_id, option_id, shares, idempotency_key=None):
+        payload = {
+            "prediction_id": market_id,
+            "option_id": option_id,
+            "shares": str(shares)
+        }
+        result = self._request("POST", "trade/sell", json=payload, headers=idempotency_headers(idempotency_key))
+        if self.cache is not None:
+            self.cache.invalidate_market(market_id, self.cache_scope)
+        return result
+
+    def guarded_trade(self, side, market_id, option_id, amount, max_price=None, min_price=None,
+                      min_shares=None, max_slippage=None, idempotency_key=None):
+        """Quote a trade and submit it only if the quote passes the guards.
+
+        Both requests go out back to back on the same warm session, so the
+        price can move as little as possible in between. `amount` is the spend
+        for a buy and the shares for a sell. Returns {"quote", "trade", "timing"}
+        with timing in milliseconds from the call to execution; raises
+        TradeGuardError (without trading) if any guard is violated.
+        """
+        start = time.perf_counter()
+        quote = self.get_quote(market_id, option_id, amount, side)
+        quoted = time.perf_counter()
+        timing = {"quote_ms": round((quoted - start) * 1000, 3)}
+        violations = quote_violations(quote, max_price, min_price, min_shares, max_slippage)
+        if violations:
+            raise TradeGuardError(violations, quote, timing)
+        trade = (self.buy if side == "buy" else self.sell)(market_id, option_id, amount, idempotency_key)
+        done = time.perf_counter()
+        timing["trade_ms"] = round((done - quoted) * 1000, 3)
+        timing["total_ms"] = round((done - start) * 1000, 3)
+        return {"quote": quote, "trade": trade, "timing": timing}
+
+    def get_positions(self, page=1, limit=20, raw=True, stream=False):
+        params = {"page": page, "limit": limit}
+        result = self._request("GET", "trade/positions", stream=stream, params=params)
+        return result if raw or stream else decode_page(result, "Position")
+
+    def iter_markets(self, status="active", category_id=None, limit=100, prefetch=2, max_age=None, raw=True,
+                     stream=False):
+        fetch = lambda page, stream=False: self.list_markets(page, limit, status, category_id, max_age, stream=stream)
+        items = self._iter_pages(fetch, limit, prefetch, stream)
+        return items if raw else map(model_class("Market").from_dict, items)
+
+    def iter_positions(self, limit=100, prefetch=2, raw=True, stream=False):
+        fetch = lambda page, stream=False: self.get_positions(page, limit, stream=stream)
+        items = self._iter_pages(fetch, limit, prefetch, stream)
+        return items if raw else map(model_class("Position").from_dict, items)
+
+    def _iter_pages(self, fetch, limit, prefetch, stream=False):
+        if stream:
+            # The first page's items are yielded while its body is still arriving.
+            items = fetch(1, stream=True)
+            yield from items
+            first, count = items.meta, items.count
+        else:
+            first = fetch(1)
+            items = page_items(first)
+            count = len(items)
+            yield from items
+        last = total_pages(first, limit)
+        if last is None and count < limit:
+            return  # no page count in the payload: a short page is the last one
+
+        # Keep up to `prefetch` pages in flight, never past the last page. Without
+        # a page count, pages are requested ahead blindly and the first short
+        # (or empty) page ends the walk; the requests already sent past it are
+        # cancelled or discarded.
+        pending = deque()
+        next_page = 2
+        workers = max(prefetch, 1)
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            try:
+                while (last is None or next_page <= last) and len(pending) < workers:
+                    pending.append(pool.submit(fetch, next_page))
+                    next_page += 1
+                while pending:
+                    items = page_items(pending.popleft().result())
+                    if last is None and len(items) < limit:
+                        yield from items
+                        return
+                    if last is None or next_page <= last:
+                        pending.append(pool.submit(fetch, next_page))
+                        next_page += 1
+                    yield from items
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def get_balance(self, raw=True):
+        result = self._request("GET", "wallet/balance")
+        return result if raw else decode(result, "Balance")
+
+    def get_presigned_url(self, content_type="image/jpeg", file_extension="jpg"):
+        params = {"content_type": content_type, "file_extension": file_extension}
+        return self._request("GET", "upload/presigned-url", params=params)
+
+    def upload_file(self, upload_url, file_path, content_type):
+        import requests
+
+        start = time.perf_counter()
+        resp = error = None
+        with open(file_path, 'rb') as f:
+            try:
+                resp = self.session.put(upload_url, data=f, headers={"Content-Type": content_type})
+                resp.raise_for_status()
+            except requests.exceptions.RequestException as e:
+                error = error_class(e)
+                raise
+            finally:
+                self._record("PUT upload", start, resp, error, bytes_out=body_size(f))
+        return True
+
+    def upload_files(self, paths, workers=4, content_type=None, file_extension=None, index=None):
+        """Upload many files concurrently, never sending the same content twice.
+
+        Files are hashed (SHA-256); a hash already in `index` (an UploadIndex) for this base_url
+        reuses its stored file_url, and identical files within the batch are
+        uploaded once. Presigned URL requests and PUTs for the rest run on up
+        to `workers` threads. Content type and extension are guessed per file
+        unless given. Returns one row per path in input order with "sha256",
+        "file_url" and "cached" fields, or an "error" field on failure.
+        """
+        from upload_index import content_type_for, extension_for, hash_file
+
+        rows = [{"path": path} for path in paths]
+
+        def digest(row):
+            try:
+                row["sha256"] = hash_file(row["path"])
+            except OSError as e:
+                row["error"] = str(e)
+
+        def upload_one(row):
+            file_url = index.get(self.base_url, row["sha256"]) if index is not None else None
+            if file_url is None:
+                path = row["path"]
+                row_type = content_type or content_type_for(path)
+                try:
+                    presigned = self.get_presigned_url(row_type, file_extension or extension_for(path))
+                    self.upload_file(presigned["upload_url"], path, row_type)
+                except Exception as e:
+                    row["error"] = str(e)
+                    return
+                file_url = presigned["file_url"]
+                if index is not None:
+                    index.put(self.base_url, row["sha256"], file_url, os.path.getsize(path))
+                row.update(file_url=file_url, cached=False)
+            else:
+                row.update(file_url=file_url, cached=True)
+
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+            list(pool.map(digest, rows))
+            first = {}
+            for row in rows:
+                if "sha256" in row:
+                    first.setdefault(row["sha256"], row)
+            list(pool.map(upload_one, first.values()))
+
+        for row in rows:
+            source = first.get(row.get("sha256"))
+            if source is None or source is row:
+                continue
+            if "error" in source:
+                row["error"] = source["error"]
+            else:
+                row.update(file_url=source["file_url"], cached=True)
+        return rows
+
+    def create_market(self, title, options, end_time, description=None, initial_probabilities=None, image_urls=None):
+        payload = {
+            "title": title,
+            "options": options,
+            "end_time": end_time
+        }
+        if description: payload["description"] = description
+        if initial_probabilities: payload["initial_probabilities"] = initial_probabilities
+        if image_urls: payload["image_urls"] = image_urls
+        result = self._request("POST", "markets", json=payload)
+        if self.cache is not None:
+            self.cache.invalidate_market(scope=self.cache_scope)
+        return result
+
+class AsyncSeesawClient:
+    """Asyncio facade over SeesawClient with a bounded number of in-flight calls.
+
+    This is not native async I/O: each coroutine hands the blocking
+    SeesawClient call to a ThreadPoolExecutor with `concurrency` threads and
+    awaits the result, so at most `concurrency` requests run at once and the
+    rest queue in the executor. The threads share the wrapped client's pooled
+    session, token cache and 401 re-login path.
+    """
+
+    def __init__(self, base_url=None, api_key=None, api_secret=None, concurrency=16, client=None):
+        self.concurrency = concurrency
+        self.client = client or SeesawClient(
+            base_url, api_key, api_secret, pool_maxsize=max(concurrency, POOL_MAXSIZE)
+        )
+        from concurrent.futures import ThreadPoolExecutor
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="seesaw")
+
+    async def _call(self, fn, *args, **kwargs):
+        import asyncio
+        import functools
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(fn, *args, **kwargs))
+
+    async def list_markets(self, page=1, limit=20, status="active", category_id=None, raw=True):
+        return await self._call(self.client.list_markets, page, limit, status, category_id, raw=raw)
+
+    async def get_market(self, market_id, raw=True):
+        return await self._call(self.client.get_market, market_id, raw=raw)
+
+    async def get_quote(self, market_id, option_id, amount, side="buy", raw=True):
+        return await self._call(self.client.get_quote, market_id, option_id, amount, side, raw=raw)
+
+    async def buy(self, market_id, option_id, amount, idempotency_key=None):
+        return await self._call(self.client.buy, market_id, option_id, amount, idempotency_key)
+
+    async def sell(self, market_id, option_id, shares, idempotency_key=None):
+        return await self._call(self.client.sell, market_id, option_id, shares, idempotency_key)
+
+    async def guarded_trade(self, side, market_id, option_id, amount, max_price=None, min_price=None,
+                            min_shares=None, max_slippage=None, idempotency_key=None):
+        return await self._call(
+            self.client.guarded_trade, side, market_id, option_id, amount, max_price, min_price, min_shares,
+            max_slippage, idempotency_key
+        )
+
+    async def get_positions(self, page=1, limit=20, raw=True):
+        return await self._call(self.client.get_positions, page, limit, raw=raw)
+
+    async def get_balance(self, raw=True):
+        return await self._call(self.client.get_balance, raw=raw)
+
+    async def create_market(self, title, options, end_time, description=None, initial_probabilities=None, image_urls=None):
+        return await self._call(
+            self.client.create_market, title, options, end_time, description, initial_probabilities, image_urls
+        )
+
+    async def upload_files(self, paths, workers=4, content_type=None, file_extension=None, index=None):
+        return await self._call(self.client.upload_files, paths, workers, content_type, file_extension, index)
+
+    async def aclose(self):
+        self._executor.shutdown(wait=True)
+        self.client.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
+
+def print_ndjson(items, out=None):
+    from json_codec import dumps
+    out = out or sys.stdout
+    for item in items:
+        out.write(dumps(item) + "\n")
+        out.flush()
+
+def print_json(value, output_format="pretty", out=None):
+    """Print a command result indented, as one compact line, or as NDJSON rows for list results."""
+    from json_codec import dumps
+    out = out or sys.stdout
+    rows = value if isinstance(value, list) else None
+    if isinstance(value, dict):
+        rows = next((value[key] for key in PAGE_ITEM_KEYS if isinstance(value.get(key), list)), None)
+    if output_format == "ndjson" and rows is not None:
+        for item in rows:
+            out.write(dumps(item) + "\n")
+    else:
+        out.write(dumps(value, 2 if output_format == "pretty" else None) + "\n")
+
+def parse_amount(value):
+    try:
+        return int(value)
+    except ValueError:
+        return float(value)
+
+def read_quote_requests(lines):
+    batch = []
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if line[0] in "{[":
+            request = json.loads(line)
+        else:
+            request = line.replace(",", " ").split()
+            if len(request) not in (3, 4):
+                raise ValueError(f"Expected 'market_id option_id amount [side]', got: {line}")
+            request[2] = parse_amount(request[2])
+        batch.append(request)
+    return batch
+
+def print_quote_table(rows, out=None):
+    header = ("#", "market_id", "option_id", "amount", "side", "result")
+    table = [header]
+    for i, row in enumerate(rows):
+        result = f"ERROR: {row['error']}" if "error" in row else json.dumps(row["quote"], separators=(",", ":"))
+        table.append((str(i), str(row["market_id"]), str(row["option_id"]), str(row["amount"]), row["side"], result))
+    widths = [max(len(r[i]) for r in table) for i in range(len(header) - 1)]
+    for r in table:
+        print("  ".join(c.ljust(w) for c, w in zip(r, widths)) + "  " + r[-1], file=out)
+
+def parse_grid(spec):
+    start, stop, step = (float(x) for x in spec.split(":"))
+    if step <= 0 or stop < start:
+        raise ValueError(f"Invalid grid {spec!r}: expected START:STOP:STEP with STEP > 0")
+    return [round(start + i * step, 10) for i in range(int((stop - start) / step + 1e-9) + 1)]
+
+def estimate_quotes(client, market_id, amounts, side="buy", option_ids=None, samples=(10.0, 100.0), verify=0):
+    """Yield one estimated quote curve per option, calibrated with at most a get_market and a few quotes."""
+    from quote_model import QuoteEstimator
+    market = client.get_market(market_id)
+    options = market.get("data", market).get("options") or []
+    for option_id in option_ids or [option["id"] for option in options]:
+        estimator = QuoteEstimator.calibrate(client, market_id, option_id, samples, side, market)
+        verified = []
+        if verify:
+            step = max(len(amounts) // verify, 1)
+            for amount in amounts[step // 2::step][:verify]:
+                quote = client.get_quote(market_id, option_id, amount, side)
+                error = estimator.check(side, amount, quote)
+                verified.append({"amount": amount, "error": None if error is None else round(error, 6)})
+        yield {**estimator.to_dict(), "side": side, "verified": verified,
+               "estimates": estimator.estimate(amounts, side)}
+
+def build_cache(mode):
+    if mode == "memory":
+        return ResponseCache(MemoryCache())
+    if mode == "disk":
+        return ResponseCache(DiskCache())
+    return None
+
+def resolve_images(client, images, workers=4):
+    """Replace local image paths with file URLs, uploading content not seen before."""
+    local = [image for image in images or () if os.path.isfile(image)]
+    if not local:
+        return images
+    from upload_index import UploadIndex
+    with UploadIndex() as index:
+        rows = client.upload_files(local, workers, index=index)
+    for row in rows:
+        if "error" in row:
+            raise RuntimeError(f"Upload of {row['path']} failed: {row['error']}")
+    urls = {row["path"]: row["file_url"] for row in rows}
+    return [urls.get(image, image) for image in images]
+
+def add_mirror_arguments(subparser):
+    group = subparser.add_mutually_exclusive_group()
+    group.add_argument("--offline", action="store_true", help="Answer from the local mirror only (see 'sync')")
+    group.add_argument("--max-staleness", type=float, metavar="SECONDS",
+                       help="Answer from the local mirror if it was synced within SECONDS")
+
+def open_mirror(args, status=None):
+    """Return the local mirror if this command may be answered from it, else None."""
+    if not args.offline and args.max_staleness is None:
+        return None
+    from market_mirror import MarketMirror
+    mirror = MarketMirror()
+    if args.offline or status is None:
+        return mirror
+    age = mirror.age(status)
+    if age is not None and age <= args.max_staleness:
+        return mirror
+    mirror.close()
+    return None
+
+class _SkippedParser:
+    """Absorbs the arguments of subcommands that were not invoked, so they are never built."""
+
+    def add_argument(self, *args, **kwargs):
+        pass
+
+    def add_mutually_exclusive_group(self, **kwargs):
+        return self
+
+GLOBAL_VALUE_OPTIONS = ("--cache", "--stats-file", "--output-format")
+
+def invoked_command(argv):
+    """The subcommand named in `argv` (the first positional after global options), or None.
+
+    Value options are only recognised by their full name, spelled "--opt value"
+    or "--opt=value"; build_parser disables abbreviations to keep it that way.
+    """
+    skip = False
+    for arg in argv:
+        if skip:
+            skip = False
+        elif arg in GLOBAL_VALUE_OPTIONS:
+            skip = True
+        elif not arg.startswith("-"):
+            return arg
+    return None
+
+def build_parser(argv=None):
+    """Build the CLI parser; given `argv`, only the invoked subcommand gets its arguments."""
+    target = invoked_command(argv) if argv is not None else None
+
+    def add_command(name, **kwargs):
+        command = subparsers.add_parser(name, **kwargs)
+        return command if argv is None or name == target else _SkippedParser()
+
+    # No abbreviated global options: invoked_command must recognise "--output-format" to skip its value.
+    parser = argparse.ArgumentParser(description="SeeSaw Prediction Market CLI", allow_abbrev=False)
+    parser.add_argument("--cache", choices=["off", "memory", "disk"], default=os.getenv("SEESAW_CACHE", "off"),
+                        help="Cache market reads (disk persists across invocations)")
+    parser.add_argument("--no-daemon", action="store_true",
+                        help="Run in-process even if a seesaw daemon is listening")
+    parser.add_argument("--stats", action="store_true",
+                        help="Print per-endpoint request statistics to stderr on exit (runs in-process)")
+    parser.add_argument("--stats-file", metavar="PATH",
+                        help="Write request statistics on exit as JSON, or Prometheus text for *.prom")
+    parser.add_argument("--output-format", choices=OUTPUT_FORMATS, default=os.getenv("SEESAW_OUTPUT_FORMAT", "pretty"),
+                        help="JSON output: indented, one compact line, or one line per item of list results")
+    subparsers = parser.add_subparsers(dest="command", help="Commands")
+
+    # Balance
+    add_command("balance", help="Get wallet balance")
+
+    # Markets
+    p_list = add_command("list-markets", help="List prediction markets")
+    p_list.add_argument("--page", type=int, default=1)
+    p_list.add_argument("--limit", type=int, default=20)
+    p_list.add_argument("--status", default="active")
+    p_list.add_argument("--category", dest="category_id")
+    p_list.add_argument("--all", action="store_true", help="Stream every page as NDJSON")
+    p_list.add_argument("--prefetch", type=int, default=2, help="Pages to fetch ahead with --all")
+    add_mirror_arguments(p_list)
+
+    p_get = add_command("get-market", help="Get market details")
+    p_get.add_argument("id", help="Market ID")
+    add_mirror_arguments(p_get)
+
+    p_watch = add_command("watch", help="Stream market changes as NDJSON events")
+    p_watch.add_argument("--markets", nargs="+", help="Market IDs to watch (default: the --status listing)")
+    p_watch.add_argument("--status", default="active")
+    p_watch.add_argument("--interval", type=float, default=5.0, help="Seconds between polls")
+    p_watch.add_argument("--count", type=int, help="Stop after this many polls (or pushed updates)")
+    p_watch.add_argument("--transport", choices=["poll", "sse"], default="poll",
+                         help="sse: receive pushed updates, falling back to polling if the server has no stream")
+    p_watch.add_argument("--push-url", help="Server-Sent Events endpoint (default: BASE_URL/markets/stream)")
+    p_watch.add_argument("--alert-price-move", type=float, metavar="DELTA",
+                         help="Alert when an option price moves this much since the last alert")
+    p_watch.add_argument("--alert-volume-move", type=float, metavar="DELTA",
+                         help="Alert when volume grows this much since the last alert")
+    p_watch.add_argument("--alert-status", action="store_true", help="Alert on every status change")
+    p_watch.add_argument("--workers", type=int, default=8, help="Concurrent market fetches per poll")
+
+    p_sync = add_command("sync", help="Update the local SQLite market mirror")
+    p_sync.add_argument("--status", nargs="+", default=["active"], help="Market statuses to mirror")
+    p_sync.add_argument("--full", action="store_true", help="Refetch every market, not only changed ones")
+    p_sync.add_argument("--workers", type=int, default=8)
+
+    # Trade
+    p_quote = add_command("quote", help="Get a quote")
+    p_quote.add_argument("market_id")
+    p_quote.add_argument("option_id")
+    p_quote.add_argument("amount", type=int)
+    p_quote.add_argument("--side", choices=["buy", "sell"], default="buy")
+
+    p_estimate = add_command("estimate-quotes", help="Estimate a grid of quotes from a local LMSR model")
+    p_estimate.add_argument("market_id")
+    p_estimate.add_argument("--option", dest="option_ids", nargs="+", help="Option IDs (default: every option)")
+    grid = p_estimate.add_mutually_exclusive_group(required=True)
+    grid.add_argument("--amounts", type=float, nargs="+", help="Amounts to estimate")
+    grid.add_argument("--grid", metavar="START:STOP:STEP", help="Evenly spaced amounts, STOP included")
+    p_estimate.add_argument("--side", choices=["buy", "sell"], default="buy")
+    p_estimate.add_argument("--samples", type=float, nargs="+", default=[10.0, 100.0],
+                            help="Amounts quoted to calibrate when the market does not expose pool state")
+    p_estimate.add_argument("--verify", type=int, default=0, metavar="N",
+                            help="Check N grid points against real quotes, recalibrating on divergence")
+
+    p_batch = add_command("quote-batch", help="Get many quotes concurrently")
+    p_batch.add_argument("file", nargs="?", default="-",
+                         help="File of 'market_id option_id amount [side]' lines or JSON objects (default: stdin)")
+    p_batch.add_argument("--format", choices=["table", "ndjson"], default="table")
+    p_batch.add_argument("--workers", type=int, default=8)
+    p_batch.add_argument("--rate", type=float, help="Max quote requests per second")
+
+    p_buy = add_command("buy", help="Buy shares")
+    p_buy.add_argument("market_id")
+    p_buy.add_argument("option_id")
+    p_buy.add_argument("amount", type=int)
+    p_buy.add_argument("--idempotency-key", help="Lets the trade be retried safely on transient failures")
+    p_buy.add_argument("--max-price", type=float, help="Quote first; abort if the average price per share is higher")
+    p_buy.add_argument("--min-shares", type=float, help="Quote first; abort if the amount buys fewer shares")
+    p_buy.add_argument("--max-slippage", type=float,
+                       help="Quote first; abort if the average price moves more than this fraction from the current price")
+
+    p_sell = add_command("sell", help="Sell shares")
+    p_sell.add_argument("market_id")
+    p_sell.add_argument("option_id")
+    p_sell.add_argument("shares", type=int)
+    p_sell.add_argument("--idempotency-key", help="Lets the trade be retried safely on transient failures")
+    p_sell.add_argument("--min-price", type=float, help="Quote first; abort if the average price per share is lower")
+    p_sell.add_argument("--max-slippage", type=float,
+                        help="Quote first; abort if the average price moves more than this fraction from the current price")
+
+    p_portfolio = add_command("portfolio", help="Value all positions: MTM, unrealized PnL, category exposure")
+    p_portfolio.add_argument("--max-staleness", type=float, default=60.0, metavar="SECONDS",
+                             help="Reuse mirrored market snapshots younger than this (0 refetches all)")
+    p_portfolio.add_argument("--workers", type=int, default=8, help="Concurrent market fetches")
+    p_portfolio.add_argument("--details", action="store_true", help="Include a row per position")
+
+    p_plan = add_command("execute-plan", help="Execute a file of orders, resumable after a crash")
+    p_plan.add_argument("plan", help="JSONL file, one order per line: "
+                                     '{"market_id", "option_id", "side", "amount" (or "shares" to sell), guards...}')
+    p_plan.add_argument("--workers", type=int, default=8, help="Markets traded concurrently")
+    p_plan.add_argument("--journal", help="Progress journal (default: PLAN.journal)")
+
+    p_positions = add_command("positions", help="Get positions")
+    p_positions.add_argument("--page", type=int, default=1)
+    p_positions.add_argument("--limit", type=int, default=20)
+    p_positions.add_argument("--all", action="store_true", help="Stream every page as NDJSON")
+    p_positions.add_argument("--prefetch", type=int, default=2, help="Pages to fetch ahead with --all")
+
+    # Creation
+    p_create = add_command("create-market", help="Create a new market")
+    p_create.add_argument("--title", required=True)
+    p_create.add_argument("--options", nargs="+", required=True)
+    p_create.add_argument("--end-time", required=True, help="ISO8601 string")
+    p_create.add_argument("--description")
+    p_create.add_argument("--probs", type=int, nargs="+", help="Initial probabilities")
+    p_create.add_argument("--images", nargs="+", help="Image URLs or local files (uploaded first)")
+
+    p_upload = add_command("upload", help="Upload images")
+    p_upload.add_argument("files", nargs="+", help="Image files or directories")
+    p_upload.add_argument("--type", help="Content type (default: guessed from each file name)")
+    p_upload.add_argument("--ext", help="File extension (default: taken from each file name)")
+    p_upload.add_argument("--workers", type=int, default=4)
+    p_upload.add_argument("--no-dedupe", action="store_true",
+                          help="Upload even if identical content was uploaded before")
+
+    p_daemon = add_command("daemon", help="Serve CLI commands from a warm client over a Unix socket")
+    p_daemon.add_argument("--socket", help="Socket path (default: SEESAW_SOCKET or seesaw.sock in a private per-user directory)")
+    p_daemon.add_argument("--metrics-port", type=int, help="Serve Prometheus metrics on 127.0.0.1:PORT/metrics")
+    p_daemon.add_argument("--stats-interval", type=float, default=10.0,
+                          help="Seconds between --stats-file dumps while the daemon runs")
+
+    return parser
+
+def report_stats(stats, args):
+    if stats is None:
+        return
+    if args.stats:
+        print(stats.summary(), file=sys.stderr)
+    if args.stats_file:
+        stats.write(args.stats_file)
+
+def main():
+    parser = build_parser(sys.argv[1:])
+    args = parser.parse_args()
+    metrics_port = getattr(args, "metrics_port", None)
+    stats = ClientStats() if args.stats or args.stats_file or metrics_port else None
+
+    if args.command == "daemon":
+        from seesaw_daemon import fingerprint, serve
+        # The daemon lives long enough for an in-memory cache to pay off.
+        client = SeesawClient(cache=build_cache("memory" if args.cache == "off" else args.cache), stats=stats)
+        if metrics_port:
+            serve_prometheus(stats, metrics_port)
+        exporter = PeriodicExporter(stats, args.stats_file, args.stats_interval) if args.stats_file else None
+        code = serve(client, run_command, fingerprint(client.base_url, client.api_key, client.api_secret), args.socket)
+        if exporter is not None:
+            exporter.stop()
+        if args.stats:
+            print(stats.summary(), file=sys.stderr)
+        sys.exit(code)
+
+    # Statistics describe this invocation's own requests, so they never go through the daemon.
+    if args.command and not args.no_daemon and stats is None:
+        from seesaw_daemon import fingerprint, forward
+        code = forward(args, fingerprint(
+            os.getenv("SEESAW_BASE_URL", DEFAULT_BASE_URL), os.getenv("SEESAW_API_KEY"), os.getenv("SEESAW_API_SECRET")
+        ))
+        if code is not None:
+            sys.exit(code)
+
+    with SeesawClient(cache=build_cache(args.cache), stats=stats) as client:
+        code = run_command(client, args, parser)
+    report_stats(stats, args)
+    sys.exit(code)
+
+def run_command(client, args, parser=None, out=None, err=None, stdin=None):
+    """Execute one parsed CLI command, writing to `out`/`err`; returns the exit code."""
+    out = out or sys.stdout
+    err = err or sys.stderr
+    output_format = getattr(args, "output_format", "pretty")
+    try:
+        if args.command == "balance":
+            print_json(client.get_balance(), output_format, out)
+        elif args.command == "list-markets" and (mirror := open_mirror(args, args.status)):
+            with mirror:
+                if args.all:
+                    print_ndjson(mirror.iter_markets(args.status, args.category_id), out)
+                else:
+                    print_json(mirror.list_markets(args.page, args.limit, args.status, args.category_id), output_format, out)
+        elif args.command == "list-markets":
+            if args.all:
+                # Streaming skips the response cache, so only stream when there is none to fill.
+                print_ndjson(client.iter_markets(args.status, args.category_id, args.limit, args.prefetch,
+                                                 stream=client.cache is None), out)
+            else:
+                print_json(client.list_markets(args.page, args.limit, args.status, args.category_id), output_format, out)
+        elif args.command == "get-market":
+            market = None
+            if mirror := open_mirror(args):
+                with mirror:
+                    market = mirror.get_market(args.id, None if args.offline else args.max_staleness)
+                if market is None and args.offline:
+                    raise RuntimeError(f"Market {args.id} is not in the local mirror; run 'sync' first")
+            print_json(market if market is not None else client.get_market(args.id), output_format, out)
+        elif args.command == "watch":
+            from market_watch import AlertRules, MarketWatcher
+            if client.cache is None:
+                # Conditional polling needs the previous body and its ETag.
+                client.cache = ResponseCache(MemoryCache())
+            rules = None
+            if args.alert_price_move is not None or args.alert_volume_move is not None or args.alert_status:
+                rules = AlertRules(args.alert_price_move, args.alert_volume_move, args.alert_status)
+            watcher = MarketWatcher(client, args.markets, args.status, rules, args.workers)
+
+            def emit(event):
+                print(json.dumps(event), file=out)
+                out.flush()
+
+            try:
+                if args.transport == "sse":
+                    try:
+                        watcher.stream(emit, args.push_url, args.count)
+                    except RuntimeError as e:
+                        print(f"Warning: {e}; falling back to polling", file=err)
+                        watcher.run(emit, args.interval, args.count)
+                else:
+                    watcher.run(emit, args.interval, args.count)
+            except KeyboardInterrupt:
+                pass
+        elif args.command == "sync":
+            from market_mirror import MarketMirror
+            with MarketMirror() as mirror:
+                print_json(mirror.sync(client, args.status, args.full, args.workers), output_format, out)
+        elif args.command == "quote":
+            print_json(client.get_quote(args.market_id, args.option_id, args.amount, args.side), output_format, out)
+        elif args.command == "estimate-quotes":
+            amounts = args.amounts or parse_grid(args.grid)
+            print_ndjson(estimate_quotes(client, args.market_id, amounts, args.side, args.option_ids, args.samples,
+                                         args.verify), out)
+        elif args.command == "quote-batch":
+            if args.file == "-":
+                quote_requests = read_quote_requests(stdin or sys.stdin)
+            else:
+                with open(args.file) as f:
+                    quote_requests = read_quote_requests(f)
+            rows = client.get_quotes(quote_requests, args.workers, args.rate)
+            if args.format == "ndjson":
+                print_ndjson(rows, out)
+            else:
+                print_quote_table(rows, out)
+        elif args.command == "buy" and (args.max_price, args.min_shares, args.max_slippage) != (None, None, None):
+            result = client.guarded_trade("buy", args.market_id, args.option_id, args.amount, max_price=args.max_price,
+                                          min_shares=args.min_shares, max_slippage=args.max_slippage,
+                                          idempotency_key=args.idempotency_key)
+            print_json(result, output_format, out)
+        elif args.command == "buy":
+            print_json(client.buy(args.market_id, args.option_id, args.amount, args.idempotency_key), output_format, out)
+        elif args.command == "sell" and (args.min_price, args.max_slippage) != (None, None):
+            result = client.guarded_trade("sell", args.market_id, args.option_id, args.shares, min_price=args.min_price,
+                                          max_slippage=args.max_slippage, idempotency_key=args.idempotency_key)
+            print_json(result, output_format, out)
+        elif args.command == "sell":
+            print_json(client.sell(args.market_id, args.option_id, args.shares, args.idempotency_key), output_format, out)
+        elif args.command == "portfolio":
+            from market_mirror import MarketMirror
+            from portfolio import portfolio
+            with MarketMirror() as mirror:
+                summary = portfolio(client, mirror, args.max_staleness, args.workers, args.details)
+            print_json(summary, output_format, out)
+        elif args.command == "execute-plan":
+            from trade_plan import TradePlan, execute_plan
+            lock = threading.Lock()
+
+            def report(event):
+                with lock:
+                    print(json.dumps(event), file=out)
+                    out.flush()
+
+            summary = execute_plan(client, TradePlan.load(args.plan), args.journal, args.workers, report)
+            print(json.dumps(summary), file=err)
+            if summary["failed"] or summary["skipped"]:
+                return 1
+        elif args.command == "positions":
+            if args.all:
+                print_ndjson(client.iter_positions(args.limit, args.prefetch, stream=True), out)
+            else:
+                print_json(client.get_positions(args.page, args.limit), output_format, out)
+        elif args.command == "create-market":
+            if args.probs and len(args.probs) != len(args.options):
+                print(f"Error: Number of initial probabilities ({len(args.probs)}) must match number of options ({len(args.options)})", file=err)
+                return 1
+            images = resolve_images(client, args.images)
+            print_json(client.create_market(args.title, args.options, args.end_time, args.description, args.probs, images), output_format, out)
+        elif args.command == "upload":
+            from upload_index import UploadIndex, expand_paths
+            files = expand_paths(args.files)
+            if not files:
+                raise RuntimeError("No files to upload")
+            index = None if args.no_dedupe else UploadIndex()
+            try:
+                rows = client.upload_files(files, args.workers, args.type, args.ext, index)
+            finally:
+                if index is not None:
+                    index.close()
+            if len(args.files) != 1 or args.files != files:
+                print_json(rows, output_format, out)
+            elif "error" not in rows[0]:
+                print_json({"file_url": rows[0]["file_url"]}, output_format, out)
+            failed = [row for row in rows if "error" in row]
+            for row in failed:
+                print(f"Error: {row['path']}: {row['error']}", file=err)
+            if failed:
+                return 1
+        elif parser is not None:
+            parser.print_help(out)
+    except TradeGuardError as e:
+        print(f"Error: {e}", file=err)
+        print(json.dumps({"quote": e.quote, "timing": e.timing}, indent=2), file=err)
+        return 1
+    except Exception as e:
+        print(f"Error: {e}", file=err)
+        return 1
+    finally:
+        out.flush()
+    return 0
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+"""
+Resident SeeSaw daemon serving CLI commands over a Unix socket.
+
+`seesaw.py daemon` keeps one warm SeesawClient (connection pool, token and
+response cache) and executes commands that other `seesaw.py` invocations
+forward to it. The protocol is newline-delimited JSON:
+
+    client -> {"fingerprint": ...}            daemon -> {"ready": true} | {"refused": reason}
+    client -> {"args": {...}, "stdin": ...}   daemon -> {"out": text}* {"err": text}* {"exit": code}
+
+The fingerprint hashes the caller's base URL and credentials, so commands are
+only forwarded to a daemon acting as the same account. The default socket lives
+in a private per-user directory, and callers only connect to a socket owned by
+their own user with no group or other permissions, so another local user cannot
+stand in for the daemon and capture forwarded commands.
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import signal
+import socket
+import socketserver
+import stat
+import sys
+import tempfile
+import threading
+
+SOCKET_NAME = "seesaw.sock"
+# Arguments holding local paths; resolved by the caller since the daemon has its own cwd.
+PATH_ARGS = ("file", "files", "images", "plan", "journal")
+
+
+def _uid():
+    return os.getuid() if hasattr(os, "getuid") else None
+
+
+def _private(st):
+    """Whether a stat result belongs to the current user and is closed to group and others."""
+    uid = _uid()
+    return (uid is None or st.st_uid == uid) and not st.st_mode & 0o077
+
+
+def socket_dir(create=False):
+    """
+    Private directory for the default socket: $XDG_RUNTIME_DIR, else a 0700
+    `seesaw-<uid>` directory in the temp dir.
+
+    Returns:
+        The directory path, or None if it does not exist (and `create` is
+        false) or is not private to the current user
+    """
+    runtime = os.getenv("XDG_RUNTIME_DIR")
+    if runtime:
+        return runtime
+    path = os.path.join(tempfile.gettempdir(), f"seesaw-{_uid() if _uid() is not None else 'user'}")
+    if create:
+        try:
+            os.mkdir(path, 0o700)
+        except FileExistsError:
+            pass
+    try:
+        st = os.lstat(path)
+    except FileNotFoundError:
+        return None
+    return path if stat.S_ISDIR(st.st_mode) and _private(st) else None
+
+
+def default_socket_path(create=False):
+    """SEESAW_SOCKET, or the socket in `socket_dir`; None if that directory is missing or unsafe."""
+    path = os.getenv("SEESAW_SOCKET")
+    if path:
+        return path
+    directory = socket_dir(create)
+    return os.path.join(directory, SOCKET_NAME) if directory else None
+
+
+def socket_problem(path):
+    """Why the socket at `path` must not be trusted, or None if it is ours; raises FileNotFoundError if absent."""
+    st = os.lstat(path)
+    if not stat.S_ISSOCK(st.st_mode):
+        return "it is not a socket"
+    if not _private(st):
+        return "it is not owned by the current user or is accessible to other users"
+    return None
+
+
+def fingerprint(base_url, api_key, api_secret):
+    return hashlib.sha256(f"{base_url}\0{api_key}\0{api_secret}".encode()).hexdigest()
+
+
+def _send(wfile, frame):
+    wfile.write((json.dumps(frame) + "\n").encode())
+    wfile.flush()
+
+
+class FrameWriter(io.TextIOBase):
+    """Text stream that ships buffered output to the caller as one frame per flush."""
+
+    def __init__(self, wfile, stream, lock):
+        self._wfile = wfile
+        self._stream = stream
+        self._lock = lock
+        self._buffer = []
+
+    def writable(self):
+        return True
+
+    def write(self, text):
+        self._buffer.append(text)
+        return len(text)
+
+    def flush(self):
+        if not self._buffer:
+            return
+        text, self._buffer = "".join(self._buffer), []
+        with self._lock:
+            _send(self._wfile, {self._stream: text})
+
+
+class CommandHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        try:
+            hello = json.loads(self.rfile.readline() or "{}")
+            if hello.get("fingerprint") != self.server.fingerprint:
+                _send(self.wfile, {"refused": "daemon is running with different credentials"})
+                return
+            _send(self.wfile, {"ready": True})
+
+            request = json.loads(self.rfile.readline() or "{}")
+            args = argparse.Namespace(**request["args"])
+            lock = threading.Lock()
+            out = FrameWriter(self.wfile, "out", lock)
+            err = FrameWriter(self.wfile, "err", lock)
+            stdin = io.StringIO(request.get("stdin") or "")
+            code = self.server.run(self.server.client, args, None, out, err, stdin)
+            err.flush()
+            out.flush()
+            _send(self.wfile, {"exit": code})
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+class DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path, client, run, fingerprint):
+        self.client = client
+        self.run = run
+        self.fingerprint = fingerprint
+        old_umask = os.umask(0o177)
+        try:
+            super().__init__(path, CommandHandler)
+        finally:
+            os.umask(old_umask)
+
+
+def _listening(path):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(path)
+            return True
+        except OSError:
+            return False
+
+
+def serve(client, run, fingerprint, socket_path=None):
+    """
+    Serve forwarded commands until interrupted.
+
+    Args:
+        client: Warm SeesawClient shared by every command
+        run: Command runner, called as run(client, args, parser, out, err, stdin)
+        fingerprint: Credential fingerprint callers must present
+        socket_path: Socket path (defaults to SEESAW_SOCKET or a private per-user directory)
+
+    Returns:
+        Process exit code
+    """
+    path = socket_path or default_socket_path(create=True)
+    if path is None:
+        print("Error: the per-user socket directory in the temp dir is not private to the current user; "
+              "set SEESAW_SOCKET or pass --socket", file=sys.stderr)
+        return 1
+    try:
+        problem = socket_problem(path)
+    except FileNotFoundError:
+        pass
+    else:
+        if problem:
+            print(f"Error: refusing to replace {path}: {problem}", file=sys.stderr)
+            return 1
+        if _listening(path):
+            print(f"Error: a seesaw daemon is already listening on {path}", file=sys.stderr)
+            return 1
+        os.unlink(path)
+
+    server = DaemonServer(path, client, run, fingerprint)
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    print(f"seesaw daemon listening on {path}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        try:
+            if socket_problem(path) is None:
+                os.unlink(path)
+        except FileNotFoundError:
+            pass
+        client.close()
+    return 0
+
+
+def _absolute(value):
+    # The daemon has its own working directory; URLs and "-" (stdin) pass through.
+    if isinstance(value, list):
+        return [_absolute(item) for item in value]
+    if isinstance(value, str) and value != "-" and "://" not in value:
+        return os.path.abspath(value)
+    return value
+
+
+def forward(args, fingerprint, socket_path=None):
+    """
+    Run a parsed command on the daemon, relaying its output.
+
+    Returns:
+        The command's exit code, or None if no compatible daemon is running
+        and the caller should execute the command in-process.
+    """
+    path = socket_path or default_socket_path()
+    if path is None:
+        return None
+    try:
+        problem = socket_problem(path)
+    except FileNotFoundError:
+        return None
+    if problem:
+        # Whoever created it could read the command and fake its output.
+        print(f"Warning: not forwarding to {path}: {problem}", file=sys.stderr)
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+    except OSError:
+        sock.close()
+        return None
+
+    with sock, sock.makefile("rwb") as stream:
+        _send(stream, {"fingerprint": fingerprint})
+        hello = json.loads(stream.readline() or "{}")
+        if not hello.get("ready"):
+            return None
+
+        payload = dict(vars(args))
+        for name in PATH_ARGS:
+            if payload.get(name) is not None:
+                payload[name] = _absolute(payload[name])
+        stdin = sys.stdin.read() if payload.get("file") == "-" else None
+        _send(stream, {"args": payload, "stdin": stdin})
+
+        for line in stream:
+            frame = json.loads(line)
+            if "out" in frame:
+                sys.stdout.write(frame["out"])
+                sys.stdout.flush()
+            elif "err" in frame:
+                sys.stderr.write(frame["err"])
+                sys.stderr.flush()
+            elif "exit" in frame:
+                return frame["exit"]
+
+    # The command may already have run (e.g. a trade), so never retry in-process.
+    print("Error: seesaw daemon closed the connection before the command finished", file=sys.stderr)
+    return 1
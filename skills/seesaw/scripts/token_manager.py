@@ -0,0 +1,148 @@
+"""
+Expiry-aware, single-flight token cache for the SeeSaw agent login.
+
+Tokens are cached per (base URL, API key) in a small JSON file together with
+their expiry. Refreshes happen a little before expiry and are serialized by
+an exclusive file lock: the first process to need a new token logs in, the
+others wait on the lock and then reuse what it wrote.
+"""
+
+import base64
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to in-process locking only
+    fcntl = None
+
+TOKEN_CACHE_DIR = os.getenv("SEESAW_TOKEN_DIR", tempfile.gettempdir())
+REFRESH_MARGIN = 60
+
+
+def token_expiry(data, token):
+    """Best-effort expiry (epoch seconds) from a login response or JWT `exp` claim."""
+    if isinstance(data.get("expires_in"), (int, float)):
+        return time.time() + data["expires_in"]
+    expires_at = data.get("expires_at")
+    if isinstance(expires_at, (int, float)):
+        return expires_at / 1000 if expires_at > 1e11 else expires_at
+    if isinstance(expires_at, str):
+        from datetime import datetime
+
+        try:
+            return datetime.fromisoformat(expires_at.replace("Z", "+00:00")).timestamp()
+        except ValueError:
+            pass
+    parts = token.split(".") if isinstance(token, str) else []
+    if len(parts) == 3:
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(parts[1] + "=" * (-len(parts[1]) % 4)))
+            if isinstance(payload.get("exp"), (int, float)):
+                return payload["exp"]
+        except (ValueError, AttributeError):
+            pass
+    return None
+
+
+@contextmanager
+def file_lock(path):
+    if fcntl is None:
+        yield
+        return
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+        os.close(fd)
+
+
+class TokenManager:
+    def __init__(self, base_url, api_key, login, cache_dir=None, refresh_margin=REFRESH_MARGIN):
+        """
+        Args:
+            base_url: API base URL the token is valid for
+            api_key: API key the token belongs to
+            login: Callable performing the login, returning (token, expires_at or None)
+            cache_dir: Directory for the token file (default: SEESAW_TOKEN_DIR or the temp dir)
+            refresh_margin: Seconds before expiry at which the token is proactively refreshed
+        """
+        import hashlib
+
+        digest = hashlib.sha256(f"{base_url}\0{api_key}".encode()).hexdigest()[:16]
+        self.path = os.path.join(cache_dir or TOKEN_CACHE_DIR, f"seesaw_token_{digest}.json")
+        self.lock_path = self.path + ".lock"
+        self.refresh_margin = refresh_margin
+        self._login = login
+        self._lock = threading.Lock()
+        self._state = None
+
+    @property
+    def token(self):
+        return self._cached()[0]
+
+    @property
+    def expires_at(self):
+        return self._cached()[1]
+
+    def _cached(self):
+        # The token file is only read once something actually needs the token.
+        if self._state is None:
+            self._state = self._read()
+        return self._state
+
+    def _read(self):
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+            return data.get("token"), data.get("expires_at")
+        except (OSError, ValueError, AttributeError):
+            return None, None
+
+    def _write(self, token, expires_at):
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w") as f:
+                json.dump({"token": token, "expires_at": expires_at}, f)
+            os.replace(tmp, self.path)
+        except OSError:
+            pass
+
+    def _usable(self, token, expires_at):
+        return bool(token) and (expires_at is None or expires_at - self.refresh_margin > time.time())
+
+    def set(self, token, expires_at=None):
+        self._state = (token, expires_at)
+
+    def get(self):
+        token, expires_at = self._cached()
+        if self._usable(token, expires_at):
+            return token
+        return self.refresh(token)
+
+    def refresh(self, stale_token=None, force=False):
+        """Return a fresh token, logging in only if nobody else already has.
+
+        `stale_token` is the token the caller found wanting (expired or
+        rejected with 401); any other usable token, in memory or on disk, is
+        reused instead of logging in again.
+        """
+        with self._lock:
+            if not force and self.token != stale_token and self._usable(self.token, self.expires_at):
+                return self.token
+            with file_lock(self.lock_path):
+                token, expires_at = self._read()
+                if not force and token != stale_token and self._usable(token, expires_at):
+                    self.set(token, expires_at)
+                    return token
+                token, expires_at = self._login()
+                self._write(token, expires_at)
+                self.set(token, expires_at)
+                return token
@@ -0,0 +1,260 @@
+"""
+Batch execution of an order plan (one JSON order per line) with crash recovery.
+
+Orders on the same market run one after another in file order; different
+markets run concurrently. Every order carries an idempotency key derived from
+the plan's content hash, a nonce for the run and the line number, and each
+step is appended to a journal, so re-running an interrupted plan skips
+finished orders and replays unfinished ones under the same key, which the
+server deduplicates. A replayed order is sent without re-checking its guards:
+the server may already have filled it, and a quote taken now says nothing
+about that fill. Once every order of a run is done, running the plan again
+starts a new run with new keys, so the orders are traded again.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from token_manager import file_lock
+
+GUARD_FIELDS = ("max_price", "min_price", "min_shares", "max_slippage")
+
+
+class PlanError(ValueError):
+    pass
+
+
+class Order:
+    __slots__ = ("line", "market_id", "option_id", "side", "amount", "guards", "fixed_key", "idempotency_key")
+
+    def __init__(self, line, market_id, option_id, side, amount, guards, idempotency_key):
+        self.line = line
+        self.market_id = market_id
+        self.option_id = option_id
+        self.side = side
+        self.amount = amount
+        self.guards = guards
+        self.fixed_key = idempotency_key  # given in the plan; otherwise derived per run
+        self.idempotency_key = idempotency_key
+
+    def describe(self):
+        return {"line": self.line, "market_id": self.market_id, "option_id": self.option_id,
+                "side": self.side, "amount": self.amount, "idempotency_key": self.idempotency_key}
+
+
+def run_key(digest, run, line_no):
+    """Idempotency key of a plan line within one run (`run` is None for journals from before run nonces)."""
+    name = f"seesaw-plan:{digest}:{line_no}" if run is None else f"seesaw-plan:{digest}:{run}:{line_no}"
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, name))
+
+
+def ambiguous(exc):
+    """Whether a failed trade may still have been executed by the server (timeout, dropped connection, 5xx)."""
+    from seesaw_cli import SeesawConnectionError
+
+    status = getattr(exc, "status_code", None)
+    return isinstance(exc, (SeesawConnectionError, ConnectionError, TimeoutError)) or (
+        status is not None and status >= 500)
+
+
+def parse_order(line_no, data):
+    """Build an Order from one plan line; `shares` is accepted for sells."""
+    if not isinstance(data, dict):
+        raise PlanError(f"line {line_no}: expected a JSON object")
+    side = data.get("side", "buy")
+    if side not in ("buy", "sell"):
+        raise PlanError(f"line {line_no}: side must be 'buy' or 'sell'")
+    amount = data.get("shares" if side == "sell" and "shares" in data else "amount")
+    missing = [name for name, value in (("market_id", data.get("market_id")), ("option_id", data.get("option_id")),
+                                        ("amount", amount)) if value in (None, "")]
+    if missing:
+        raise PlanError(f"line {line_no}: missing {', '.join(missing)}")
+    guards = {name: float(data[name]) for name in GUARD_FIELDS if data.get(name) is not None}
+    return Order(line_no, data["market_id"], data["option_id"], side, amount, guards, data.get("idempotency_key"))
+
+
+class TradePlan:
+    def __init__(self, orders, digest, path=None):
+        self.orders = orders
+        self.digest = digest
+        self.path = path
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            raw = f.read()
+        return cls.parse(raw, path)
+
+    @classmethod
+    def parse(cls, raw, path=None):
+        if isinstance(raw, str):
+            raw = raw.encode()
+        digest = hashlib.sha256(raw).hexdigest()
+        orders = []
+        for line_no, line in enumerate(raw.decode().splitlines(), 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                data = json.loads(line)
+            except ValueError as e:
+                raise PlanError(f"line {line_no}: {e}") from None
+            orders.append(parse_order(line_no, data))
+        return cls(orders, digest, path)
+
+    def by_market(self):
+        """Orders grouped per market, each group in file order."""
+        groups = {}
+        for order in self.orders:
+            groups.setdefault(order.market_id, []).append(order)
+        return list(groups.values())
+
+
+class PlanJournal:
+    """
+    Append-only JSONL record of plan progress, fsynced after every entry.
+
+    Each run starts with a {"plan": digest, "run": nonce} header; only the
+    entries after the last header describe the run being resumed.
+    """
+
+    def __init__(self, path, digest):
+        self.path = path
+        self.digest = digest
+        self.run = None
+        self.runs = 0
+        self.done = {}
+        self.interrupted = set()  # lines journaled "started" with no outcome, or failed ambiguously
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            self._replay()
+        self._file = open(path, "a")
+
+    def new_run(self):
+        """Start a run with a fresh nonce, so its orders get new idempotency keys."""
+        self.run = uuid.uuid4().hex
+        self.runs += 1
+        self.done, self.interrupted = {}, set()
+        with self._lock:
+            self._append({"plan": self.digest, "run": self.run})
+
+    def _replay(self):
+        with open(self.path) as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # torn last write
+                if "plan" in entry and entry["plan"] != self.digest:
+                    raise PlanError(f"{self.path} belongs to a different version of the plan; "
+                                    "remove it or pass another --journal")
+                if "plan" in entry:
+                    self.run = entry.get("run")
+                    self.runs += 1
+                    self.done, self.interrupted = {}, set()
+                    continue
+                status = entry.get("status")
+                if status == "started" or status == "failed" and entry.get("ambiguous"):
+                    self.interrupted.add(entry["line"])
+                elif status in ("done", "failed"):
+                    self.interrupted.discard(entry["line"])
+                if status == "done":
+                    self.done[entry["line"]] = entry
+
+    def _append(self, entry):
+        self._file.write(json.dumps(entry) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def record(self, order, status, **fields):
+        entry = {"line": order.line, "key": order.idempotency_key, "status": status, "at": time.time(), **fields}
+        with self._lock:
+            self._append(entry)
+            if status == "done":
+                self.done[order.line] = entry
+        return entry
+
+    def close(self):
+        self._file.close()
+
+
+def execute_plan(client, plan, journal_path=None, workers=8, on_result=None):
+    """Run `plan` against `client`, resuming from the journal; returns a summary dict.
+
+    `on_result(event)` is called from worker threads for every order with its
+    "status": "done", "failed", "skipped" (an earlier order on the same market
+    failed) or "resumed" (already done in a previous run). Orders interrupted
+    in a previous run, or that failed with a timeout, dropped connection or
+    server error, are resent unguarded and reported "done" with "resent".
+    If the journal's last run finished every order, a new run is started.
+    """
+    if journal_path is None:
+        if plan.path is None:
+            raise PlanError("a journal path is required for plans not loaded from a file")
+        journal_path = f"{plan.path}.journal"
+    counts = {"done": 0, "failed": 0, "skipped": 0, "resumed": 0}
+    counts_lock = threading.Lock()
+    start = time.perf_counter()
+
+    def emit(order, status, **fields):
+        with counts_lock:
+            counts[status] += 1
+        if on_result is not None:
+            on_result({**order.describe(), "status": status, **fields})
+
+    def run_market(orders):
+        failed = False
+        for order in orders:
+            if order.line in journal.done:
+                emit(order, "resumed", result=journal.done[order.line].get("result"))
+                continue
+            if failed:
+                emit(order, "skipped")
+                continue
+            # An interrupted order may already be filled; resend it under its key instead of re-quoting.
+            resend = order.line in journal.interrupted
+            journal.record(order, "started")
+            t = time.perf_counter()
+            try:
+                if order.guards and not resend:
+                    result = client.guarded_trade(order.side, order.market_id, order.option_id, order.amount,
+                                                  idempotency_key=order.idempotency_key, **order.guards)
+                else:
+                    trade = client.buy if order.side == "buy" else client.sell
+                    result = trade(order.market_id, order.option_id, order.amount, order.idempotency_key)
+            except Exception as e:
+                failed = True
+                if ambiguous(e):
+                    journal.record(order, "failed", error=str(e), ambiguous=True)
+                    emit(order, "failed", error=str(e), ambiguous=True)
+                else:
+                    journal.record(order, "failed", error=str(e))
+                    emit(order, "failed", error=str(e))
+                continue
+            elapsed_ms = round((time.perf_counter() - t) * 1000, 3)
+            journal.record(order, "done", result=result)
+            if resend:
+                emit(order, "done", result=result, elapsed_ms=elapsed_ms, resent=True)
+            else:
+                emit(order, "done", result=result, elapsed_ms=elapsed_ms)
+
+    # Two runs of the same plan at once would both replay unfinished orders.
+    with file_lock(f"{journal_path}.lock"):
+        journal = PlanJournal(journal_path, plan.digest)
+        try:
+            if not journal.runs or all(order.line in journal.done for order in plan.orders):
+                journal.new_run()
+            for order in plan.orders:
+                order.idempotency_key = order.fixed_key or run_key(plan.digest, journal.run, order.line)
+            with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+                list(pool.map(run_market, plan.by_market()))
+        finally:
+            journal.close()
+
+    return {"orders": len(plan.orders), **counts, "journal": journal_path,
+            "elapsed_s": round(time.perf_counter() - start, 3)}
@@ -0,0 +1,90 @@
+"""
+Content-hash index of uploaded files.
+
+Maps the API base URL and the SHA-256 of a file's bytes to the `file_url` it
+was uploaded to, in a small SQLite database shared by every invocation, so an
+identical image is never uploaded twice to the same environment (a staging
+upload is never reused in prod).
+"""
+
+import hashlib
+import mimetypes
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from response_cache import CACHE_DIR
+
+UPLOAD_INDEX_PATH = os.getenv("SEESAW_UPLOAD_INDEX", os.path.join(CACHE_DIR, "uploads.sqlite3"))
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def hash_file(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def expand_paths(paths):
+    """Files named directly, plus every file under named directories (sorted)."""
+    files = []
+    for path in paths:
+        path = Path(path)
+        if path.is_dir():
+            files.extend(str(p) for p in sorted(path.rglob("*")) if p.is_file() and not p.name.startswith("."))
+        else:
+            files.append(str(path))
+    return files
+
+
+def content_type_for(path, default="image/jpeg"):
+    content_type, _ = mimetypes.guess_type(path)
+    return content_type or default
+
+
+def extension_for(path, default="jpg"):
+    return Path(path).suffix.lstrip(".").lower() or default
+
+
+class UploadIndex:
+    def __init__(self, path=None):
+        self.path = path or UPLOAD_INDEX_PATH
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, timeout=10, check_same_thread=False, isolation_level=None)
+        if self._db.execute("PRAGMA user_version").fetchone()[0] < 1:
+            # Version 0 rows do not record which environment they were uploaded to, so they cannot be reused.
+            self._db.execute("DROP TABLE IF EXISTS uploads")
+            self._db.execute("PRAGMA user_version = 1")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS uploads ("
+            " base_url TEXT NOT NULL, sha256 TEXT NOT NULL, file_url TEXT NOT NULL, size INTEGER,"
+            " uploaded_at REAL NOT NULL, PRIMARY KEY (base_url, sha256))"
+        )
+
+    def get(self, base_url, sha256):
+        with self._lock:
+            row = self._db.execute(
+                "SELECT file_url FROM uploads WHERE base_url = ? AND sha256 = ?", (base_url, sha256)
+            ).fetchone()
+        return row[0] if row else None
+
+    def put(self, base_url, sha256, file_url, size=None):
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO uploads VALUES (?, ?, ?, ?, ?)", (base_url, sha256, file_url, size, time.time())
+            )
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,28 @@
+"""Run with: python -m unittest discover skills/seesaw/tests"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "scripts"))
+
+from benchmark import HEAVY_MODULES, STARTUP_BUDGET_MS, eager_heavy_modules, startup_times  # noqa: E402
+
+# Slack over the benchmark's budget for noisy CI machines; the median over RUNS absorbs single outliers.
+MARGIN = 1.5
+RUNS = 15
+
+
+class StartupTest(unittest.TestCase):
+    def test_light_command_defers_heavy_imports(self):
+        self.assertEqual(eager_heavy_modules(), [], f"expected none of {HEAVY_MODULES} to be imported")
+
+    def test_help_within_startup_budget(self):
+        overhead = startup_times(RUNS)["startup_overhead_ms"]
+        self.assertLessEqual(overhead, STARTUP_BUDGET_MS * MARGIN,
+                             f"seesaw.py --help adds {overhead:.1f} ms over a bare interpreter "
+                             f"(budget {STARTUP_BUDGET_MS:.0f} ms)")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+"""Run with: python -m unittest discover skills/seesaw/tests"""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "scripts"))
+
+from seesaw_cli import SeesawConnectionError  # noqa: E402
+from trade_plan import TradePlan, execute_plan, run_key  # noqa: E402
+
+
+class FilledServer:
+    """Fake client for a server that filled the first attempt of every key and dedupes retries."""
+
+    def __init__(self, filled=()):
+        self.fills = {key: {"trade_id": key, "shares": 10} for key in filled}
+        self.calls = []
+
+    def buy(self, market_id, option_id, amount, idempotency_key=None):
+        self.calls.append(("buy", idempotency_key))
+        return self.fills.setdefault(idempotency_key, {"trade_id": idempotency_key, "shares": 10})
+
+    def sell(self, market_id, option_id, shares, idempotency_key=None):
+        self.calls.append(("sell", idempotency_key))
+        return self.fills.setdefault(idempotency_key, {"trade_id": idempotency_key, "shares": shares})
+
+    def guarded_trade(self, side, market_id, option_id, amount, idempotency_key=None, **guards):
+        # The price has moved since the fill, so a fresh quote fails every guard.
+        self.calls.append(("guarded_trade", idempotency_key))
+        raise RuntimeError("Trade guard violated: price moved")
+
+
+class TimeoutServer(FilledServer):
+    """Fills the trade but times out before the response arrives."""
+
+    def guarded_trade(self, side, market_id, option_id, amount, idempotency_key=None, **guards):
+        self.calls.append(("guarded_trade", idempotency_key))
+        self.fills[idempotency_key] = {"trade_id": idempotency_key, "shares": 10}
+        raise SeesawConnectionError("Request to trade/buy failed: Read timed out")
+
+
+class ResumeTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+        self.plan = TradePlan.parse(
+            '{"market_id": "m1", "option_id": "yes", "amount": 10, "max_price": 0.6}\n'
+            '{"market_id": "m1", "option_id": "no", "amount": 5}\n'
+        )
+        self.journal = os.path.join(self.dir.name, "plan.journal")
+
+    def write_journal(self, *entries, run="r1"):
+        header = {"plan": self.plan.digest, "run": run} if run else {"plan": self.plan.digest}
+        with open(self.journal, "w") as f:
+            for entry in (header, *entries):
+                f.write(json.dumps(entry) + "\n")
+
+    def key(self, line, run="r1"):
+        return run_key(self.plan.digest, run, line)
+
+    def test_interrupted_guarded_order_is_resent_without_guard(self):
+        first, key = self.plan.orders[0], self.key(1)
+        self.write_journal({"line": first.line, "key": key, "status": "started"})
+        client = FilledServer(filled=[key])
+        events = []
+
+        summary = execute_plan(client, self.plan, self.journal, workers=1, on_result=events.append)
+
+        self.assertEqual(client.calls[0], ("buy", key))
+        self.assertNotIn("guarded_trade", [name for name, _ in client.calls])
+        self.assertEqual(summary["done"], 2)
+        self.assertEqual(summary["failed"], 0)
+        self.assertTrue(events[0]["resent"])
+        self.assertEqual(events[0]["result"], {"trade_id": key, "shares": 10})
+        self.assertNotIn("resent", events[1])
+
+    def test_order_failed_in_previous_run_is_guarded_again(self):
+        first, key = self.plan.orders[0], self.key(1)
+        self.write_journal({"line": first.line, "key": key, "status": "started"},
+                           {"line": first.line, "key": key, "status": "failed", "error": "x"})
+        client = FilledServer()
+
+        summary = execute_plan(client, self.plan, self.journal, workers=1)
+
+        self.assertEqual(client.calls, [("guarded_trade", key)])
+        self.assertEqual(summary["failed"], 1)
+        self.assertEqual(summary["skipped"], 1)
+
+    def test_done_order_is_not_sent_again(self):
+        first, key = self.plan.orders[0], self.key(1)
+        result = {"trade_id": key, "shares": 10}
+        self.write_journal({"line": first.line, "key": key, "status": "started"},
+                           {"line": first.line, "key": key, "status": "done", "result": result})
+        client = FilledServer()
+
+        summary = execute_plan(client, self.plan, self.journal, workers=1)
+
+        self.assertEqual(client.calls, [("buy", self.key(2))])
+        self.assertEqual(summary["resumed"], 1)
+        self.assertEqual(summary["done"], 1)
+
+    def test_ambiguous_failure_is_resent_with_the_same_key(self):
+        client = TimeoutServer()
+        first = execute_plan(client, self.plan, self.journal, workers=1)
+        key = client.calls[0][1]
+
+        second = execute_plan(client, self.plan, self.journal, workers=1)
+
+        self.assertEqual(first["failed"], 1)
+        self.assertEqual(client.calls[1:], [("buy", key), ("buy", self.plan.orders[1].idempotency_key)])
+        self.assertEqual(second["done"], 2)
+        self.assertEqual(len(client.fills), 2)
+
+    def test_finished_plan_runs_again_with_new_keys(self):
+        client = FilledServer()
+        self.plan.orders[0].guards = {}
+        execute_plan(client, self.plan, self.journal, workers=1)
+        first_keys = [key for _, key in client.calls]
+
+        summary = execute_plan(client, self.plan, self.journal, workers=1)
+
+        second_keys = [key for _, key in client.calls[2:]]
+        self.assertEqual(summary["done"], 2)
+        self.assertEqual(summary["resumed"], 0)
+        self.assertEqual(len(second_keys), 2)
+        self.assertFalse(set(first_keys) & set(second_keys))
+
+    def test_journal_without_run_nonce_resumes_with_its_keys(self):
+        first = self.plan.orders[0]
+        legacy_key = self.key(1, run=None)
+        self.write_journal({"line": first.line, "key": legacy_key, "status": "started"}, run=None)
+        client = FilledServer(filled=[legacy_key])
+
+        execute_plan(client, self.plan, self.journal, workers=1)
+
+        self.assertEqual(client.calls[0], ("buy", legacy_key))
+
+
+if __name__ == "__main__":
+    unittest.main()